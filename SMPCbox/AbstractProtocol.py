@@ -2,9 +2,16 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Union, Callable, Any, TYPE_CHECKING
 from SMPCbox.ProtocolParty import ProtocolParty, TrackedStatistics
-from SMPCbox.exceptions import NonExistentParty, InvalidProtocolInput, InvalidVariableName
+from SMPCbox.exceptions import NonExistentParty, InvalidProtocolInput, InvalidVariableName, InvalidLocalVariableAccess
 from SMPCbox.CommunicationLayer import ProtocolSide
+from SMPCbox.Compression import CompressionSettings
+from SMPCbox.TLS import TLSSettings
+from SMPCbox.Transport import TransportConfig
+from SMPCbox.InputStream import InputStream
+from SMPCbox.ProtocolPlan import ProtocolPlan
 from functools import wraps
+from itertools import chain
+from enum import Enum
 
 if TYPE_CHECKING:
     from AbstractProtocol import AbstractProtocol
@@ -21,6 +28,88 @@ def check_var_names(names: list[str]):
         if name.startswith('_'):
             raise InvalidVariableName(name)
 
+def split_value(value: Any, num_chunks: int) -> list[Any]:
+    """
+    Splits a sliceable value (list, tuple, str, bytes, numpy array) into num_chunks slices.
+    Other values, including subclasses of these types (slicing a list subclass returns a plain list),
+    are put in the first chunk as a whole, the other chunks are None.
+    """
+    if type(value) not in (list, tuple, str, bytes, bytearray) and type(value).__name__ != "ndarray":
+        return [value] + [None] * (num_chunks - 1)
+
+    length = len(value)
+
+    chunk_size = -(-length // num_chunks)
+    return [value[i * chunk_size:(i + 1) * chunk_size] for i in range(num_chunks)]
+
+def join_chunks(chunks: list[Any]) -> Any:
+    """Reverses split_value"""
+    if len(chunks) == 1 or chunks[1] is None:
+        return chunks[0]
+
+    first = chunks[0]
+    if isinstance(first, list):
+        return list(chain.from_iterable(chunks))
+    if isinstance(first, tuple):
+        return tuple(chain.from_iterable(chunks))
+    if isinstance(first, str):
+        return "".join(chunks)
+    if isinstance(first, (bytes, bytearray)):
+        return b"".join(chunks)
+    if hasattr(first, "__array_interface__"):
+        import numpy
+        return numpy.concatenate(chunks)
+
+    raise TypeError(f"Unable to join chunks of type {type(first)}")
+
+def freeze_mapping(mapping: dict[str, dict[str, str]]) -> tuple:
+    return tuple((role, tuple(variables.items())) for role, variables in mapping.items())
+
+class SubroutinePlan():
+    """
+    The resolved roles and variable mappings of a call to run_subroutine_protocol. The plan is reused by later calls
+    which run the same protocol class with the same parties and variable names, so these calls don't have to
+    validate the roles and inputs again.
+    """
+    def __init__(self, protocol: AbstractProtocol, role_assignments: dict[str, ProtocolParty], inputs: dict[str, dict[str, str]],
+                 output_vars: dict[str, dict[str, str]], running_party: str | None, parent_roles: dict[ProtocolParty, str]):
+        self.party_roles = {party: role for role, party in role_assignments.items()}
+        # the mapping from the names of the parties to their roles, which is shown by the visualiser
+        self.party_mapping = {party.name: role for role, party in role_assignments.items()}
+
+        # the role of the running party in the subroutine, None when the protocol runs simulated
+        self.local_role = None
+        if running_party is not None:
+            for role, party in role_assignments.items():
+                if parent_roles.get(party) == running_party:
+                    self.local_role = role
+
+        stream_vars = protocol.stream_input_variables()
+        # (role, party, [(input variable, provided variable)], streamed input variables) of the local parties
+        self.inputs = []
+        for role, variables in inputs.items():
+            protocol.check_name_exists(role)
+            party = role_assignments[role]
+            if party.is_local():
+                self.inputs.append((role, party, list(variables.items()), set(stream_vars.get(role, []))))
+
+        # (party, [(output variable, new name)]) of the local parties
+        self.outputs = [(role_assignments[role], list(variables.items())) for role, variables in output_vars.items()
+                        if role_assignments[role].is_local()]
+
+class BroadcastStrategy(Enum):
+    """
+    The ways in which broadcast_variables can distribute the variables.
+    STAR: The broadcasting party sends the variables to every other party itself.
+    TREE: The variables are sent along a binomial tree, every party that has received the variables relays them.
+          The broadcasting party only sends log(n) times and the broadcast takes log(n) rounds.
+    PIPELINED: The variables are split into chunks which are passed along a chain of all the parties.
+               Each party relays a chunk as soon as it arrives, which makes this suitable for large values.
+    """
+    STAR = "star"
+    TREE = "tree"
+    PIPELINED = "pipelined"
+
 def local(name: str):
     """
     A decorator which a can be used to execute specific methods only if a certain
@@ -44,6 +133,8 @@ class AbstractProtocol(ABC):
             self.protocol_name: str = "[Default Protocol Name]"
 
         self.parties: dict[str, ProtocolParty] = {}
+        # the reverse of parties, used to find the name of a party in this protocol
+        self.party_roles: dict[ProtocolParty, str] = {}
         self.running_party = None
         self.protocol_output: dict[str, dict[str, Any]] = {}
         self.visualiser: ProtocolSide | None = None
@@ -53,8 +144,29 @@ class AbstractProtocol(ABC):
         # A flag used to disable the visualisation for message sending if the message sending is part of a broadcast opperation
         self.broadcasting = False
 
+        # The strategy used by broadcast_variables when no strategy is passed explicitly.
+        self.broadcast_strategy = BroadcastStrategy.STAR
+
+        # When set, the protocol is doing a dry run (see trace_communication) and all send opperations
+        # are recorded as (sender name, receiver name) edges instead of being executed.
+        self.topology_recorder: set[tuple[str, str]] | None = None
+
+        # the streamed inputs of the local parties, see stream_input_variables
+        self.input_streams: list[InputStream] = []
+
         for name in self.party_names():
             self.parties[name] = ProtocolParty(name)
+        self.party_roles = {party: name for name, party in self.parties.items()}
+
+        # the plans of the subroutines run by this protocol, see run_subroutine_protocol
+        self.subroutine_plans: dict[tuple, SubroutinePlan] = {}
+
+        # the plan recorded by run_compiled, plan_recorder is set while the plan is being recorded
+        self.plan: ProtocolPlan | None = None
+        self.plan_recorder: ProtocolPlan | None = None
+        # set during run_compiled, the subroutines are then run compiled as well
+        self.running_compiled = False
+        self.running_pipelined = False
 
         self.__terminated_protocol = False
 
@@ -78,36 +190,122 @@ class AbstractProtocol(ABC):
         if name not in self.party_names():
             raise NonExistentParty(self.protocol_name, name)
 
-    def set_party_addresses(self, addresses: dict[str, str], local_party_name: str, connection_timeout=60):
+    def set_party_addresses(self, addresses: dict[str, str], local_party_name: str, connection_timeout=60, infer_topology=True,
+                            compression: CompressionSettings | None = None, tls: TLSSettings | None = None, unix_fast_path: bool = True,
+                            transport: TransportConfig | None = None):
         """
         This method sets the protocol to run distributedly. This method expects two arguments:
 
         addresses: a dictionary containing for each party name an address ("ip:port") on which
-                   that party will be listening.
+                   that party will be listening. An address of the form "unix:/path" makes the party listen on a
+                   unix domain socket, which can only be used when all parties run on the same host.
         local_party_name: the name of the party to run locally on this machine
 
         connection_timeout: The timeout used for the connection process to each of the clients.
                             If set to None, no timeout is used and this method will block untill a connection is established.
                             (max. waiting time is (num_parties-1) * connection_timeout).
+
+        infer_topology: If True, only the parties the local party actually sends variables to are connected to upfront.
+                        The topology is taken from the communication_topology method or, if the protocol doesn't declare one,
+                        inferred from a dry run of the protocol. Connections which are missing from the topology are opened
+                        on the first send. If False (or the topology can't be determined) a connection to every party is made.
+
+        compression: The compression settings for the messages send by the local party, if None messages are not compressed.
+
+        tls: The TLS settings of the local party, if provided all connections are encrypted and the other parties are
+             authenticated using their certificates. All parties have to use TLS in this case.
+
+        unix_fast_path: If True, parties listening on a TCP address also listen on a unix domain socket. Connections to parties
+                        on the same host then use this socket instead of TCP.
+
+        transport: The socket options (TCP_NODELAY, buffer sizes, keepalive, backlog, ...) used by the local party.
+                   If None the defaults of TransportConfig are used.
         """
 
         self.running_simulated = False
+        # the parties which are local change, so the subroutine plans have to be made again
+        self.subroutine_plans = {}
 
         # set all the addresses
         for party_name, addr in addresses.items():
             self.check_name_exists(party_name)
             self.parties[party_name].socket.set_address(addr)
 
-        # spin up the local party
         self.check_name_exists(local_party_name)
+
+        # Determine the topology before the local party starts listening, the dry run relies on none of the parties being local.
+        edges = self.get_communication_edges() if infer_topology else None
+
+        # spin up the local party
         self.running_party = local_party_name
 
         # ensure that the other parties are ready
         listening_socket = self.parties[local_party_name].socket
+        listening_socket.set_compression(compression)
+        listening_socket.connection_timeout = connection_timeout
+        listening_socket.set_tls(tls)
+        listening_socket.unix_fast_path = unix_fast_path
+        listening_socket.transport = transport if transport is not None else TransportConfig()
         listening_socket.start_listening()
         other_parties: list[ProtocolParty] = list(self.parties.values())
         other_parties.remove(self.parties[local_party_name])
-        listening_socket.connect_to_parties(other_parties, connection_timeout)
+        if edges is not None:
+            other_parties = [party for party in other_parties if (local_party_name, party.name) in edges]
+        try:
+            listening_socket.connect_to_parties(other_parties, connection_timeout)
+        except Exception:
+            # stop the listening thread, otherwise it keeps the process alive after the failed setup
+            listening_socket.close()
+            raise
+
+    def communication_topology(self) -> dict[str, list[str]] | None:
+        """
+        Protocols can override this method to declare which parties communicate with each other.
+        The returned dictionary maps each party name to the list of parties it sends variables to.
+        By default None is returned, in which case the topology is inferred using a dry run of the protocol.
+        """
+        return None
+
+    def get_communication_edges(self) -> set[tuple[str, str]] | None:
+        """
+        Returns the set of (sender, receiver) party name pairs over which variables are sent during the protocol.
+        Returns None if the topology can not be determined.
+        """
+        topology = self.communication_topology()
+        if topology is None:
+            return self.trace_communication()
+
+        edges = set()
+        for sender, receivers in topology.items():
+            self.check_name_exists(sender)
+            for receiver in receivers:
+                self.check_name_exists(receiver)
+                edges.add((sender, receiver))
+        return edges
+
+    def trace_communication(self) -> set[tuple[str, str]] | None:
+        """
+        Runs the protocol without executing any computations or sending any variables, recording which parties
+        send variables to which other parties. This only works while none of the parties are local.
+
+        Returns None if the protocol accesses local variables outside of a computation, since the dry run can't follow
+        control flow that depends on the values of variables. Any other exception raised by the protocol is not caught.
+        """
+        if any(party.is_local() for party in self.parties.values()):
+            return None
+
+        # the dry run should not show up in the visualisation
+        visualiser = self.visualiser
+        self.visualiser = None
+        self.topology_recorder = set()
+        try:
+            self()
+            return self.topology_recorder
+        except InvalidLocalVariableAccess:
+            return None
+        finally:
+            self.topology_recorder = None
+            self.visualiser = visualiser
 
 
     def is_local(self, party: str | ProtocolParty) -> bool:
@@ -132,7 +330,10 @@ class AbstractProtocol(ABC):
         """
         Retreives the name of the given party in the current protocol
         """
-        name = list(self.parties.keys())[list(self.parties.values()).index(party)]
+        name = self.party_roles.get(party)
+        if name is None:
+            # the parties have been replaced without updating party_roles
+            name = list(self.parties.keys())[list(self.parties.values()).index(party)]
         return name
 
     def compute(
@@ -158,16 +359,22 @@ class AbstractProtocol(ABC):
             # We don't run computations for parties that aren't the running party when a running_party is specified (when running in distributed manner).
             return
 
+        if self.plan_recorder is not None:
+            # the visualiser isn't used while recording
+            self.plan_recorder.run(computing_party.run_computation, computed_vars, computation, description,
+                                   writes=[(computing_party, var) for var in computed_vars])
+            return
+
         computing_party.run_computation(
             computed_vars, computation, description
         )
 
-        # Get the computed values
-        computed_var_values = {}
-        for name in computed_vars:
-            computed_var_values[name] = computing_party.get_variable(name)
         # add the local computation
         if self.visualiser:
+            # Get the computed values
+            computed_var_values = {}
+            for name in computed_vars:
+                computed_var_values[name] = computing_party.get_variable(name)
             self.visualiser.add_computation(
                 self.get_name_of_party(computing_party),
                 computed_var_values,
@@ -201,39 +408,112 @@ class AbstractProtocol(ABC):
         # in the case that the variables is just a single string convert it to a list
         variables = convert_to_list(variables)
         check_var_names(variables)
-        variable_values = {}
+
+        if self.topology_recorder is not None:
+            self.topology_recorder.add((sending_party.name, receiving_party.name))
+            return
+
+        if self.plan_recorder is not None:
+            if sending_party.is_local():
+                self.plan_recorder.run(sending_party.send_variables, receiving_party, variables,
+                                       reads=[(sending_party, var) for var in variables], writes=[])
+            if receiving_party.is_local():
+                self.plan_recorder.run(receiving_party.receive_variables, sending_party, variables,
+                                       writes=[(receiving_party, var) for var in variables])
+            return
 
         # only call the send and receive methods on the parties if that party is running localy.
         if sending_party.is_local():
             sending_party.send_variables(receiving_party, variables)
-            for var in variables:
-                variable_values[var] = sending_party.get_variable(var)
 
         if receiving_party.is_local():
             receiving_party.receive_variables(sending_party, variables)
-            if not sending_party.is_local():
-                for var in variables:
-                    # The variable is posibly not received yet.
-                    variable_values[var] = None
 
         if not self.broadcasting and self.visualiser and (sending_party.is_local() or receiving_party.is_local()):
             sending_party_name = self.get_name_of_party(sending_party)
             receiving_party_name = self.get_name_of_party(receiving_party)
 
-            if receiving_party.is_local():
-                for var in variables:
-                    variable_values[var] = receiving_party.get_variable(var)
+            # a receiving party only shows the variables which have arrived, the visualiser never waits on a variable
+            local_party = sending_party if sending_party.is_local() else receiving_party
+            variable_values = {var: local_party.get_variable(var) if local_party.is_available(var) else None for var in variables}
 
             self.visualiser.send_message(
                 sending_party_name, receiving_party_name, variable_values
             )
 
     def run(self):
+        if self.visualiser:
+            self.visualiser.start_run(self.protocol_name, self.party_names())
+
         self.__call__()
 
         if self.visualiser:
             self.visualiser.end_protocol(self.get_party_statistics(), self.get_total_statistics())
 
+    def run_compiled(self, pipelined: bool = False):
+        """
+        Runs the protocol like calling it does, but meant for protocols which are run many times with new inputs.
+        The first run records the operations of the local parties into a ProtocolPlan, later runs replay this plan
+        which skips the control flow of __call__ and the checks done by compute and send_variables.
+        Subroutines are recorded into plans of their own.
+
+        A protocol can read variables outside of its computations to branch on them (see branchingExamples/OT_using_if.py).
+        Such a read ends a segment of the plan with a guard, the steps after it are recorded separately for every value read.
+        When a replay reads a value for which the steps haven't been recorded yet, the protocol is run again to record them,
+        the steps which have already been replayed are skipped. Apart from the variables it reads, the steps of the protocol
+        should not change between runs. Protocols with a visualiser are run normally, since the visualiser shows every step.
+
+        pipelined: When a party has to wait on a variable which hasn't been received yet, it runs the later computations and
+                   sends which don't depend on that variable first. The computations should read variables with party[name]
+                   and should only depend on the variables they read. The wait_time of the parties is then only the time
+                   in which no operation could run.
+        """
+        if self.visualiser is not None or self.topology_recorder is not None:
+            self()
+            return
+
+        parties = tuple(self.parties.values())
+        self.running_compiled = True
+        self.running_pipelined = pipelined
+        try:
+            if self.plan is None or self.plan.parties != parties or self.plan.running_party != self.running_party:
+                self.plan = ProtocolPlan(parties, self.running_party)
+                self.__record_plan()
+            elif self.plan.dynamic:
+                self()
+            elif not self.plan.replay(pipelined):
+                # a branch which hasn't been recorded yet
+                self.__record_plan()
+        finally:
+            self.running_compiled = False
+            self.running_pipelined = False
+
+    def __record_plan(self):
+        plan = self.plan
+        plan.start_recording()
+        local_parties = [party for party in plan.parties if party.is_local()]
+        # a subroutine records its own plan with the parties of the protocol, their tracers are restored afterwards
+        tracers = [party.tracer for party in local_parties]
+        for party in local_parties:
+            party.tracer = plan
+
+        self.plan_recorder = plan
+        try:
+            self()
+        finally:
+            self.plan_recorder = None
+            for party, tracer in zip(local_parties, tracers):
+                party.tracer = tracer
+
+    def __run_recorded(self, operation: Callable, *args):
+        # the operation is recorded as a whole, the steps it consists of are not recorded
+        recorder = self.plan_recorder
+        self.plan_recorder = None
+        try:
+            recorder.run(operation, *args)
+        finally:
+            self.plan_recorder = recorder
+
     @abstractmethod
     def __call__(self):
         """
@@ -249,15 +529,24 @@ class AbstractProtocol(ABC):
         """
         pass
 
-    def set_input(self, inputs: dict[str, dict[str, Any]]):
+    def stream_input_variables(self) -> dict[str, list[str]]:
+        """
+        A protocol can specify input variables (which should also be returned by input_variables) that are given as an iterable
+        instead of a value. These inputs are never fully loaded into memory, the protocol reads them in chunks using read_input_chunk.
+        """
+        return {}
+
+    def set_input(self, inputs: dict[str, dict[str, Any]], chunk_size: int = 1 << 16):
         """
         Sets the inputs for the protocols (all inputs specified by input_variables) should be given
         If set_running_party has been called only the input for that party needs to be given
         If the protocol is, [yourself.vars[v] for v in self.vars] not run distributed then the inputs for all the parties should be provided.
 
         This method also checks wether the provided input is correct according to the input_variables method
+        The inputs specified by stream_input_variables can be any iterable (for instance a generator), they are read in chunks of chunk_size values.
         """
         expected_vars = self.input_variables()
+        stream_vars = self.stream_input_variables()
         for party in inputs.keys():
             self.check_name_exists(party)
 
@@ -272,7 +561,19 @@ class AbstractProtocol(ABC):
             # Set the inputs
             for var in inputs[party].keys():
                 check_var_names([var])
-                self.parties[party].set_local_variable(var, inputs[party][var])
+                value = inputs[party][var]
+                if var in stream_vars.get(party, []):
+                    value = InputStream(value, chunk_size)
+                    self.input_streams.append(value)
+                self.parties[party].set_local_variable(var, value)
+
+    def read_input_chunk(self, party: ProtocolParty, stream_var: str, chunk_var: str):
+        """
+        Stores the next chunk of the streamed input stream_var of the party in chunk_var, if the party is local.
+        The chunk is a list of at most the chunk_size given to set_input values, the list is empty once the input is exhausted.
+        The chunk after it is already read in the background while the protocol processes this chunk.
+        """
+        self.compute(party, chunk_var, lambda: party[stream_var].get_chunk(), f"read the next chunk of {stream_var}")
 
     @abstractmethod
     def output_variables(self) -> dict[str, list[str]]:
@@ -301,32 +602,129 @@ class AbstractProtocol(ABC):
         return output
 
     def broadcast_variables(
-        self, broadcasting_party: ProtocolParty, variables: Union[str, list[str]]
+        self,
+        broadcasting_party: ProtocolParty,
+        variables: Union[str, list[str]],
+        strategy: BroadcastStrategy | None = None,
+        num_chunks: int = 8,
     ):
         """
         Given a party who has all of the provided variables locally this method broadcasts these variables to all the parties participating in the protocol.
         After a call to this method the variables with the provided names can be used as local variables in all party.
+
+        strategy: The BroadcastStrategy used to distribute the variables. Defaults to the broadcast_strategy attribute of the protocol.
+        num_chunks: The number of chunks each variable is split into when using the PIPELINED strategy.
+                    This has to be a fixed number since the receiving parties don't know the size of the variables beforehand.
         """
 
         variables = convert_to_list(variables)
         check_var_names(variables)
 
-        for receiver in self.parties.values():
-            if receiver == broadcasting_party:
-                continue
+        if strategy is None:
+            strategy = self.broadcast_strategy
+
+        if self.plan_recorder is not None:
+            self.__run_recorded(self.broadcast_variables, broadcasting_party, variables, strategy, num_chunks)
+            return
 
-            self.send_variables(broadcasting_party, receiver, variables)
+        # order the parties such that the broadcasting party comes first
+        order = [broadcasting_party] + [party for party in self.parties.values() if party != broadcasting_party]
+
+        # the individual sends should not be visualised, the broadcast is visualised as a whole
+        self.broadcasting = True
+        try:
+            if strategy == BroadcastStrategy.STAR:
+                self.__star_broadcast(broadcasting_party, order[1:], variables)
+            elif strategy == BroadcastStrategy.TREE:
+                self.__tree_broadcast(order, variables)
+            elif strategy == BroadcastStrategy.PIPELINED:
+                self.__pipelined_broadcast(order, variables, num_chunks)
+            else:
+                raise ValueError(f"Unknown broadcast strategy: {strategy}")
+        finally:
+            self.broadcasting = False
 
-        self.broadcasting = False
+        if self.topology_recorder is not None or not self.visualiser:
+            return
+
+        # In a distributed run the broadcasting party might not be local, the values are then taken from the local receiver
+        local_parties = [party for party in order if party.is_local()]
+        if len(local_parties) == 0:
+            return
 
         var_values: dict[str, Any] = {}
         for var in variables:
-            var_values[var] = broadcasting_party.get_variable(var)
+            var_values[var] = local_parties[0].get_variable(var)
 
-        if self.visualiser:
-            self.visualiser.broadcast_variable(
-                self.get_name_of_party(broadcasting_party), var_values
-            )
+        self.visualiser.broadcast_variable(
+            self.get_name_of_party(broadcasting_party), var_values
+        )
+
+    def __star_broadcast(self, broadcasting_party: ProtocolParty, receivers: list[ProtocolParty], variables: list[str]):
+        if self.topology_recorder is not None:
+            for receiver in receivers:
+                self.topology_recorder.add((broadcasting_party.name, receiver.name))
+            return
+
+        # a single broadcast message is sent instead of a send opperation per receiver
+        if broadcasting_party.is_local():
+            broadcasting_party.broadcast_variables(receivers, variables)
+
+        for receiver in receivers:
+            if receiver.is_local():
+                receiver.receive_variables(broadcasting_party, variables)
+
+    def __tree_broadcast(self, order: list[ProtocolParty], variables: list[str]):
+        # In every round each party which already has the variables sends them to one new party,
+        # doubling the number of parties with the variables.
+        step = 1
+        while step < len(order):
+            for i in range(min(step, len(order) - step)):
+                self.send_variables(order[i], order[i + step], variables)
+            step *= 2
+
+    def __relay_variables(self, sending_party: ProtocolParty, receiving_party: ProtocolParty, variables: list[str]):
+        """
+        Sends variables without checking their names, which allows the use of names reserved for SMPCbox (starting with an '_').
+        """
+        if self.topology_recorder is not None:
+            self.topology_recorder.add((sending_party.name, receiving_party.name))
+            return
+
+        if sending_party.is_local():
+            sending_party.send_variables(receiving_party, variables)
+
+        if receiving_party.is_local():
+            receiving_party.receive_variables(sending_party, variables)
+
+    def __pipelined_broadcast(self, order: list[ProtocolParty], variables: list[str], num_chunks: int):
+        if num_chunks < 1:
+            raise ValueError(f"A pipelined broadcast needs at least one chunk, got num_chunks={num_chunks}")
+
+        # the chunks start with an '_' such that they can't collide with variables of the protocol
+        chunk_names = [[f"_broadcast_{var}_chunk{c}" for var in variables] for c in range(num_chunks)]
+
+        root = order[0]
+        if root.is_local():
+            for i, var in enumerate(variables):
+                for c, chunk in enumerate(split_value(root.get_variable(var), num_chunks)):
+                    root.set_local_variable(chunk_names[c][i], chunk)
+
+        # Every chunk is passed along the chain, a party relays a chunk as soon as it has received it
+        # while the next chunk is still on its way.
+        for c in range(num_chunks):
+            for i in range(len(order) - 1):
+                self.__relay_variables(order[i], order[i + 1], chunk_names[c])
+
+        for party in order:
+            if not party.is_local():
+                continue
+
+            for i, var in enumerate(variables):
+                if party != root:
+                    party.set_local_variable(var, join_chunks([party.get_variable(chunk_names[c][i]) for c in range(num_chunks)]))
+                for c in range(num_chunks):
+                    party.delete_variable(chunk_names[c][i])
 
     def run_subroutine_protocol(
         self,
@@ -349,62 +747,59 @@ class AbstractProtocol(ABC):
         Note that the keys in the inputs and role_assignments dictionaries should be roles specified in the get_party_roles method of the provided protocol
         """
 
-        protocol.set_protocol_parties(role_assignments)
-
-        # before calling start_subroutine_protocol on the parties
-        # we first gather the provided variables from the parties to avoid namespace issues.
-        input_values = {}
-        # used for visualisation
-        input_var_mapping = {}
-        for party_name in inputs.keys():
-            protocol.check_name_exists(party_name)
-            party = role_assignments[party_name]
-
-            if not party.is_local():
-                # No need to set the input of non local parties
-                continue
+        if self.topology_recorder is not None:
+            # During a dry run only the communication of the subroutine is of interest
+            protocol.set_protocol_parties(role_assignments)
+            protocol.topology_recorder = self.topology_recorder
+            try:
+                protocol()
+            finally:
+                protocol.topology_recorder = None
+            return
 
-            # get the values for each of the input variables.
-            input_values[party_name] = {}
-            input_var_mapping[party_name] = {}
+        if self.plan_recorder is not None:
+            self.__run_recorded(self.run_subroutine_protocol, protocol, role_assignments, inputs, output_vars)
+            return
 
-            # we assume the user provided correct input. If not the set
-            for input_var_name, provided_var in inputs[party_name].items():
-                # Set the input variable
-                if party.is_local():
-                    input_values[party_name][input_var_name] = role_assignments[
-                        party_name
-                    ].get_variable(provided_var)
-                    input_var_mapping[party_name][input_var_name] = provided_var
+        # the roles and mappings are resolved once for every protocol class, parties and variable names
+        key = (type(protocol), tuple(role_assignments.items()), freeze_mapping(inputs), freeze_mapping(output_vars))
+        plan = self.subroutine_plans.get(key)
+        new_plan = plan is None
+        if new_plan:
+            protocol.set_protocol_parties(role_assignments)
+            plan = SubroutinePlan(protocol, role_assignments, inputs, output_vars, self.running_party, self.party_roles)
+            self.subroutine_plans[key] = plan
+        else:
+            protocol.parties = role_assignments
+            protocol.party_roles = plan.party_roles
 
-            party = role_assignments[party_name]
+        # before calling start_subroutine_protocol on the parties
+        # we first gather the provided variables from the parties to avoid namespace issues.
+        input_values = {role: {input_var: party.get_variable(provided_var) for input_var, provided_var in variables}
+                        for role, party, variables, _ in plan.inputs}
 
         if self.visualiser:
-            self.visualiser.start_subroutine(
-                protocol.protocol_name,
-                {party.name: role for role, party in role_assignments.items()},
-                input_values,
-                output_vars,
-            )
+            self.visualiser.start_subroutine(protocol.protocol_name, plan.party_mapping, input_values, output_vars)
 
         # comunicate to the participating parties that they are entering a subroutine
         for party in role_assignments.values():
             party.start_subroutine_protocol(protocol.protocol_name)
 
-        # set the constructed input_values
-        protocol.set_input(input_values)
+        if new_plan:
+            # the first call checks the inputs against the input_variables of the protocol
+            protocol.set_input(input_values)
+        else:
+            for role, party, _, stream_vars in plan.inputs:
+                for var, value in input_values[role].items():
+                    if var in stream_vars:
+                        value = InputStream(value, 1 << 16)
+                        protocol.input_streams.append(value)
+                    party.set_local_variable(var, value)
 
         # Comunicate to the protocol wether a certain party is running the protocol locally
         if self.running_party != None:
-            # find what role the running_party has and set them as the running party in the subroutine protocol
-            local_party_role = None
-
-            for role, party in role_assignments.items():
-                if self.running_party == self.get_name_of_party(party):
-                    local_party_role = role
-
             # Tell the protocol that it is running distributed
-            protocol.running_party = local_party_role
+            protocol.running_party = plan.local_role
             protocol.running_simulated = False
             # the addresses do not have to be provided these are in the ProtocolParty instances provided with
             # set_protocol_parties
@@ -412,32 +807,24 @@ class AbstractProtocol(ABC):
         if self.visualiser:
             protocol.set_protocol_visualiser(self.visualiser)
 
-        # tell the visualiser we will be running a subroutine.
-        role_assignments_names = {}
-        for role, party in role_assignments.items():
-            role_assignments_names[role] = self.get_name_of_party(party)
-
         # run the protocol
-        protocol()
+        if self.running_compiled:
+            protocol.run_compiled(self.running_pipelined)
+        else:
+            protocol()
 
         # Get the output (still part of the subroutine)
-        subroutine_output = protocol.get_output()
+        if self.visualiser:
+            subroutine_output = protocol.get_output()
+        outputs = [(party, new_name, party.get_variable(output_var)) for party, variables in plan.outputs for output_var, new_name in variables]
 
         # Communicate the end of the subroutine to the parties involved
         for party in role_assignments.values():
             party.end_subroutine_protocol()
 
         # now assign the output variables (not with the subroutine prefix _name_[var_name])
-        for role in subroutine_output.keys():
-            party = role_assignments[role]
-            if not party.is_local():
-                # No need to set the output of non local parties
-                continue
-
-            for subroutine_output_var, value in subroutine_output[role].items():
-                party.set_local_variable(
-                    output_vars[role][subroutine_output_var], value
-                )
+        for party, new_name, value in outputs:
+            party.set_local_variable(new_name, value)
 
         if self.visualiser:
             self.visualiser.end_subroutine(subroutine_output)
@@ -463,6 +850,7 @@ class AbstractProtocol(ABC):
                 "A ProtocolParty instance should be provided for every role in the protocol when calling set_protocol_parties."
             )
         self.parties = role_assignments
+        self.party_roles = {party: role for role, party in role_assignments.items()}
 
     def get_total_statistics(self) -> TrackedStatistics:
         """
@@ -489,5 +877,8 @@ class AbstractProtocol(ABC):
 
         self.__terminated_protocol = True
 
+        for stream in self.input_streams:
+            stream.close()
+
         for p in self.parties.values():
             p.exit_protocol()
@@ -0,0 +1,99 @@
+"""
+Modular arithmetic for protocol computations. When gmpy2 is installed the big number operations are done by GMP,
+otherwise the CPython integers are used. All functions take and return regular python integers, so their results can
+be send to other parties without registering a type for the gmpy2 numbers.
+"""
+from __future__ import annotations
+from typing import NamedTuple
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+HAS_GMPY2 = gmpy2 is not None
+
+def powmod(base: int, exponent: int, modulus: int) -> int:
+    """
+    base^exponent mod modulus, a negative exponent uses the modular inverse of the base.
+    """
+    if gmpy2 is not None:
+        return int(gmpy2.powmod(base, exponent, modulus))
+    return pow(base, exponent, modulus)
+
+def invert(value: int, modulus: int) -> int:
+    """
+    The inverse of value modulo modulus, raises a ValueError if it doesn't exist.
+    """
+    if gmpy2 is not None:
+        try:
+            return int(gmpy2.invert(value, modulus))
+        except ZeroDivisionError:
+            raise ValueError(f"{value} has no inverse modulo {modulus}")
+    return pow(value, -1, modulus)
+
+class FixedBaseTable():
+    """
+    Precomputed powers of a fixed base, which makes repeated exponentiations of the same base (such as a generator
+    or a public key) several times faster than powmod.
+    The exponent is split into windows of window_bits bits, the table stores base^(digit * 2^(window_bits * i)) for every
+    window i and every digit. An exponentiation then only takes one multiplication per window and no squarings.
+    Exponents up to max_exponent_bits bits use the table, larger exponents fall back to powmod.
+    """
+    def __init__(self, base: int, modulus: int, max_exponent_bits: int, window_bits: int = 4):
+        if window_bits < 1:
+            raise ValueError("window_bits should be at least 1")
+
+        self.base = base % modulus
+        self.modulus = modulus
+        self.window_bits = window_bits
+        self.max_exponent_bits = max_exponent_bits
+        self.mask = (1 << window_bits) - 1
+
+        convert = gmpy2.mpz if gmpy2 is not None else int
+        self.table = []
+        window_base = convert(self.base)
+        for _ in range(-(-max_exponent_bits // window_bits)):
+            row = [convert(1)]
+            for _ in range(self.mask):
+                row.append(row[-1] * window_base % modulus)
+            self.table.append(row)
+            # base^(2^(window_bits * (i + 1))) is the next power after the last digit of this window
+            window_base = row[-1] * window_base % modulus
+
+    def pow(self, exponent: int) -> int:
+        if exponent < 0 or exponent.bit_length() > self.max_exponent_bits:
+            return powmod(self.base, exponent, self.modulus)
+
+        result = self.table[0][0]
+        window = 0
+        while exponent:
+            digit = exponent & self.mask
+            if digit:
+                result = result * self.table[window][digit] % self.modulus
+            exponent >>= self.window_bits
+            window += 1
+        return int(result)
+
+class CRTKey(NamedTuple):
+    """
+    An RSA private key in the form used for decryption with the Chinese remainder theorem.
+    """
+    p: int
+    q: int
+    dp: int
+    dq: int
+    qinv: int
+
+def crt_key(p: int, q: int, d: int) -> CRTKey:
+    return CRTKey(p, q, d % (p - 1), d % (q - 1), invert(q, p))
+
+def crt_powmod(value: int, key: CRTKey) -> int:
+    """
+    value^d mod p*q, computed as two exponentiations with half sized moduli and exponents which is about 3 times faster.
+    """
+    mp = powmod(value % key.p, key.dp, key.p)
+    mq = powmod(value % key.q, key.dq, key.q)
+    # Garner's recombination
+    h = key.qinv * (mp - mq) % key.p
+    return mq + h * key.q
@@ -1,6 +1,12 @@
 from enum import Enum
 from multiprocessing import Queue
+from queue import Full
 from typing import Any
+import math
+import reprlib
+import threading
+import time
+from .constants import MAX_BUFFERED_STEPS, MAX_VALUE_LENGTH, TIMER_INTERVAL
 
 
 class Step(Enum):
@@ -13,9 +19,151 @@ class Step(Enum):
     END_PROTOCOL = 7
 
 
+class EventPolicy(Enum):
+    """What the protocol does with its steps while the visualiser can't keep up.
+
+    BLOCK: The protocol waits until the visualiser has handled its steps, every step is shown.
+    DROP_OLDEST: The oldest steps are dropped, the visualiser shows how many steps were dropped.
+    COALESCE: The steps are combined into summaries of the steps they replace.
+
+    The steps of subroutines and the end of the protocol are always shown.
+    """
+    BLOCK = "block"
+    DROP_OLDEST = "drop-oldest"
+    COALESCE = "coalesce"
+
+
+# the steps which are never dropped, the visualiser keeps track of the subroutines it is in
+STRUCTURAL_STEPS = (Step.SUBROUTINE, Step.END_SUBROUTINE, Step.END_PROTOCOL)
+
+
+class ValueRepr(reprlib.Repr):
+    """A reprlib.Repr which only converts the part of a value that is shown."""
+
+    def repr_int(self, x: int, level: int) -> str:
+        return truncate_int(x, self.maxlong)
+
+    def repr_bytes(self, x: bytes, level: int) -> str:
+        if len(x) > self.maxother:
+            return repr(x[: self.maxother]) + "..."
+        return repr(x)
+
+    def repr_ndarray(self, x: Any, level: int) -> str:
+        if x.ndim == 0:
+            return self.repr1(x.item(), level)
+        # the first entries of a numpy array as a list
+        entries = x[: self.maxlist + 1]
+        return self.repr_list(entries.tolist() if x.ndim == 1 else list(entries), level)
+
+
+def truncate_int(value: int, length: int) -> str:
+    if value.bit_length() <= 3 * length:
+        return str(value)
+    # an integer with more digits than shown is written in scientific notation, converting all its digits is slow
+    log = math.log10(abs(value))
+    exponent = int(log)
+    return f"{'-' if value < 0 else ''}{10 ** (log - exponent):.10f}e{exponent}"
+
+
+def truncate_value(value: Any, length: int = MAX_VALUE_LENGTH) -> str:
+    """Converts a value to the string the visualiser shows, such that large values are never sent to the visualiser.
+
+    Args:
+        value (Any): The value.
+        length (int): The maximum length of the string.
+    """
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, int) and not isinstance(value, bool):
+        text = truncate_int(value, length)
+    else:
+        value_repr = ValueRepr()
+        value_repr.maxlong = value_repr.maxstring = value_repr.maxother = length
+        text = value_repr.repr(value)
+
+    if len(text) > length:
+        return text[: length - 3] + "..."
+    return text
+
+
+def truncate_values(variables: dict[str, Any], length: int = MAX_VALUE_LENGTH) -> dict[str, str]:
+    return {name: truncate_value(value, length) for name, value in variables.items()}
+
+
+class StepSummary:
+    """The steps a ProtocolSide coalesced, shown by the visualiser as a single comment."""
+
+    def __init__(self):
+        self.counts: dict[Step, int] = {}
+        self.parties: dict[str, None] = {}
+
+    def add(self, step: "tuple[Step, tuple] | StepSummary"):
+        if isinstance(step, StepSummary):
+            for step_type, count in step.counts.items():
+                self.counts[step_type] = self.counts.get(step_type, 0) + count
+            self.parties.update(step.parties)
+            return
+
+        step_type, args = step
+        self.counts[step_type] = self.counts.get(step_type, 0) + 1
+        if step_type == Step.SEND:
+            self.parties.update(dict.fromkeys(args[:2]))
+        elif step_type in (Step.COMPUTATION, Step.BROADCAST):
+            self.parties[args[0]] = None
+
+    def to_step(self) -> tuple[Step, tuple]:
+        names = {Step.COMMENT: "comments", Step.COMPUTATION: "computations", Step.SEND: "messages", Step.BROADCAST: "broadcasts"}
+        counts = ", ".join(f"{count} {names[step_type]}" for step_type, count in self.counts.items())
+        parties = truncate_value(", ".join(self.parties))
+        return (Step.COMMENT, (f"Coalesced {counts} of {parties}",))
+
+
 class ProtocolSide:
-    def __init__(self, queue: Queue):
+    def __init__(
+        self,
+        queue: Queue,
+        policy: EventPolicy = EventPolicy.BLOCK,
+        max_buffered_steps: int = MAX_BUFFERED_STEPS,
+        value_length: int = MAX_VALUE_LENGTH,
+        flush_interval: float = TIMER_INTERVAL / 1000,
+    ):
+        """The steps of a protocol are put in the queue in batches, at most once every flush_interval seconds since the
+        visualiser doesn't read the queue more often. A background thread puts the steps which would otherwise wait
+        for the next step. The protocol only waits on the visualiser when the policy is EventPolicy.BLOCK and more than
+        max_buffered_steps steps are waiting. The values of the variables are truncated to value_length characters.
+
+        Args:
+            queue (Queue): The queue the visualiser reads the batches of steps from.
+            policy (EventPolicy): What to do with the steps while the queue is full.
+            max_buffered_steps (int): The number of steps which are kept while the queue is full.
+            value_length (int): The maximum length of a value shown by the visualiser.
+            flush_interval (float): The number of seconds between two batches.
+        """
         self.queue = queue
+        self.policy = policy
+        self.max_buffered_steps = max_buffered_steps
+        self.value_length = value_length
+        self.flush_interval = flush_interval
+
+        # the steps which haven't been put in the queue yet
+        self.buffer: list[tuple[Step, tuple] | StepSummary] = []
+        # the number of buffered steps after which the buffer is compacted again
+        self.buffer_limit = max_buffered_steps
+        # the number of steps dropped since the last batch
+        self.dropped = 0
+        # the time at which the buffered steps are put in the queue
+        self.flush_time = 0.0
+        # the buffer is shared with the thread which flushes it
+        self.lock = threading.Lock()
+        self.flusher: threading.Thread | None = None
+
+    def start_run(self, protocol_name: str, party_names: list[str]):
+        """Called when a run of a protocol starts, the visualiser already knows the protocol it runs.
+
+        Args:
+            protocol_name (str): The name of the protocol.
+            party_names (list[str]): The names of the parties of the protocol.
+        """
 
     def add_comment(self, comment: str):
         """Add a comment to the visualizer.
@@ -23,7 +171,7 @@ class ProtocolSide:
         Args:
             comment (str): The comment.
         """
-        self.queue.put((Step.COMMENT, (comment,)))
+        self.add_step((Step.COMMENT, (comment,)))
 
     def add_computation(
         self,
@@ -38,7 +186,8 @@ class ProtocolSide:
             computed_vars (dict[str, Any]): The variables that were computed with their values.
             computation (str): The computation that was performed.
         """
-        self.queue.put((Step.COMPUTATION, (party_name, computed_vars, computation)))
+        computed_vars = truncate_values(computed_vars, self.value_length)
+        self.add_step((Step.COMPUTATION, (party_name, computed_vars, computation)))
 
     def send_message(
         self,
@@ -53,8 +202,8 @@ class ProtocolSide:
             receiving_party_name (str): The name of the party receiving the message.
             variables (dict[str, Any]): The variables that are being sent with their values.
         """
-
-        self.queue.put(
+        variables = truncate_values(variables, self.value_length)
+        self.add_step(
             (Step.SEND, (sending_party_name, receiving_party_name, variables))
         )
 
@@ -65,8 +214,8 @@ class ProtocolSide:
             party_name (str): The name of the party broadcasting the variable.
             variables (dict[str, Any]): The variables that are being broadcasted with their values.
         """
-
-        self.queue.put((Step.BROADCAST, (party_name, variables)))
+        variables = truncate_values(variables, self.value_length)
+        self.add_step((Step.BROADCAST, (party_name, variables)))
 
     def start_subroutine(
         self,
@@ -83,8 +232,8 @@ class ProtocolSide:
             input_mapping (dict[str, dict[str, str]]): The mapping from party names to input variables.
             output_mapping (dict[str, dict[str, str]]): The mapping from party names to output variables.
         """
-
-        self.queue.put(
+        input_mapping = {role: truncate_values(values, self.value_length) for role, values in input_mapping.items()}
+        self.add_step(
             (
                 Step.SUBROUTINE,
                 (subroutine_name, party_mapping, input_mapping, output_mapping),
@@ -97,15 +246,115 @@ class ProtocolSide:
         Args:
             output_values (dict[str, dict[str, Any]]): The output values of the subroutine.
         """
-
-        self.queue.put((Step.END_SUBROUTINE, (output_values,)))
+        output_values = {role: truncate_values(values, self.value_length) for role, values in output_values.items()}
+        self.add_step((Step.END_SUBROUTINE, (output_values,)))
 
     def end_protocol(self, party_statistics: dict[str, Any], protocol_statistics: Any):
-        """End the protocol.
+        """End the protocol, the remaining steps are always put in the queue.
 
         Args:
             party_statistics (dict[str, Any]): The statistics of each party.
             protocol_statistics (Any): The statistics of the protocol.
         """
+        with self.lock:
+            self.buffer.append((Step.END_PROTOCOL, (party_statistics, protocol_statistics)))
+            self.__flush(block=True)
+
+    def flush(self, block: bool = False) -> bool:
+        """Puts the buffered steps in the queue as a single batch.
+
+        Args:
+            block (bool): Wait until the queue has room for the batch.
+
+        Returns:
+            bool: Whether the steps were put in the queue.
+        """
+        with self.lock:
+            return self.__flush(block)
+
+    def __flush(self, block: bool = False) -> bool:
+        self.flush_time = time.monotonic() + self.flush_interval
+        if len(self.buffer) == 0 and self.dropped == 0:
+            return True
+        # checking if the queue is full is cheap, unlike creating the batch
+        if not block and self.queue.full():
+            return False
+
+        batch = [step.to_step() if isinstance(step, StepSummary) else step for step in self.buffer]
+        if self.dropped > 0:
+            batch.insert(0, (Step.COMMENT, (f"Dropped {self.dropped} steps, the visualiser could not keep up",)))
+
+        try:
+            self.queue.put(batch, block=block)
+        except Full:
+            return False
+
+        self.buffer = []
+        self.buffer_limit = self.max_buffered_steps
+        self.dropped = 0
+        return True
+
+    def add_step(self, step: tuple[Step, tuple]):
+        """Buffers a step with truncated values, the step is put in the queue according to the policy.
+
+        Args:
+            step (tuple[Step, tuple]): The type of the step and its arguments.
+        """
+        if self.flusher is None:
+            self.flusher = threading.Thread(target=self.__flush_periodically, daemon=True)
+            self.flusher.start()
+
+        with self.lock:
+            self.buffer.append(step)
+            if len(self.buffer) <= self.buffer_limit:
+                if time.monotonic() >= self.flush_time:
+                    self.__flush()
+                return
+
+            # the buffer is full, which is only a problem when the visualiser can't keep up
+            if self.__flush():
+                return
+
+            if self.policy == EventPolicy.BLOCK:
+                self.__flush(block=True)
+                return
+            elif self.policy == EventPolicy.DROP_OLDEST:
+                self.__drop_oldest()
+            elif self.policy == EventPolicy.COALESCE:
+                self.__coalesce()
+            else:
+                raise ValueError(f"Unknown event policy: {self.policy}")
+
+            # the structural steps are kept, so when most steps are structural the buffer stays large
+            self.buffer_limit = max(self.max_buffered_steps, 2 * len(self.buffer))
+
+    def __flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            with self.lock:
+                if time.monotonic() >= self.flush_time:
+                    self.__flush()
+
+    def __drop_oldest(self):
+        # half of the buffer is dropped at once, such that it isn't done for every step
+        excess = len(self.buffer) - self.max_buffered_steps // 2
+        kept: list[tuple[Step, tuple] | StepSummary] = []
+        for step in self.buffer:
+            if excess > 0 and not isinstance(step, StepSummary) and step[0] not in STRUCTURAL_STEPS:
+                excess -= 1
+                self.dropped += 1
+            else:
+                kept.append(step)
+        self.buffer = kept
 
-        self.queue.put((Step.END_PROTOCOL, (party_statistics, protocol_statistics)))
+    def __coalesce(self):
+        # every sequence of steps between the structural steps becomes a single summary
+        coalesced: list[tuple[Step, tuple] | StepSummary] = []
+        for step in self.buffer:
+            if not isinstance(step, StepSummary) and step[0] in STRUCTURAL_STEPS:
+                coalesced.append(step)
+                continue
+            if len(coalesced) == 0 or not isinstance(coalesced[-1], StepSummary):
+                coalesced.append(StepSummary())
+            coalesced[-1].add(step)
+        self.buffer = coalesced
@@ -0,0 +1,121 @@
+from __future__ import annotations
+from typing import Iterator
+from enum import Enum
+import zlib
+from .exceptions import CompressionUnavailable
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+class CompressionAlgorithm(Enum):
+    """
+    The algorithms which can be used to compress the messages send between parties.
+    The value is send in the header of each message so the receiver knows how to decompress it.
+    """
+    NONE = 0
+    ZLIB = 1
+    LZ4 = 2
+
+class CompressionSettings():
+    def __init__(self, algorithm: CompressionAlgorithm = CompressionAlgorithm.ZLIB, level: int | None = None,
+                 min_size: int = 1024, adaptive: bool = True, max_ratio: float = 0.9, probe_interval: int = 16):
+        """
+        The settings used for the compression of messages send by a party.
+
+        algorithm: the compression algorithm, lz4 requires the lz4 package to be installed.
+        level: the compression level passed to the algorithm, if None the default level of the algorithm is used.
+        min_size: messages smaller than this number of bytes are never compressed.
+        adaptive: if True compression is disabled for a connection once the compressed messages are not smaller than
+                  max_ratio times the original size. While disabled, every probe_interval-th message is compressed to
+                  check if compression has become worth it again.
+        """
+        if algorithm == CompressionAlgorithm.LZ4 and lz4_frame is None:
+            raise CompressionUnavailable(algorithm.name)
+
+        self.algorithm = algorithm
+        self.level = level
+        self.min_size = min_size
+        self.adaptive = adaptive
+        self.max_ratio = max_ratio
+        self.probe_interval = probe_interval
+
+def compress(algorithm: CompressionAlgorithm, data: bytes | bytearray | memoryview, level: int | None = None) -> bytes:
+    match algorithm:
+        case CompressionAlgorithm.ZLIB:
+            return zlib.compress(data, -1 if level is None else level)
+        case CompressionAlgorithm.LZ4:
+            return lz4_frame.compress(data, compression_level=0 if level is None else level)
+        case _:
+            return bytes(data)
+
+def decompress(algorithm: CompressionAlgorithm, data: bytes | bytearray | memoryview) -> bytes | bytearray | memoryview:
+    match algorithm:
+        case CompressionAlgorithm.ZLIB:
+            return zlib.decompress(data)
+        case CompressionAlgorithm.LZ4:
+            if lz4_frame is None:
+                raise CompressionUnavailable(algorithm.name)
+            return lz4_frame.decompress(data)
+        case _:
+            return data
+
+def decompress_chunks(algorithm: CompressionAlgorithm, data: bytes | bytearray | memoryview,
+                      chunk_size: int) -> Iterator[bytes | bytearray | memoryview]:
+    """
+    Decompresses data in pieces of at most chunk_size bytes, such that the decompressed data doesn't have to fit in memory.
+    """
+    match algorithm:
+        case CompressionAlgorithm.ZLIB:
+            decompressor = zlib.decompressobj()
+            while not decompressor.eof:
+                chunk = decompressor.decompress(data, chunk_size)
+                data = decompressor.unconsumed_tail
+                if not chunk and not data:
+                    break
+                yield chunk
+            yield decompressor.flush()
+        case CompressionAlgorithm.LZ4:
+            if lz4_frame is None:
+                raise CompressionUnavailable(algorithm.name)
+            decompressor = lz4_frame.LZ4FrameDecompressor()
+            while not decompressor.eof:
+                chunk = decompressor.decompress(data, max_length=chunk_size)
+                data = b""
+                if not chunk and decompressor.needs_input:
+                    break
+                yield chunk
+        case _:
+            yield data
+
+class ConnectionCompressor():
+    """
+    Keeps track of whether compression is worth it for a single connection.
+    """
+    def __init__(self, settings: CompressionSettings):
+        self.settings = settings
+        self.enabled = True
+        # the number of messages which were not compressed since compression was disabled
+        self.skipped = 0
+
+    def should_compress(self, size: int) -> bool:
+        if size < self.settings.min_size:
+            return False
+
+        if self.enabled:
+            return True
+
+        self.skipped += 1
+        # probe the connection every so often to see if the data has become compressible
+        return self.skipped >= self.settings.probe_interval
+
+    def update(self, size: int, compressed_size: int):
+        """
+        Updates the state of the connection with the observed compression ratio.
+        """
+        if not self.settings.adaptive:
+            return
+
+        self.enabled = compressed_size <= size * self.settings.max_ratio
+        self.skipped = 0
@@ -0,0 +1,46 @@
+from __future__ import annotations
+from typing import Any, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+
+class InputStream():
+    """
+    An input of a party which is read in chunks from an iterable, such that the whole input never has to be in memory.
+    The next chunk is read in a background thread while the current chunk is being processed,
+    so at most two chunks are in memory at once. Nothing is read before the first chunk is requested,
+    so the inputs of parties which are not local are never read.
+    """
+    def __init__(self, iterable: Iterable[Any], chunk_size: int):
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be at least 1")
+
+        self.iterator = iter(iterable)
+        self.chunk_size = chunk_size
+        self.exhausted = False
+        self.executor: ThreadPoolExecutor | None = None
+        self.next_chunk: Future | None = None
+
+    def read(self) -> list[Any]:
+        return list(islice(self.iterator, self.chunk_size))
+
+    def get_chunk(self) -> list[Any]:
+        """
+        Returns the next chunk of at most chunk_size values, once the iterable is exhausted an empty list is returned.
+        """
+        if self.exhausted:
+            return []
+
+        chunk = self.read() if self.next_chunk is None else self.next_chunk.result()
+        if len(chunk) < self.chunk_size:
+            # the iterable has no more values, so there is nothing to prefetch
+            self.close()
+        else:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1)
+            self.next_chunk = self.executor.submit(self.read)
+        return chunk
+
+    def close(self):
+        self.exhausted = True
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
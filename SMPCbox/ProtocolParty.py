@@ -2,11 +2,13 @@ from __future__ import annotations
 from typing import Any, Callable, Union, TYPE_CHECKING
 from .SMPCSocket import SMPCSocket, NotReceived
 from .exceptions import NonExistentVariable, IncorrectComputationResultDimension, VariableNotReceived, InvalidLocalVariableAccess
+from functools import partial
 import time
 from sys import getsizeof
 
 if TYPE_CHECKING:
     from ProtocolParty import TrackedStatistics
+    from .ProtocolPlan import ProtocolPlan
 
 
 class TrackedStatistics():
@@ -18,6 +20,10 @@ class TrackedStatistics():
         self.messages_received: int = 0
         self.bytes_send: int = 0
         self.bytes_received: int = 0
+        self.uncompressed_bytes_send: int = 0
+        self.compressed_bytes_send: int = 0
+        self.tls_handshake_time: float = 0
+        self.tls_crypto_time: float = 0
 
 
     def __str__(self):
@@ -29,7 +35,11 @@ class TrackedStatistics():
         messages_send: {self.messages_send}
         bytes_send: {self.bytes_send}
         messages_received: {self.messages_received}
-        bytes_received: {self.bytes_received}"""
+        bytes_received: {self.bytes_received}
+        uncompressed_bytes_send: {self.uncompressed_bytes_send}
+        compressed_bytes_send: {self.compressed_bytes_send}
+        tls_handshake_time: {self.tls_handshake_time}
+        tls_crypto_time: {self.tls_crypto_time}"""
 
     def __add__(self, other_stats: TrackedStatistics) -> TrackedStatistics:
         res = TrackedStatistics()
@@ -40,6 +50,10 @@ class TrackedStatistics():
         res.messages_received = self.messages_received + other_stats.messages_received
         res.bytes_send = self.bytes_send + other_stats.bytes_send
         res.bytes_received = self.bytes_received + other_stats.bytes_received
+        res.uncompressed_bytes_send = self.uncompressed_bytes_send + other_stats.uncompressed_bytes_send
+        res.compressed_bytes_send = self.compressed_bytes_send + other_stats.compressed_bytes_send
+        res.tls_handshake_time = self.tls_handshake_time + other_stats.tls_handshake_time
+        res.tls_crypto_time = self.tls_crypto_time + other_stats.tls_crypto_time
         return res
 
 class ProtocolParty ():
@@ -54,26 +68,39 @@ class ProtocolParty ():
 
         # a stack of prefixes which handle the namespaces of variable
         self.__namespace_prefixes: list[str] = []
+        # the namespace of the innermost subroutine, kept up to date since it is prepended to every variable name
+        self.__namespace = ""
 
         # stores the variables which have been "received" to not have to request them from the
         # SMPCSocket yet and the sender which send the variable
         self.not_yet_received_vars: dict[str, ProtocolParty] = {}
 
+        # the plan which is being recorded by AbstractProtocol.run_compiled, it is told about the variables
+        # read outside of computations since the control flow of the protocol can depend on their values
+        self.tracer: ProtocolPlan | None = None
+        self.computing = False
+
     def get_namespace(self) -> str:
+        return self.__namespace
+
+    def update_namespace(self):
         if len(self.__namespace_prefixes) == 0:
-            return ""
+            self.__namespace = ""
+            return
 
         # start with a '_' to seperate the var name from the namespace
         namespace = "_"
         for prefix in self.__namespace_prefixes:
             namespace = prefix + namespace
-        return namespace
+        self.__namespace = namespace
 
     def start_subroutine_protocol(self, subroutine_name: str):
         self.__namespace_prefixes.append(f"_{subroutine_name}")
+        self.update_namespace()
 
     def end_subroutine_protocol(self):
         old_prefix = self.__namespace_prefixes.pop()
+        self.update_namespace()
         # we wait on any unreceived variables that were part of the subroutine
         # Not doing so can lead to weird behaviour since new unreceived variables if the protocol
         # is run again might think variables have already arived in the SMPCSocket otherwise
@@ -91,12 +118,22 @@ class ProtocolParty ():
 
     def __getitem__(self, key):
         # Allows to use [] to retrieve variables of a party.
-        return self.get_variable(key)
+        value = self.get_variable(key)
+        if self.tracer is not None:
+            if self.computing:
+                self.tracer.read(self, key)
+            else:
+                self.tracer.guard(partial(self.get_variable, key), value, self.name, key)
+        return value
 
     def is_local(self):
         return self.socket.simulated or self.socket.listening_socket is not None
 
-    def get_variable(self, variable_name: str):
+    def get_variable(self, variable_name: str, timeout: float = 10):
+        """
+        Returns the value of a local variable, a variable which is send to this party is received first.
+        If the variable doesn't arrive within timeout seconds VariableNotReceived is raised.
+        """
         if not self.is_local():
             raise InvalidLocalVariableAccess(self.name, variable_name)
 
@@ -108,7 +145,7 @@ class ProtocolParty ():
             sender = self.not_yet_received_vars[variable_name]
             # request the variable from the socket
             s_wait_time = time.perf_counter()
-            value = self.socket.receive_variable(sender, variable_name)
+            value = self.socket.receive_variable(sender, variable_name, timeout)
             e_wait_time = time.perf_counter()
             if isinstance(value, NotReceived):
                 raise VariableNotReceived(sender.name, variable_name)
@@ -127,6 +164,44 @@ class ProtocolParty ():
 
         return self.__local_variables[variable_name]
 
+    def is_available(self, variable_name: str) -> bool:
+        """
+        Whether the variable can be read without waiting for it to be received.
+        """
+        full_name = self.get_namespace() + variable_name
+        sender = self.not_yet_received_vars.get(full_name)
+        return sender is None or self.socket.has_variable(sender, full_name)
+
+    def wait_for_new_variables(self, received_count: int, timeout: float) -> bool:
+        """
+        Waits until the socket has received more than received_count messages, the time spent is counted as wait time.
+        Returns False if no message arrives within timeout seconds.
+        """
+        s_wait_time = time.perf_counter()
+        arrived = self.socket.wait_for_new_variables(received_count, timeout)
+        self.statistics.wait_time += time.perf_counter() - s_wait_time
+        return arrived
+
+    def wait_for_variable(self, variable_name: str, timeout: float) -> bool:
+        """
+        Waits at most timeout seconds for a variable which is send to this party and returns whether it exists.
+        Unlike get_variable this doesn't raise an exception when the sender never sends the variable, for instance
+        because it has dropped out. The variable is then no longer expected, such that it is not waited on again.
+        """
+        full_name = self.get_namespace() + variable_name
+        arrived = True
+        if full_name in self.not_yet_received_vars:
+            try:
+                self.get_variable(variable_name, timeout)
+            except VariableNotReceived:
+                del self.not_yet_received_vars[full_name]
+                arrived = False
+
+        arrived = arrived and full_name in self.__local_variables
+        if self.tracer is not None and not self.computing:
+            self.tracer.guard(partial(self.wait_for_variable, variable_name, timeout), arrived, self.name, variable_name)
+        return arrived
+
     def run_computation(self, computed_vars: Union[str, list[str]], computation: Callable, description: str):
         # make sure the computed_vars are a list
         computed_vars = [computed_vars] if isinstance(computed_vars, str) else computed_vars
@@ -135,12 +210,18 @@ class ProtocolParty ():
         computed_vars = [self.get_namespace() + name for name in computed_vars]
 
         # get the local variables
+        # the time spent waiting on variables read by the computation is wait time, not execution time
+        wait_start = self.statistics.wait_time
         t_start = time.perf_counter()
         t_CPU_start = time.process_time()
-        res = computation()
+        self.computing = True
+        try:
+            res = computation()
+        finally:
+            self.computing = False
         t_CPU_end = time.process_time()
         t_end = time.perf_counter()
-        self.statistics.execution_time += t_end - t_start
+        self.statistics.execution_time += t_end - t_start - (self.statistics.wait_time - wait_start)
         self.statistics.execution_CPU_time += t_CPU_end - t_CPU_start
 
         # assign the output if there is just a single output variable
@@ -161,6 +242,13 @@ class ProtocolParty ():
     def set_local_variable(self, variable_name: str, value: Any):
         self.__local_variables[self.get_namespace() + variable_name] = value
 
+    def delete_variable(self, variable_name: str):
+        """
+        Removes a local variable, any value that has not been received yet is flushed from the SMPCSocket first.
+        """
+        self.get_variable(variable_name)
+        del self.__local_variables[self.get_namespace() + variable_name]
+
     def send_variables (self, receiver: 'ProtocolParty', variable_names: list[str]):
         values = [self.get_variable(var) for var in variable_names]
 
@@ -170,9 +258,30 @@ class ProtocolParty ():
             self.statistics.bytes_send += getsizeof(i)
 
         variable_names = [self.get_namespace() + name for name in variable_names]
-        self.socket.send_variables(receiver, variable_names, values)
+        uncompressed, compressed = self.socket.send_variables(receiver, variable_names, values)
+        self.statistics.uncompressed_bytes_send += uncompressed
+        self.statistics.compressed_bytes_send += compressed
+
+    def broadcast_variables (self, receivers: list['ProtocolParty'], variable_names: list[str]):
+        values = [self.get_variable(var) for var in variable_names]
+
+        # update the statistics, the message is sent to every receiver
+        self.statistics.messages_send += len(receivers)
+        for i in values:
+            self.statistics.bytes_send += getsizeof(i) * len(receivers)
+
+        variable_names = [self.get_namespace() + name for name in variable_names]
+        uncompressed, compressed = self.socket.broadcast_variables(receivers, variable_names, values)
+        self.statistics.uncompressed_bytes_send += uncompressed
+        self.statistics.compressed_bytes_send += compressed
 
     def receive_variables (self, sender: 'ProtocolParty', variable_names: list[str]):
+        for name in variable_names:
+            # a value of a previous run of the protocol which was never used is flushed from the SMPCSocket,
+            # it would otherwise be taken for the new value
+            if self.get_namespace() + name in self.not_yet_received_vars:
+                self.get_variable(name)
+
         variable_names = [self.get_namespace() + name for name in variable_names]
         # add the variables to the not_yet_received_vars
         for name in variable_names:
@@ -184,6 +293,9 @@ class ProtocolParty ():
         """
         Retreives the statistics of a single ProtocolParty
         """
+        # the TLS timings are measured by the socket, partly on the listening thread
+        self.statistics.tls_handshake_time = self.socket.tls_handshake_time
+        self.statistics.tls_crypto_time = self.socket.tls_crypto_time
         return self.statistics
 
     """ should be called to make sure the sockets exit nicely """
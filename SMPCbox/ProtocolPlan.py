@@ -0,0 +1,211 @@
+from __future__ import annotations
+from typing import Any, Callable, Hashable, Iterable, TYPE_CHECKING
+from functools import partial
+
+if TYPE_CHECKING:
+    from SMPCbox.ProtocolParty import ProtocolParty
+
+# the number of values of a single guard for which a branch is recorded, a protocol branching on more values is run normally
+MAX_BRANCHES = 16
+# the number of seconds a pipelined replay waits for a new variable before it waits on the next operation itself
+IDLE_TIMEOUT = 10
+
+# the variables read and written by an operation as (party, variable name) pairs, None for operations which can't be reordered
+Accesses = tuple[frozenset[tuple["ProtocolParty", str]], frozenset[tuple["ProtocolParty", str]]] | None
+
+def guard_key(value: Any) -> Hashable:
+    """
+    The key of the branch taken for the value of a guard, raises a TypeError when the value can't be used as a key.
+    """
+    if isinstance(value, list):
+        value = tuple(value)
+    hash(value)
+    return value
+
+class PlanSegment():
+    """
+    A sequence of operations followed by an optional guard. The guard reads the variable the protocol branched on
+    after the operations, its value selects the segment which follows.
+    """
+    def __init__(self):
+        self.operations: list[partial] = []
+        self.accesses: list[Accesses] = []
+        self.guard: Callable[[], Any] | None = None
+        # (party name, variable name) of the variable read by the guard
+        self.guard_read: tuple[str, str] | None = None
+        self.branches: dict[Hashable, PlanSegment] = {}
+
+class ProtocolPlan():
+    """
+    The operations of the local parties in runs of a protocol, recorded by AbstractProtocol.run_compiled.
+    Every operation is a method of a ProtocolParty (or of the protocol for broadcasts and subroutines) together with its
+    resolved arguments, so replaying the plan skips the control flow of __call__ and the checks of compute and send_variables.
+    The computations themselves are the functions passed to compute, they read the new inputs when the plan is replayed.
+
+    A variable which is read outside of a computation, such as the choice bit b in branchingExamples/OT_using_if.py,
+    ends the current segment of the plan with a guard. The operations after it are recorded as a branch for the value
+    which was read, and a replay which reads a value without a recorded branch stops such that the protocol can record it.
+    Since only the local parties are recorded, in a distributed run the plans of the other parties have no guards at all.
+    A plan becomes dynamic when the values read can't be used as keys or when a guard has more than MAX_BRANCHES values,
+    the protocol is then always run normally.
+
+    The variables read by the computations (with party[name]) and the variables written by every operation are recorded
+    as well. A pipelined replay uses them to run any operation whose variables are available while an earlier operation
+    waits on a variable which hasn't been received yet. Broadcasts and subroutines are never reordered.
+    """
+    def __init__(self, parties: tuple, running_party: str | None):
+        # the parties and running party the plan was recorded for, the plan is only valid for the same parties
+        self.parties = parties
+        self.running_party = running_party
+        self.root = PlanSegment()
+        self.dynamic = False
+        # (party name, variable name) of the read which made the plan dynamic
+        self.dynamic_read: tuple[str, str] | None = None
+
+        # the position of the recording, the operations before it have already been executed by a replay
+        self.__segment = self.root
+        self.__position = 0
+        # the variables read by the operation which is being recorded
+        self.__reads: set[tuple[ProtocolParty, str]] | None = None
+        # the local parties which receive their variables over the network
+        self.__receiving_parties = [party for party in parties if party.is_local() and not party.socket.simulated]
+
+    def start_recording(self):
+        self.__segment = self.root
+        self.__position = 0
+
+    def run(self, operation: Callable, *args, reads: Iterable[tuple[ProtocolParty, str]] = (),
+            writes: Iterable[tuple[ProtocolParty, str]] | None = None):
+        """
+        Records and executes an operation. When a run of the protocol records a new branch, the operations of
+        the segments before it are already part of the plan and have been executed by the replay, those are skipped.
+        reads and writes are the variables the operation uses, the variables read by computations are added while it runs.
+        Operations for which no writes are given, such as broadcasts and subroutines, are never reordered.
+        """
+        if self.__position < len(self.__segment.operations):
+            self.__position += 1
+            return
+
+        bound_operation = partial(operation, *args)
+        if self.dynamic:
+            bound_operation()
+            return
+
+        self.__reads = set(reads)
+        try:
+            bound_operation()
+        finally:
+            operation_reads, self.__reads = self.__reads, None
+        self.__segment.operations.append(bound_operation)
+        self.__segment.accesses.append(None if writes is None else (frozenset(operation_reads), frozenset(writes)))
+        self.__position += 1
+
+    def read(self, party: ProtocolParty, variable_name: str):
+        """
+        Called by a ProtocolParty when a computation reads one of its variables while the plan is recorded.
+        """
+        if self.__reads is not None:
+            self.__reads.add((party, variable_name))
+
+    def guard(self, read: Callable[[], Any], value: Any, party_name: str, variable_name: str):
+        """
+        Called by a ProtocolParty when one of its variables is read outside of a computation while the plan is recorded.
+        read reads the variable again when the plan is replayed, value is the value which has been read.
+        """
+        if self.dynamic:
+            return
+
+        segment = self.__segment
+        if self.__position < len(segment.operations) or (segment.guard is not None and segment.guard_read != (party_name, variable_name)):
+            raise RuntimeError(f"The protocol read {variable_name} of {party_name} at another point than when its plan was recorded, "
+                               "the control flow of a protocol run with run_compiled should only depend on the variables it reads")
+
+        try:
+            key = guard_key(value)
+        except TypeError:
+            self.__make_dynamic(party_name, variable_name)
+            return
+
+        branch = segment.branches.get(key)
+        if branch is None:
+            if len(segment.branches) >= MAX_BRANCHES:
+                self.__make_dynamic(party_name, variable_name)
+                return
+            segment.guard = read
+            segment.guard_read = (party_name, variable_name)
+            branch = segment.branches[key] = PlanSegment()
+
+        self.__segment = branch
+        self.__position = 0
+
+    def __make_dynamic(self, party_name: str, variable_name: str):
+        self.dynamic = True
+        self.dynamic_read = (party_name, variable_name)
+
+    def replay(self, pipelined: bool = False) -> bool:
+        """
+        Executes the operations of the plan, returns False when a guard reads a value for which no branch has been recorded.
+        pipelined: Run operations out of order while earlier operations wait on variables, see execute_pipelined.
+        """
+        segment = self.root
+        while True:
+            if pipelined:
+                self.execute_pipelined(segment)
+            else:
+                for operation in segment.operations:
+                    operation()
+            if segment.guard is None:
+                return True
+
+            try:
+                segment = segment.branches.get(guard_key(segment.guard()))
+            except TypeError:
+                return False
+            if segment is None:
+                return False
+
+    def execute_pipelined(self, segment: PlanSegment):
+        """
+        Executes the operations of a segment, preferring the order in which they were recorded. When the next operation
+        reads a variable which hasn't been received yet, the first later operation which only reads available variables
+        and doesn't conflict with the operations it skips runs instead. Only when no operation can run the party waits,
+        which is counted as its wait time.
+        """
+        pending = list(range(len(segment.operations)))
+        while len(pending) > 0:
+            received_counts = [(party, party.socket.received_count) for party in self.__receiving_parties]
+            position = self.__ready_position(segment, pending)
+            if position is None:
+                if self.__wait_for_variables(segment.accesses[pending[0]], received_counts):
+                    continue
+                # nothing arrived, the operation waits on its variable itself which raises VariableNotReceived if it never arrives
+                position = 0
+            segment.operations[pending.pop(position)]()
+
+    def __ready_position(self, segment: PlanSegment, pending: list[int]) -> int | None:
+        # the variables used by the operations which are skipped, a later operation may not write or read what they write
+        skipped_reads: set[tuple[ProtocolParty, str]] = set()
+        skipped_writes: set[tuple[ProtocolParty, str]] = set()
+        for position, index in enumerate(pending):
+            accesses = segment.accesses[index]
+            if accesses is None:
+                # only runs after all the operations before it
+                return 0 if position == 0 else None
+
+            reads, writes = accesses
+            if (skipped_writes.isdisjoint(reads) and skipped_writes.isdisjoint(writes) and skipped_reads.isdisjoint(writes)
+                    and all(party.is_available(name) for party, name in reads)):
+                return position
+            skipped_reads |= reads
+            skipped_writes |= writes
+        return None
+
+    def __wait_for_variables(self, accesses: Accesses, received_counts: list[tuple[ProtocolParty, int]]) -> bool:
+        # the first pending operation is waiting on one of its variables, the party waits until any variable arrives
+        for party, name in accesses[0]:
+            if not party.is_available(name):
+                for receiving_party, received_count in received_counts:
+                    if receiving_party is party:
+                        return party.wait_for_new_variables(received_count, IDLE_TIMEOUT)
+                return False
+        return True
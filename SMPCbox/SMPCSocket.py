@@ -1,12 +1,23 @@
 from __future__ import annotations
 from typing import Any, TYPE_CHECKING, Union
 import socket
+import ssl
 import threading
-import json
+import struct
 import select
 import time
+import sys
+import os
+import tempfile
+import mmap
+import ipaddress
+from functools import lru_cache
 from enum import Enum
 from .exceptions import UnableToConnect
+from .Serializer import default_serializer, SegmentedBuffer, write_bytes, write_varint, read_bytes, read_varint
+from .Compression import CompressionAlgorithm, CompressionSettings, ConnectionCompressor, compress, decompress, decompress_chunks
+from .TLS import TLSSettings
+from .Transport import TransportConfig
 
 if TYPE_CHECKING:
     from ProtocolParty import ProtocolParty
@@ -27,15 +38,54 @@ def parse_address(address: str) -> tuple[str, int]:
 def stringify_address(ip:str, port:int):
     return f"{ip}:{port}"
 
+# Addresses starting with this prefix are paths of unix domain sockets, for example "unix:/tmp/alice.sock"
+UNIX_PREFIX = "unix:"
+
+def is_unix_address(address: str) -> bool:
+    return address.startswith(UNIX_PREFIX)
+
+def fast_path_address(address: str) -> str:
+    """
+    Returns the unix domain socket a party listening on the TCP address also listens on.
+    Parties on the same host connect to this socket instead, which skips the TCP/IP stack.
+    """
+    name = f"smpcbox-{address.replace(':', '-')}.sock"
+    if sys.platform.startswith("linux"):
+        # an abstract socket, which doesn't leave a file behind
+        return "\0" + name
+    return os.path.join(tempfile.gettempdir(), name)
+
+@lru_cache(maxsize=None)
+def local_ips() -> frozenset[str]:
+    try:
+        return frozenset(socket.gethostbyname_ex(socket.gethostname())[2])
+    except OSError:
+        return frozenset()
+
+def is_local_host(ip: str) -> bool:
+    """
+    Returns whether the ip address belongs to this machine.
+    """
+    if ip == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(ip).is_loopback or ip in local_ips()
+    except ValueError:
+        return False
+
 def get_key_by_value(d, value):
-    for key, val in d.items():
+    for key, val in list(d.items()):
         if val == value:
             return key
     return None
 
 class MessageType(Enum):
-    ANNOUNCE_NAME="ANNOUNCE"
-    SEND_VARIABLES="SEND_VARS"
+    ANNOUNCE_NAME=0
+    SEND_VARIABLES=1
+    BROADCAST=2
+    ACKNOWLEDGE=3
+    STREAM_START=4
+    CREDIT=5
 
 def parse_enum(enum_class, val):
     try:
@@ -43,23 +93,126 @@ def parse_enum(enum_class, val):
     except ValueError as e:
         raise e
 
-def construct_msg(type: MessageType, content: str) -> str:
-    return f"{type.value}${len(content)}${content}"
+# Every message starts with a header containing the message type, the compression algorithm and the length of the content
+HEADER = struct.Struct("!BBQ")
+# The content of a STREAM_START message: the type and compression of the streamed message, its length and the chunk size
+STREAM_START = struct.Struct("!BBQI")
+# The content of a CREDIT message: the number of chunks the sender of a stream may send
+CREDIT = struct.Struct("!I")
+
+def construct_msg(type: MessageType, content: bytes | bytearray, compression: CompressionAlgorithm = CompressionAlgorithm.NONE) -> bytearray:
+    msg = bytearray(HEADER.pack(type.value, compression.value, len(content)))
+    msg += content
+    return msg
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    received = b""
+    while len(received) < size:
+        data = sock.recv(size - len(received))
+        if not data:
+            raise ConnectionResetError()
+        received += data
+    return received
+
+def split_chunks(views: list[memoryview], chunk_size: int) -> list[list[memoryview]]:
+    """
+    Splits consecutive memoryviews into chunks of chunk_size bytes (the last chunk can be smaller), without copying.
+    """
+    chunks = []
+    chunk = []
+    remaining = chunk_size
+    for view in views:
+        while len(view) > 0:
+            piece = view[:remaining]
+            chunk.append(piece)
+            view = view[len(piece):]
+            remaining -= len(piece)
+            if remaining == 0:
+                chunks.append(chunk)
+                chunk = []
+                remaining = chunk_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def spill_file(file, length: int) -> memoryview:
+    """
+    Memory maps the first length bytes of a temporary file. The mapping keeps the file open, the file is deleted once the
+    mapping is no longer used.
+    """
+    file.truncate(length)
+    file.flush()
+    return memoryview(mmap.mmap(file.fileno(), length))
+
+class IncomingStream():
+    """
+    A message which is being streamed to this socket, the chunks are received directly into a buffer of the final size.
+    """
+    def __init__(self, msg_type: int, compression: int, length: int, chunk_size: int, transport: TransportConfig):
+        self.msg_type = parse_enum(MessageType, msg_type)
+        self.compression = parse_enum(CompressionAlgorithm, compression)
+        # compressed streams are only spilled after being decompressed
+        self.spilled = (transport.spill_threshold is not None and length >= max(transport.spill_threshold, 1)
+                        and self.compression == CompressionAlgorithm.NONE)
+        if self.spilled:
+            with tempfile.TemporaryFile(dir=transport.spill_directory) as file:
+                self.buffer = spill_file(file, length)
+        else:
+            self.buffer = bytearray(length)
+        self.view = memoryview(self.buffer)
+        self.received = 0
+        self.chunk_size = chunk_size
+        self.num_chunks = -(-length // chunk_size)
+        # the number of chunks the sender is allowed to send
+        self.granted = 0
+
+    def remaining(self) -> int:
+        return len(self.buffer) - self.received
 
 class SMPCSocket ():
     def __init__ (self):
+        # the address as provided by the user, either "ip:port" or "unix:/path"
+        self.address: str | None = None
         self.ip = None
         self.port = None
         self.simulated = True
+        # whether connections to parties on the same host use a unix domain socket instead of TCP
+        self.unix_fast_path = True
+        # the options of the sockets used
+        self.transport = TransportConfig()
 
         # a buffer storing all received variables which have not been requested by the parrent class via
         # the receive variable function.
         # Behind each var a list is stored, this allows buffering of multiple values
         self.received_variables: dict[str | SMPCSocket, dict[str, list[Any]]] = {}
+        # notified by the listening thread whenever variables are put in the buffer
+        self.received_condition = threading.Condition()
+        # the number of messages put in the buffer, used to wait for any new variable
+        self.received_count = 0
         self.smpc_socket_in_use = True
+        # the accepted connections of other parties, these are only used to receive variables
         self.client_sockets: dict[socket.socket, str | None] = {}
+        # the connections made to other parties by their listening address, these are only used to send variables
+        self.connections: dict[str, socket.socket] = {}
+        # the received bytes of each client socket which do not yet form a complete message
+        self.receive_buffers: dict[socket.socket, bytearray] = {}
+        # the streams which are being received on a client socket
+        self.incoming_streams: dict[socket.socket, IncomingStream] = {}
+
+        # the compression used for the messages send by this socket, None disables compression
+        self.compression: CompressionSettings | None = None
+        self.compressors: dict[str, ConnectionCompressor] = {}
+
+        # the TLS settings used for all connections, None uses plain TCP
+        self.tls: TLSSettings | None = None
+        self.tls_handshake_time: float = 0
+        self.tls_crypto_time: float = 0
         self.listening_socket = None
+        # the socket listening on the fast path for parties on the same host
+        self.fast_path_socket = None
         self.listening_thread = None
+        # the timeout used for connections which are opened on the first send
+        self.connection_timeout: float | None = 60
 
     def set_address(self, address: str):
         """
@@ -67,118 +220,362 @@ class SMPCSocket ():
         Calling this method sets the SMPCSocket to start using actual sockets
         """
         self.simulated = False
-        self.ip, self.port = parse_address(address)
+        self.address = address
+        if not is_unix_address(address):
+            self.ip, self.port = parse_address(address)
 
-    def decode_received_msg(self, msg:str, sock: socket.socket):
+    def set_compression(self, compression: CompressionSettings | None):
+        """
+        Sets the compression used for the messages this socket sends. The state of the adaptive compression is kept per connection.
         """
-        decodes a message received from a client socket
+        self.compression = compression
+        self.compressors = {}
+
+    def set_tls(self, tls: TLSSettings | None):
+        """
+        Sets the TLS settings used for both the accepted and the initiated connections of this socket.
+        """
+        self.tls = tls
+
+    def decode_received_msg(self, msg: memoryview, sock: socket.socket) -> int:
+        """
+        decodes the messages received from a client socket
         The message can be either variables or the initial msg that specifies who this client is
         by sending their listening ip and port.
+        Returns the number of bytes that were decoded, an incomplete message at the end of msg is left
+        untill the rest of it is received.
         """
+        offset = 0
+        while len(msg) - offset >= HEADER.size:
+            msg_type, compression, msg_length = HEADER.unpack_from(msg, offset)
+            if len(msg) - offset - HEADER.size < msg_length:
+                # the message has not been fully received yet
+                break
+
+            msg_content = msg[offset + HEADER.size:offset + HEADER.size + msg_length]
+            offset += HEADER.size + msg_length
+
+            msg_type = parse_enum(MessageType, msg_type)
+            # the decoder expects a memoryview, decompressing gives bytes
+            msg_content = memoryview(decompress(parse_enum(CompressionAlgorithm, compression), msg_content))
+
+            match msg_type:
+                case MessageType.SEND_VARIABLES | MessageType.BROADCAST:
+                    self.receive_variables(sock, msg_content)
+
+                case MessageType.ANNOUNCE_NAME:
+                    self.client_sockets[sock] = str(msg_content, "utf-8")
+                case MessageType.STREAM_START:
+                    self.incoming_streams[sock] = IncomingStream(*STREAM_START.unpack(msg_content), self.transport)
+                    # the bytes following this message are the content of the stream
+                    break
+                case _:
+                    raise Exception(f"Received message starting with unknown message type {msg_type}")
 
+        return offset
 
-        msg_type, msg_length, rest = msg.split('$', maxsplit=2)
-        msg_length = int(msg_length)
-        msg_content = rest[:msg_length]
-        additional_data = rest[msg_length:]
+    def receive_variables(self, sock: socket.socket, content: memoryview, copy: bool = True, memoryviews: bool = False):
+        var_names, values = self.decode_variables(content, copy, memoryviews)
 
-        msg_type = parse_enum(MessageType, msg_type)
+        sender_addr = self.client_sockets[sock]
+        if sender_addr == None:
+            raise Exception("Received variables from unknown client socket")
+        self.put_variables_in_buffer(sender_addr, var_names, values)
 
-        match msg_type:
-            case MessageType.SEND_VARIABLES:
-                variables = msg_content.split()
-                var_names = []
-                values = []
-                for i in range(0, len(variables), 2):
-                    var_name = variables[i]
-                    value = json.loads(variables[i+1])
-                    var_names.append(var_name)
-                    values.append(value)
+    def process_buffer(self, sock: socket.socket):
+        """
+        Decodes the complete messages in the receive buffer of a client socket.
+        Bytes following the start of a stream are moved into the buffer of the stream.
+        """
+        buffer = self.receive_buffers.setdefault(sock, bytearray())
+        while True:
+            stream = self.incoming_streams.get(sock)
+            if stream is None:
+                with memoryview(buffer) as view:
+                    decoded = self.decode_received_msg(view, sock)
+                del buffer[:decoded]
+                if sock not in self.incoming_streams:
+                    return
+            else:
+                size = min(len(buffer), stream.remaining())
+                stream.view[stream.received:stream.received + size] = buffer[:size]
+                del buffer[:size]
+                stream.received += size
+                if not self.stream_received(sock, stream):
+                    return
+
+    def stream_received(self, sock: socket.socket, stream: IncomingStream) -> bool:
+        """
+        Handles newly received bytes of a stream, returns True if the stream is complete.
+        """
+        if stream.remaining() > 0:
+            self.grant_credits(sock, stream)
+            return False
+
+        content, spilled = stream.view, stream.spilled
+        if stream.compression != CompressionAlgorithm.NONE:
+            content, spilled = self.decompress_stream(stream)
+
+        if spilled:
+            # the values are read-only views on the memory mapped file, so they are never copied into memory
+            self.receive_variables(sock, content.toreadonly(), copy=False, memoryviews=True)
+        elif stream.compression == CompressionAlgorithm.NONE:
+            # the buffer of the stream isn't reused, so numpy arrays can be views on it instead of copies
+            self.receive_variables(sock, content, copy=False)
+        else:
+            self.receive_variables(sock, content)
+        del self.incoming_streams[sock]
+        return True
 
-                sender_addr = self.client_sockets[sock]
-                if sender_addr == None:
-                    raise Exception("Received variables from unknown client socket")
-                self.put_variables_in_buffer(sender_addr, var_names, values)
+    def decompress_stream(self, stream: IncomingStream) -> tuple[memoryview, bool]:
+        """
+        Decompresses a stream, the result is spilled to a memory mapped file once it exceeds the spill threshold.
+        Returns the decompressed content and whether it was spilled.
+        """
+        threshold = self.transport.spill_threshold
+        if threshold is None:
+            return memoryview(decompress(stream.compression, stream.view)), False
+
+        pieces = []
+        size = 0
+        file = None
+        for piece in decompress_chunks(stream.compression, stream.view, self.transport.chunk_size):
+            if file is None and size + len(piece) >= threshold:
+                file = tempfile.TemporaryFile(dir=self.transport.spill_directory)
+                file.writelines(pieces)
+                pieces = []
+            if file is None:
+                pieces.append(piece)
+            else:
+                file.write(piece)
+            size += len(piece)
+
+        if file is None:
+            return memoryview(b"".join(pieces)), False
+        with file:
+            return spill_file(file, size), True
 
-            case MessageType.ANNOUNCE_NAME:
-                ip, port = parse_address(msg_content)
-                self.client_sockets[sock] = stringify_address(ip,port)
-            case _:
-                raise Exception(f"Received message starting with unknown message type {msg_type}")
+    def is_streaming_from(self, sender_addr: str) -> bool:
+        return any(self.client_sockets.get(sock) == sender_addr for sock in list(self.incoming_streams.keys()))
 
-        if additional_data:
-            # the data contained another message
-            self.decode_received_msg(additional_data, sock)
+    def grant_credits(self, sock: socket.socket, stream: IncomingStream):
+        """
+        Allows the sender of a stream to send more chunks once at most half of the window is outstanding.
+        """
+        window = self.transport.stream_window
+        completed = stream.received // stream.chunk_size
+        if stream.granted - completed > window // 2 or stream.granted >= stream.num_chunks:
+            return
+
+        credits = min(stream.num_chunks, completed + window) - stream.granted
+        sock.sendall(construct_msg(MessageType.CREDIT, CREDIT.pack(credits)))
+        stream.granted += credits
+
+    def receive(self, sock: socket.socket) -> bool:
+        """
+        Reads the available data of a client socket, returns False if the client has closed the connection.
+        """
+        while True:
+            stream = self.incoming_streams.get(sock)
+            if stream is not None:
+                # the content of a stream is received directly into its buffer
+                received = sock.recv_into(stream.view[stream.received:])
+                if received == 0:
+                    return False
+                stream.received += received
+                if self.stream_received(sock, stream):
+                    self.process_buffer(sock)
+            else:
+                data = sock.recv(self.transport.recv_size)
+                if not data:
+                    return False
+                self.receive_buffers.setdefault(sock, bytearray()).extend(data)
+                self.process_buffer(sock)
+
+            # the socket can have already decrypted data which select doesn't know about
+            if not isinstance(sock, ssl.SSLSocket) or sock.pending() == 0:
+                return True
 
     def start_listening(self):
         """
         Starts the listening thread of this socket.
         """
         # create the listening socket which will accept incomming connections and also read messages
-        self.listening_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.listening_socket.bind((self.ip, self.port))
-        # TODO remove magic number for backlog in listen
-        self.listening_socket.listen(5)
-        self.listening_thread = threading.Thread(target=self.listen)
+        if is_unix_address(self.address):
+            path = self.address[len(UNIX_PREFIX):]
+            if os.path.exists(path):
+                # the socket file of a previous run
+                os.remove(path)
+            self.listening_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.listening_socket.bind(path)
+        else:
+            if self.unix_fast_path:
+                self.fast_path_socket = self.listen_on_fast_path()
+            self.listening_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.listening_socket.bind((self.ip, self.port))
+        self.transport.apply(self.listening_socket)
+        self.listening_socket.listen(self.transport.backlog)
+        # a daemon thread, such that a party which crashes during the protocol doesn't keep the process alive
+        self.listening_thread = threading.Thread(target=self.listen, daemon=True)
         self.listening_thread.start()
 
+    def listen_on_fast_path(self) -> socket.socket | None:
+        path = fast_path_address(self.address)
+        fast_path_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            if not path.startswith("\0") and os.path.exists(path):
+                os.remove(path)
+            fast_path_socket.bind(path)
+            self.transport.apply(fast_path_socket)
+            fast_path_socket.listen(self.transport.backlog)
+        except OSError:
+            # the fast path is an optimisation, the party can still be reached over TCP
+            fast_path_socket.close()
+            return None
+        return fast_path_socket
+
     def listen(self):
         if self.listening_socket is None:
             # listen only gets called from the start_listening method which inits the listening socket
             raise Exception()
 
-        while self.smpc_socket_in_use:
-            # TODO put the timeout as a setting (timeout needed so the socket stops if self.smpc_socket_in_use if false)
+        # streams which have started are received completely, such that their sender isn't left waiting on credits
+        while self.smpc_socket_in_use or self.incoming_streams:
+            # the timeout is needed so the socket stops if self.smpc_socket_in_use is false
             client_socks = list(self.client_sockets.keys())
-            readable_sockets, _, _ = select.select(client_socks + [self.listening_socket], [], [], 0.1)
+            listening_socks = [self.listening_socket] if self.fast_path_socket is None else [self.listening_socket, self.fast_path_socket]
+            readable_sockets, _, _ = select.select(client_socks + listening_socks, [], [], self.transport.select_timeout)
             for socket in readable_sockets:
-                if socket == self.listening_socket and self.smpc_socket_in_use:
-                    client_socket, _ = self.listening_socket.accept()
+                if socket in listening_socks:
+                    if not self.smpc_socket_in_use:
+                        continue
+                    client_socket, _ = socket.accept()
+                    self.transport.apply(client_socket)
+                    if self.tls is not None:
+                        client_socket = self.accept_tls(client_socket)
+                        if client_socket is None:
+                            continue
                     # we do not yet know the listening ip and port this socket coresponds to
                     self.client_sockets[client_socket] = None
                 else:
-                    # TODO create a setting for buffer size
-                    data = socket.recv(4096)
-                    if data:
-                        msg = data.decode()
-                        self.decode_received_msg(msg, socket)
-                    else:
-                        pass
+                    start = time.perf_counter()
+                    connected = self.receive(socket)
+                    if isinstance(socket, ssl.SSLSocket):
+                        self.tls_crypto_time += time.perf_counter() - start
+                    if not connected:
                         # The client has closed their side of the socket
+                        del self.client_sockets[socket]
+                        self.receive_buffers.pop(socket, None)
+                        self.incoming_streams.pop(socket, None)
+                        socket.close()
 
         # close all the connections
         if not self.simulated and self.listening_socket:
             for connection in self.client_sockets.keys():
                 connection.close()
+            for addr, connection in self.connections.items():
+                if self.tls is not None and connection.session is not None:
+                    # keep the session such that the next connection to this party can resume it
+                    self.tls.sessions[addr] = connection.session
+                connection.close()
 
         self.listening_socket.close()
+        if self.fast_path_socket is not None:
+            self.fast_path_socket.close()
+        if is_unix_address(self.address):
+            os.remove(self.address[len(UNIX_PREFIX):])
+
+    def get_address(self) -> str:
+        if self.address == None:
+            return ""
+
+        return self.address
+
+    def accept_tls(self, client_socket: socket.socket) -> ssl.SSLSocket | None:
+        """
+        Performs the server side of the TLS handshake, returns None if the handshake failed.
+        """
+        start = time.perf_counter()
+        try:
+            tls_socket = self.tls.server_context().wrap_socket(client_socket, server_side=True)
+            # Send a message such that the client waits untill the handshake is done and the session tickets
+            # have been received, which are needed to resume the session later.
+            tls_socket.sendall(construct_msg(MessageType.ACKNOWLEDGE, b""))
+        except (ssl.SSLError, OSError):
+            # the other side could not be authenticated
+            client_socket.close()
+            return None
+        finally:
+            self.tls_handshake_time += time.perf_counter() - start
+
+        return tls_socket
+
+    def connect_tls(self, new_client: socket.socket, addr: str) -> ssl.SSLSocket:
+        """
+        Performs the client side of the TLS handshake, resuming the previous session to the same address if there is one.
+        """
+        start = time.perf_counter()
+        tls_socket = self.tls.client_context().wrap_socket(new_client, session=self.tls.sessions.get(addr))
 
-    def get_address(self) -> tuple[str, int]:
-        if self.ip == None or self.port == None:
-            return "", 0
+        # wait on the acknowledgement of the server
+        recv_exactly(tls_socket, HEADER.size)
 
-        return self.ip, self.port
+        self.tls_handshake_time += time.perf_counter() - start
+        return tls_socket
+
+    def open_connection(self, addr: str) -> socket.socket:
+        """
+        Connects to the party listening on the address, using the unix domain socket fast path if the party is on the same host.
+        """
+        if is_unix_address(addr):
+            new_client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                new_client.connect(addr[len(UNIX_PREFIX):])
+            except OSError:
+                new_client.close()
+                raise
+            return new_client
+
+        ip, port = parse_address(addr)
+        if self.unix_fast_path and is_local_host(ip):
+            new_client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                new_client.connect(fast_path_address(addr))
+                return new_client
+            except OSError:
+                # the party doesn't listen on the fast path, for instance because it runs in another network namespace
+                new_client.close()
 
-    def connect_to_client(self, ip: str, port: int, timeout: float = 10):
         new_client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            new_client.connect((ip, port))
+        except OSError:
+            new_client.close()
+            raise
+        return new_client
+
+    def connect_to_client(self, addr: str, timeout: float | None = 10):
         start = time.time()
         while timeout == None or (time.time() - start) < timeout:
             try:
-                new_client.connect((ip, port))
-                self.client_sockets[new_client] = stringify_address(ip, port)
-
-                # announce who we are
-                msg_content =  f"{self.ip}:{self.port}"
-                message = construct_msg(MessageType.ANNOUNCE_NAME, msg_content)
-                new_client.sendall(message.encode())
-                return
-            except (socket.timeout, ConnectionRefusedError):
+                new_client = self.open_connection(addr)
+            except (socket.timeout, ConnectionRefusedError, FileNotFoundError):
                 time.sleep(0.25)
                 continue
 
+            self.transport.apply(new_client)
+            if self.tls is not None:
+                new_client = self.connect_tls(new_client, addr)
+            self.connections[addr] = new_client
+
+            # announce who we are
+            message = construct_msg(MessageType.ANNOUNCE_NAME, self.get_address().encode())
+            new_client.sendall(message)
+            return
+
         # connection was unsucessfull
-        raise UnableToConnect(ip, port)
+        raise UnableToConnect(addr)
 
 
 
@@ -191,9 +588,9 @@ class SMPCSocket ():
 
         # if we aren't simulated establish the connections
         for party in other_parties:
-            ip, port = party.socket.get_address()
-            if stringify_address(ip, port) not in self.client_sockets:
-                self.connect_to_client(ip, port, timeout=timeout)
+            addr = party.socket.get_address()
+            if addr not in self.connections:
+                self.connect_to_client(addr, timeout=timeout)
 
 
     """
@@ -209,15 +606,33 @@ class SMPCSocket ():
 
 
     def put_variables_in_buffer (self, sender: str | SMPCSocket, variable_names: list[str], values: list[Any]):
-        if not sender in self.received_variables.keys():
-            self.received_variables[sender] = {}
+        with self.received_condition:
+            if not sender in self.received_variables.keys():
+                self.received_variables[sender] = {}
 
-        # add all the provided variables
-        for var, val in zip(variable_names, values):
-            if var in self.received_variables[sender]:
-                self.received_variables[sender][var].append(val)
-            else:
-                self.received_variables[sender][var] = [val]
+            # add all the provided variables
+            for var, val in zip(variable_names, values):
+                if var in self.received_variables[sender]:
+                    self.received_variables[sender][var].append(val)
+                else:
+                    self.received_variables[sender][var] = [val]
+            self.received_count += 1
+            self.received_condition.notify_all()
+
+    def has_variable(self, sender: 'ProtocolParty', variable_name: str) -> bool:
+        """
+        Whether the variable has been received from the sender, without taking it from the buffer.
+        """
+        key = sender.socket if self.simulated else sender.socket.get_address()
+        with self.received_condition:
+            return variable_name in self.received_variables.get(key, {})
+
+    def wait_for_new_variables(self, received_count: int, timeout: float) -> bool:
+        """
+        Waits until variables are received after received_count messages, returns False if none arrive within timeout seconds.
+        """
+        with self.received_condition:
+            return self.received_condition.wait_for(lambda: self.received_count != received_count, timeout)
 
     """
     Stores a received_variables in the buffer
@@ -246,46 +661,147 @@ class SMPCSocket ():
             return value
         else:
             # we keep checking untill the listening socket has put the message into the queue
-            sender_addr = stringify_address(*sender.socket.get_address())
+            sender_addr = sender.socket.get_address()
+
+            deadline = time.time() + timeout
+            with self.received_condition:
+                while True:
+                    # a large message can take longer than the timeout to arrive, so we keep waiting while the sender is streaming.
+                    # This is checked before the buffer, since a stream is only finished once its variables are in the buffer.
+                    streaming = self.is_streaming_from(sender_addr)
+                    value = self.get_variable_from_buffer(sender_addr, variable_name)
+                    if not isinstance(value, NotReceived):
+                        return value
+
+                    remaining = deadline - time.time()
+                    if self.address == None or (remaining <= 0 and not streaming):
+                        # no need to wait for network delay when simulating
+                        break
+                    # the listening thread wakes us up as soon as new variables are received
+                    self.received_condition.wait(remaining if remaining > 0 else self.transport.select_timeout)
 
-            start_time = time.time()
-            while (time.time() - start_time < timeout):
-                value = self.get_variable_from_buffer(sender_addr, variable_name)
-                if not isinstance(value, NotReceived):
-                    return value
+            return NotReceived()
 
-                if self.ip == None:
-                    # no need to wait for network delay since were simulating it all
-                    break
-                time.sleep(0.1)
+    def get_client_socket(self, receiver_socket: SMPCSocket) -> socket.socket:
+        """
+        Returns the connection to the party listening on the address of the receiver_socket.
+        """
+        addr = receiver_socket.get_address()
 
-            return NotReceived()
+        if addr not in self.connections:
+            # The receiver was not part of the topology used to set up the connections,
+            # so the connection is only opened now on the first send.
+            self.connect_to_client(addr, timeout=self.connection_timeout)
 
-    """
-    This function sends the variable to this socket.
-    """
-    def send_variables (self, receiver: 'ProtocolParty', variable_names: list[str], values: list[Any]):
-        receiver_socket: 'SMPCSocket' = receiver.socket
-        if self.simulated:
-              # we simulate the socket by putting the variable in the buffer of received variables
-            receiver_socket.put_variables_in_buffer(self, variable_names, values)
-        else:
-            # check for an existing connection
-            addr = stringify_address(*receiver_socket.get_address())
+        return self.connections[addr]
 
-            if addr not in self.client_sockets.values():
-                raise Exception(f"Client with listening address {addr} not connected")
+    def encode_variables(self, variable_names: list[str], values: list[Any]) -> SegmentedBuffer:
+        # large values are not copied into the buffer, they are send directly from the memory of the value
+        content = SegmentedBuffer(self.transport.chunk_size)
+        write_varint(content, len(variable_names))
+        for var, val in zip(variable_names, values):
+            write_bytes(content, var.encode())
+            default_serializer.encode(content, val)
 
-            msg = ""
-            # Add all the variables
-            for var, val in zip(variable_names, values):
-                msg += f" {var} {json.dumps(val)}"
+        return content
+
+    def decode_variables(self, content: memoryview, copy: bool = True, memoryviews: bool = False) -> tuple[list[str], list[Any]]:
+        var_names = []
+        values = []
+        num_vars, offset = read_varint(content, 0)
+        for _ in range(num_vars):
+            var_name, offset = read_bytes(content, offset)
+            value, offset = default_serializer.decode(content, offset, copy, memoryviews)
+            var_names.append(str(var_name, "utf-8"))
+            values.append(value)
+
+        return var_names, values
+
+    def use_compression(self, receiver_socket: SMPCSocket, size: int) -> ConnectionCompressor | None:
+        """
+        Returns the compressor of the connection to the receiver if a message of the given size should be compressed.
+        """
+        if self.compression is None or self.compression.algorithm == CompressionAlgorithm.NONE:
+            return None
 
-            msg = construct_msg(MessageType.SEND_VARIABLES, msg)
-            socket = get_key_by_value(self.client_sockets, addr)
-            if socket == None:
-                # we have just checked that the addr exists so we know there will be a socket
-                raise Exception()
+        addr = receiver_socket.get_address()
+        if addr not in self.compressors:
+            self.compressors[addr] = ConnectionCompressor(self.compression)
 
-            socket.sendall(msg.encode())
+        compressor = self.compressors[addr]
+        return compressor if compressor.should_compress(size) else None
 
+    """
+    This function sends the variable to this socket.
+    Returns the number of bytes of the encoded variables and the number of bytes actually send after compression.
+    """
+    def send_variables (self, receiver: 'ProtocolParty', variable_names: list[str], values: list[Any]) -> tuple[int, int]:
+        return self.broadcast_variables([receiver], variable_names, values, MessageType.SEND_VARIABLES)
+
+    def broadcast_variables (self, receivers: list['ProtocolParty'], variable_names: list[str], values: list[Any],
+                             msg_type: MessageType = MessageType.BROADCAST) -> tuple[int, int]:
+        """
+        Sends the variables to all of the receivers. The message is only encoded (and compressed) once,
+        the same buffer is then sent to each of the receivers.
+        Returns the number of bytes of the encoded variables and the number of bytes actually send after compression,
+        summed over the receivers.
+        """
+        if self.simulated:
+            # we simulate the socket by putting the variable in the buffer of received variables
+            for receiver in receivers:
+                receiver.socket.put_variables_in_buffer(self, variable_names, values)
+            return 0, 0
+
+        content = self.encode_variables(variable_names, values)
+        size = content.total_length()
+        compressed = None
+        # the framed messages, by compression algorithm, such that they are only constructed once
+        msgs: dict[CompressionAlgorithm, memoryview] = {}
+        uncompressed_bytes, compressed_bytes = 0, 0
+        for receiver in receivers:
+            compressor = self.use_compression(receiver.socket, size)
+            if compressor is not None:
+                if compressed is None:
+                    compressed = compress(self.compression.algorithm, content.join(), self.compression.level)
+                compressor.update(size, len(compressed))
+
+            if compressor is not None and len(compressed) < size:
+                algorithm, views = self.compression.algorithm, [memoryview(compressed)]
+            else:
+                algorithm, views = CompressionAlgorithm.NONE, content.views()
+            length = sum(len(view) for view in views)
+
+            client_socket = self.get_client_socket(receiver.socket)
+            start = time.perf_counter()
+            if length >= self.transport.stream_threshold:
+                self.stream_msg(client_socket, msg_type, views, algorithm)
+            else:
+                if algorithm not in msgs:
+                    msgs[algorithm] = memoryview(construct_msg(msg_type, bytearray().join(views), algorithm))
+                client_socket.sendall(msgs[algorithm])
+            if self.tls is not None:
+                self.tls_crypto_time += time.perf_counter() - start
+            uncompressed_bytes += size
+            compressed_bytes += length
+
+        return uncompressed_bytes, compressed_bytes
+
+    def stream_msg(self, client_socket: socket.socket, msg_type: MessageType, views: list[memoryview],
+                   compression: CompressionAlgorithm):
+        """
+        Sends a large message in chunks, a chunk is only send once the receiver has granted a credit for it.
+        """
+        length = sum(len(view) for view in views)
+        chunk_size = self.transport.chunk_size
+        client_socket.sendall(construct_msg(MessageType.STREAM_START,
+                                            STREAM_START.pack(msg_type.value, compression.value, length, chunk_size)))
+        credits = 0
+        for chunk in split_chunks(views, chunk_size):
+            while credits == 0:
+                msg_type, _, msg_length = HEADER.unpack(recv_exactly(client_socket, HEADER.size))
+                if msg_type != MessageType.CREDIT.value or msg_length != CREDIT.size:
+                    raise Exception(f"Expected a credit message while streaming, received message type {msg_type}")
+                credits += CREDIT.unpack(recv_exactly(client_socket, CREDIT.size))[0]
+            for piece in chunk:
+                client_socket.sendall(piece)
+            credits -= 1
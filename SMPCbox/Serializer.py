@@ -0,0 +1,342 @@
+from __future__ import annotations
+from typing import Any, Callable
+from array import array
+import struct
+import sys
+from .exceptions import UnserializableValue, UnknownSerializerTag
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+"""
+The binary encoding used to send variables between parties.
+
+Every value is written as a one byte type tag followed by the encoding of the value.
+The builtin types (int, bytes, str, float, list, numpy arrays, ...) have fast paths
+which write the value directly. Types registered by users are first converted to a
+value which can itself be serialized and are written behind the tag of the type.
+"""
+
+# The tags of the builtin fast paths
+NONE = 0
+FALSE = 1
+TRUE = 2
+INT = 3
+FLOAT = 4
+STR = 5
+BYTES = 6
+BYTEARRAY = 7
+LIST = 8
+TUPLE = 9
+DICT = 10
+NDARRAY = 11
+BIGINT = 12
+INT_LIST = 13
+REGISTERED = 255
+
+FLOAT_STRUCT = struct.Struct("!d")
+
+# ints with more bits than this are written as their bytes instead of as a varint, which is quadratic in the bit length
+MAX_VARINT_BITS = 64
+
+# the types with a fast path, values of these exact types are never looked up in the registered types
+BUILTIN_TYPES = {type(None), bool, int, float, str, bytes, bytearray, list, tuple, dict}
+if numpy is not None:
+    BUILTIN_TYPES.add(numpy.ndarray)
+
+def encode_int_list(out: bytearray, value: list) -> bool:
+    """
+    Writes a list of ints which all fit in 64 bits as a packed array, returns False if the list doesn't fit this format.
+    """
+    if not all(type(item) is int for item in value):
+        return False
+    try:
+        packed = array("q", value)
+    except OverflowError:
+        return False
+
+    if sys.byteorder != "little":
+        packed.byteswap()
+    out.append(INT_LIST)
+    write_varint(out, len(value))
+    out += memoryview(packed).cast("B")
+    return True
+
+def decode_int_list(data: memoryview, offset: int) -> tuple[list[int], int]:
+    length, offset = read_varint(data, offset)
+    packed = array("q")
+    end = offset + length * packed.itemsize
+    packed.frombytes(data[offset:end])
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tolist(), end
+
+def write_varint(out: bytearray, value: int):
+    """
+    Writes a non negative integer using 7 bits per byte, the highest bit marks that more bytes follow.
+    """
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data: memoryview, offset: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+class SegmentedBuffer(bytearray):
+    """
+    A buffer for encoding values which doesn't copy large byte strings and numpy arrays.
+    Instead of being appended these are stored as segments, each with the offset in the buffer they should be inserted at.
+    """
+    def __init__(self, min_segment_size: int):
+        super().__init__()
+        self.min_segment_size = min_segment_size
+        self.segments: list[tuple[int, memoryview]] = []
+
+    def total_length(self) -> int:
+        return len(self) + sum(len(segment) for _, segment in self.segments)
+
+    def views(self) -> list[memoryview]:
+        """
+        Returns the encoding as a list of consecutive memoryviews.
+        """
+        views = []
+        start = 0
+        data = memoryview(self)
+        for offset, segment in self.segments:
+            views.append(data[start:offset])
+            views.append(segment)
+            start = offset
+        views.append(data[start:])
+        return [view for view in views if len(view) > 0]
+
+    def join(self) -> bytearray:
+        if not self.segments:
+            return self
+        return bytearray().join(self.views())
+
+def write_bytes(out: bytearray, value: bytes | bytearray | memoryview):
+    write_varint(out, len(value))
+    if isinstance(out, SegmentedBuffer) and len(value) >= out.min_segment_size:
+        out.segments.append((len(out), memoryview(value).cast("B")))
+    else:
+        out += value
+
+def read_bytes(data: memoryview, offset: int) -> tuple[memoryview, int]:
+    length, offset = read_varint(data, offset)
+    return data[offset:offset + length], offset + length
+
+class Serializer:
+    """
+    Encodes and decodes the values of variables send between parties.
+    Additional types can be supported using the register method.
+    """
+    def __init__(self):
+        # maps a registered class to its tag, encode function and decode function
+        self.registered_types: dict[type, tuple[str, Callable[[Any], Any], Callable[[Any], Any]]] = {}
+        self.registered_tags: dict[str, Callable[[Any], Any]] = {}
+
+    def register(self, cls: type, tag: str, encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+        """
+        Registers a custom type.
+        The encode function converts an instance of cls to a value which can be serialized (for example bytes or a list),
+        the decode function converts this value back into an instance of cls.
+        The tag identifies the type on the wire and should therefore be the same for all parties.
+        """
+        self.registered_types[cls] = (tag, encode, decode)
+        self.registered_tags[tag] = decode
+
+    def dumps(self, value: Any) -> bytearray:
+        out = bytearray()
+        self.encode(out, value)
+        return out
+
+    def loads(self, data: bytes | bytearray | memoryview) -> Any:
+        value, _ = self.decode(memoryview(data), 0)
+        return value
+
+    def encode(self, out: bytearray, value: Any):
+        """
+        Appends the encoding of value to out.
+        """
+        value_type = type(value)
+
+        # registered types are checked first such that subclasses of builtin types (e.g. a list subclass) keep their type
+        if self.registered_types:
+            registered = self.registered_types.get(value_type)
+            if registered is None and value_type not in BUILTIN_TYPES:
+                # the type might be a subclass of a registered type
+                for cls in value_type.__mro__:
+                    if cls in self.registered_types:
+                        registered = self.registered_types[cls]
+                        break
+
+            if registered is not None:
+                tag, encode, _ = registered
+                out.append(REGISTERED)
+                write_bytes(out, tag.encode())
+                self.encode(out, encode(value))
+                return
+
+        if value is None:
+            out.append(NONE)
+        elif value_type is bool:
+            out.append(TRUE if value else FALSE)
+        elif isinstance(value, int):
+            if value.bit_length() < MAX_VARINT_BITS:
+                out.append(INT)
+                # zigzag encoding maps negative numbers to odd numbers so the varint stays short
+                write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+            else:
+                out.append(BIGINT)
+                # one extra bit for the sign
+                write_bytes(out, value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True))
+        elif isinstance(value, float):
+            out.append(FLOAT)
+            out += FLOAT_STRUCT.pack(value)
+        elif isinstance(value, str):
+            out.append(STR)
+            write_bytes(out, value.encode())
+        elif isinstance(value, bytes):
+            out.append(BYTES)
+            write_bytes(out, value)
+        elif isinstance(value, bytearray):
+            out.append(BYTEARRAY)
+            write_bytes(out, value)
+        elif isinstance(value, list) and len(value) > 0 and encode_int_list(out, value):
+            pass
+        elif isinstance(value, (list, tuple)):
+            out.append(LIST if isinstance(value, list) else TUPLE)
+            write_varint(out, len(value))
+            for item in value:
+                self.encode(out, item)
+        elif isinstance(value, dict):
+            out.append(DICT)
+            write_varint(out, len(value))
+            for key, item in value.items():
+                self.encode(out, key)
+                self.encode(out, item)
+        elif numpy is not None and isinstance(value, numpy.ndarray):
+            if value.dtype.hasobject:
+                # an object array holds python objects, so it is send as a nested list
+                self.encode(out, value.tolist())
+                return
+            self.encode_ndarray(out, value)
+        elif numpy is not None and isinstance(value, numpy.generic):
+            self.encode(out, value.item())
+        else:
+            raise UnserializableValue(value)
+
+    def encode_ndarray(self, out: bytearray, value: Any):
+        dtype = value.dtype
+        # ascontiguousarray turns a 0 dimensional array into a 1 dimensional array, so the shape is taken first
+        shape = value.shape
+        value = numpy.ascontiguousarray(value)
+        if dtype.kind in "mM":
+            # datetimes can't be exported as a buffer, their int64 representation is send instead
+            value = value.view(numpy.int64)
+
+        try:
+            buffer = memoryview(value).cast("B")
+        except (ValueError, TypeError):
+            raise UnserializableValue(value)
+
+        out.append(NDARRAY)
+        self.encode(out, dtype.str if dtype.names is None else dtype.descr)
+        write_varint(out, len(shape))
+        for dim in shape:
+            write_varint(out, dim)
+        write_bytes(out, buffer)
+
+    def decode(self, data: memoryview, offset: int, copy: bool = True, memoryviews: bool = False) -> tuple[Any, int]:
+        """
+        Decodes the value starting at offset, returns the value and the offset directly after it.
+        If copy is False numpy arrays are views on data instead of copies, which is only safe if data
+        is not reused for anything else. If memoryviews is True bytes and bytearrays are returned as
+        memoryviews on data as well.
+        """
+        tag = data[offset]
+        offset += 1
+
+        if tag == NONE:
+            return None, offset
+        elif tag == FALSE:
+            return False, offset
+        elif tag == TRUE:
+            return True, offset
+        elif tag == INT:
+            zigzag, offset = read_varint(data, offset)
+            return (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1), offset
+        elif tag == BIGINT:
+            value, offset = read_bytes(data, offset)
+            return int.from_bytes(value, "little", signed=True), offset
+        elif tag == INT_LIST:
+            return decode_int_list(data, offset)
+        elif tag == FLOAT:
+            return FLOAT_STRUCT.unpack_from(data, offset)[0], offset + FLOAT_STRUCT.size
+        elif tag == STR:
+            value, offset = read_bytes(data, offset)
+            return str(value, "utf-8"), offset
+        elif tag == BYTES:
+            value, offset = read_bytes(data, offset)
+            return (value if memoryviews else bytes(value)), offset
+        elif tag == BYTEARRAY:
+            value, offset = read_bytes(data, offset)
+            return (value if memoryviews else bytearray(value)), offset
+        elif tag == LIST or tag == TUPLE:
+            length, offset = read_varint(data, offset)
+            items = []
+            for _ in range(length):
+                item, offset = self.decode(data, offset, copy, memoryviews)
+                items.append(item)
+            return (items if tag == LIST else tuple(items)), offset
+        elif tag == DICT:
+            length, offset = read_varint(data, offset)
+            result = {}
+            for _ in range(length):
+                key, offset = self.decode(data, offset, copy, memoryviews)
+                result[key], offset = self.decode(data, offset, copy, memoryviews)
+            return result, offset
+        elif tag == NDARRAY:
+            if numpy is None:
+                raise UnknownSerializerTag("numpy.ndarray (numpy is not installed)")
+            descr, offset = self.decode(data, offset, copy, memoryviews)
+            # structured dtypes are send as their description, which is a list of fields
+            dtype = numpy.dtype(descr if isinstance(descr, str) else [tuple(field) for field in descr])
+            ndim, offset = read_varint(data, offset)
+            shape = []
+            for _ in range(ndim):
+                dim, offset = read_varint(data, offset)
+                shape.append(dim)
+            buffer, offset = read_bytes(data, offset)
+            array = numpy.frombuffer(buffer, dtype=dtype).reshape(shape)
+            return (array.copy() if copy else array), offset
+        elif tag == REGISTERED:
+            name, offset = read_bytes(data, offset)
+            name = str(name, "utf-8")
+            if name not in self.registered_tags:
+                raise UnknownSerializerTag(name)
+            value, offset = self.decode(data, offset, copy, memoryviews)
+            return self.registered_tags[name](value), offset
+        else:
+            raise UnknownSerializerTag(str(tag))
+
+# The serializer used by all SMPCSockets
+default_serializer = Serializer()
+
+def register_type(cls: type, tag: str, encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+    """
+    Registers a custom type such that variables of this type can be send between parties.
+    See Serializer.register.
+    """
+    default_serializer.register(cls, tag, encode, decode)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+import ssl
+
+class TLSSettings():
+    def __init__(self, certfile: str, keyfile: str, cafile: str, ktls: bool = False, num_tickets: int = 2):
+        """
+        The settings used to encrypt and authenticate the connections of a party using TLS 1.3.
+
+        certfile: the certificate of the local party, it is presented both when accepting and when initiating connections.
+        keyfile: the private key belonging to the certificate.
+        cafile: the certificate authority used to verify the certificates of the other parties.
+        ktls: if True the encryption is offloaded to the kernel when both python and the kernel support kernel TLS.
+        num_tickets: the number of session tickets handed out for each accepted connection.
+
+        The settings object keeps the TLS sessions of the connections made by the party. Using the same settings
+        object for multiple protocol runs resumes these sessions, which avoids the full handshake.
+        """
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.cafile = cafile
+        self.ktls = ktls
+        self.num_tickets = num_tickets
+
+        # the sessions of previous connections by the address of the party connected to
+        self.sessions: dict[str, ssl.SSLSession] = {}
+
+        self.__server_context: ssl.SSLContext | None = None
+        self.__client_context: ssl.SSLContext | None = None
+
+    def __create_context(self, protocol: int) -> ssl.SSLContext:
+        context = ssl.SSLContext(protocol)
+        context.minimum_version = ssl.TLSVersion.TLSv1_3
+        context.load_cert_chain(self.certfile, self.keyfile)
+        context.load_verify_locations(self.cafile)
+        # parties are addressed by ip, so they are authenticated by their certificate being signed by the CA
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_REQUIRED
+
+        ktls_option = getattr(ssl, "OP_ENABLE_KTLS", None)
+        if self.ktls and ktls_option is not None:
+            context.options |= ktls_option
+        return context
+
+    def server_context(self) -> ssl.SSLContext:
+        # the contexts are reused since sessions can only be resumed using the context that created them
+        if self.__server_context is None:
+            self.__server_context = self.__create_context(ssl.PROTOCOL_TLS_SERVER)
+            self.__server_context.num_tickets = self.num_tickets
+        return self.__server_context
+
+    def client_context(self) -> ssl.SSLContext:
+        if self.__client_context is None:
+            self.__client_context = self.__create_context(ssl.PROTOCOL_TLS_CLIENT)
+        return self.__client_context
@@ -0,0 +1,334 @@
+from __future__ import annotations
+from typing import Any, Iterator
+from bisect import bisect_right
+from queue import Empty
+import heapq
+import mmap
+import os
+import struct
+import time
+from .CommunicationLayer import ProtocolSide, Step
+from .ProtocolParty import TrackedStatistics
+from .Serializer import Serializer, write_varint, read_varint, STR, LIST, TUPLE, DICT
+from .constants import MAX_VALUE_LENGTH
+from .exceptions import InvalidTraceFile
+
+"""
+A trace file records the steps of protocol runs as the visualiser would show them, such that the runs can be replayed
+in the visualiser and slow steps can be found afterwards. The file starts with TRACE_MAGIC, followed by a record for every step:
+    the length of the rest of the record (varint)
+    the type of the step, RUN_START for the start of a run (varint)
+    the number of nanoseconds since the previous record (varint)
+    the arguments of the step, encoded by the Serializer
+Records are only appended, a run which is cut short leaves a file of which every complete record can still be read.
+The index file next to it (the path with INDEX_SUFFIX) has an INDEX_ENTRY for the start of every run and every
+INDEX_INTERVAL records, such that a reader can start at any step without reading the records before it.
+"""
+
+TRACE_MAGIC = b"SMPCTRC\x01"
+INDEX_SUFFIX = ".idx"
+# the record number, file offset and time in nanoseconds of a record, and whether it starts a run
+INDEX_ENTRY = struct.Struct("<QQQ?")
+# the number of records between two entries of the index
+INDEX_INTERVAL = 256
+# the step type of the record which starts a run, its arguments are the protocol name and the party names
+RUN_START = 0
+# the number of steps in a batch of a TraceQueue
+REPLAY_BATCH_SIZE = 100
+
+# only builtin types are recorded, the values of variables are already truncated to strings
+serializer = Serializer()
+# the number of encoded strings a TraceRecorder keeps, the names of parties and variables are written for every step
+MAX_CACHED_STRINGS = 4096
+
+
+class TraceEvent:
+    """
+    A record of a trace file. step is None for the start of a run, of which args are the protocol name and the party names.
+    duration is the time since the previous record, which for a computation is the time it took.
+    """
+    def __init__(self, index: int, timestamp: int, duration: int, step: Step | None, args: tuple):
+        self.index = index
+        self.timestamp = timestamp
+        self.duration = duration
+        self.step = step
+        self.args = args
+
+    def __repr__(self) -> str:
+        name = "RUN_START" if self.step is None else self.step.name
+        return f"TraceEvent({self.index}, {name}, {self.duration / 1e6:.3f}ms)"
+
+
+def pack_statistics(party_statistics: dict[str, TrackedStatistics], protocol_statistics: TrackedStatistics) -> tuple:
+    # the statistics of every party are packed as doubles, a protocol with many parties has a large list of statistics
+    fields = list(vars(protocol_statistics))
+    statistics_struct = struct.Struct(f"<{len(fields)}d")
+    pack = lambda statistics: statistics_struct.pack(*(getattr(statistics, field) for field in fields))
+    return (fields, {name: pack(statistics) for name, statistics in party_statistics.items()}, pack(protocol_statistics))
+
+
+def unpack_statistics(fields: list[str], party_statistics: dict[str, bytes], protocol_statistics: bytes) -> tuple:
+    statistics_struct = struct.Struct(f"<{len(fields)}d")
+
+    def unpack(values: bytes) -> TrackedStatistics:
+        statistics = TrackedStatistics()
+        for field, value in zip(fields, statistics_struct.unpack(values)):
+            setattr(statistics, field, int(value) if isinstance(getattr(statistics, field, 0.0), int) else value)
+        return statistics
+    return ({name: unpack(values) for name, values in party_statistics.items()}, unpack(protocol_statistics))
+
+
+class TraceRecorder(ProtocolSide):
+    """
+    A ProtocolSide which appends the steps of a protocol to a trace file instead of sending them to a visualiser,
+    so a protocol can be recorded without a gui. The steps are written as they happen, a recorder can record many runs
+    and a file can be opened again to append more runs.
+
+    p = Sum(3)
+    with TraceRecorder("sum.trace") as recorder:
+        p.set_protocol_visualiser(recorder)
+        p.set_input(...)
+        p.run()
+    """
+    def __init__(self, path: str, value_length: int = MAX_VALUE_LENGTH):
+        super().__init__(None, value_length=value_length)  # type: ignore
+        self.path = path
+        # the encodings of the strings which were written before
+        self.strings: dict[str, bytes] = {}
+        self.record_count = 0
+        self.last_time = 0
+        end = index_entries = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            # the records continue after the last complete record, an incomplete record which was cut short is removed
+            with TraceReader(path) as reader:
+                last = reader.last_event()
+                end = reader.end
+                index_entries = sum(1 for entry in reader.index_entries if entry[1] < end)
+            if last is not None:
+                self.record_count = last.index + 1
+                self.last_time = last.timestamp
+
+        self.file = open(path, "ab")
+        self.index_file = open(path + INDEX_SUFFIX, "ab")
+        self.file.truncate(end)
+        self.index_file.truncate(index_entries * INDEX_ENTRY.size)
+        if end == 0:
+            self.file.write(TRACE_MAGIC)
+            end = len(TRACE_MAGIC)
+        self.offset = end
+
+    def __enter__(self) -> TraceRecorder:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start_run(self, protocol_name: str, party_names: list[str]):
+        self.__write(RUN_START, (protocol_name, list(party_names)))
+
+    def add_step(self, step: tuple[Step, tuple]):
+        step_type, args = step
+        self.__write(step_type.value, args)
+
+    def end_protocol(self, party_statistics: dict[str, TrackedStatistics], protocol_statistics: TrackedStatistics):
+        """Records the end of the protocol with its statistics, the records are then written to the file."""
+        self.__write(Step.END_PROTOCOL.value, pack_statistics(party_statistics, protocol_statistics))
+        self.flush()
+
+    def flush(self, block: bool = False) -> bool:
+        self.file.flush()
+        self.index_file.flush()
+        return True
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+            self.index_file.close()
+
+    def __write(self, step_type: int, args: tuple):
+        # the clock can go back, the timestamps in the file never do
+        now = max(time.time_ns(), self.last_time)
+        record = bytearray()
+        write_varint(record, step_type)
+        write_varint(record, now - self.last_time)
+        self.__encode(record, args)
+
+        if step_type == RUN_START or self.record_count % INDEX_INTERVAL == 0:
+            self.index_file.write(INDEX_ENTRY.pack(self.record_count, self.offset, now, step_type == RUN_START))
+
+        header = bytearray()
+        write_varint(header, len(record))
+        self.file.write(header)
+        self.file.write(record)
+        self.offset += len(header) + len(record)
+        self.record_count += 1
+        self.last_time = now
+
+    def __encode(self, out: bytearray, value: Any):
+        # the same encoding as the Serializer, but faster for the strings and containers of which steps consist
+        value_type = type(value)
+        if value_type is str:
+            encoded = self.strings.get(value)
+            if encoded is None:
+                data = value.encode()
+                header = bytearray([STR])
+                write_varint(header, len(data))
+                encoded = bytes(header) + data
+                if len(self.strings) >= MAX_CACHED_STRINGS:
+                    self.strings.clear()
+                self.strings[value] = encoded
+            out += encoded
+        elif value_type is dict:
+            out.append(DICT)
+            write_varint(out, len(value))
+            for key, item in value.items():
+                self.__encode(out, key)
+                self.__encode(out, item)
+        elif value_type is tuple or (value_type is list and not all(type(item) is int for item in value)):
+            out.append(TUPLE if value_type is tuple else LIST)
+            write_varint(out, len(value))
+            for item in value:
+                self.__encode(out, item)
+        else:
+            serializer.encode(out, value)
+
+
+class TraceReader:
+    """
+    Reads the records of a trace file written by a TraceRecorder. The index file is used to start reading at a record or
+    time without reading the records before it, without an index file the records are read from the start.
+    The file is mapped in memory, records written after the reader was opened aren't read.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+                raise InvalidTraceFile(path, "the file doesn't start with the trace header")
+            self.size = os.fstat(file.fileno()).st_size
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self.mmap)
+        # the offset after the last complete record which has been read
+        self.end = len(TRACE_MAGIC)
+
+        # (record number, offset, timestamp, run start) of the indexed records, entries past the end of the file are
+        # left over from a run which was cut short
+        self.index_entries: list[tuple[int, int, int, bool]] = []
+        if os.path.exists(path + INDEX_SUFFIX):
+            with open(path + INDEX_SUFFIX, "rb") as index_file:
+                index_data = index_file.read()
+            complete = len(index_data) - len(index_data) % INDEX_ENTRY.size
+            entries = [entry for entry in INDEX_ENTRY.iter_unpack(index_data[:complete]) if entry[1] < self.size]
+            if entries and entries[0][0] == 0:
+                self.index_entries = entries
+        # without an index file the records are read from the first record
+        self.index = self.index_entries or [(0, len(TRACE_MAGIC), 0, False)]
+        self.index_records = [entry[0] for entry in self.index]
+        self.index_times = [entry[2] for entry in self.index]
+
+    def __enter__(self) -> TraceReader:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.data.release()
+        self.mmap.close()
+
+    def last_event(self) -> TraceEvent | None:
+        """The last complete record of the file, None if it has no records."""
+        for entry in reversed(self.index):
+            last = None
+            for last in self.__read(entry, entry[0]):
+                pass
+            if last is not None:
+                return last
+        return None
+
+    def events(self, start: int = 0) -> Iterator[TraceEvent]:
+        """The records from record number start, the reading starts at the last indexed record before it."""
+        position = bisect_right(self.index_records, start) - 1
+        yield from self.__read(self.index[max(position, 0)], start)
+
+    def events_after(self, timestamp: int) -> Iterator[TraceEvent]:
+        """The records written at or after timestamp, in nanoseconds since the epoch as given by time.time_ns."""
+        # the reading starts at the last indexed record before the timestamp
+        position = max(bisect_right(self.index_times, timestamp) - 1, 0)
+        for event in self.__read(self.index[position], 0):
+            if event.timestamp >= timestamp:
+                yield event
+
+    def runs(self) -> list[TraceEvent]:
+        """The records which start a run, their args are the protocol name and the party names."""
+        if not self.index_entries:
+            return [event for event in self.events() if event.step is None]
+
+        runs = []
+        for entry in self.index_entries:
+            event = next(self.__read(entry, entry[0]), None) if entry[3] else None
+            if event is not None:
+                runs.append(event)
+        return runs
+
+    def run_events(self, run: int = 0) -> Iterator[TraceEvent]:
+        """The records of a run, without the record which starts it."""
+        runs = self.runs()
+        if not -len(runs) <= run < len(runs):
+            raise IndexError(f"The trace file '{self.path}' has {len(runs)} runs")
+        for event in self.events(runs[run].index + 1):
+            if event.step is None:
+                return
+            yield event
+
+    def slowest(self, count: int, run: int | None = None) -> list[TraceEvent]:
+        """The count records with the longest duration, of all the runs or of a single run."""
+        events = self.events() if run is None else self.run_events(run)
+        return heapq.nlargest(count, (event for event in events if event.step is not None), key=lambda event: event.duration)
+
+    def __read(self, entry: tuple[int, int, int, bool], start: int) -> Iterator[TraceEvent]:
+        index, offset, _, _ = entry
+        # the first record holds its time since the epoch, an indexed record its time in the index
+        timestamp = 0
+        data = self.data
+        while offset < self.size:
+            try:
+                length, record_start = read_varint(data, offset)
+                if record_start + length > self.size:
+                    return
+                step_type, position = read_varint(data, record_start)
+                duration, position = read_varint(data, position)
+                args, _ = serializer.decode(data[:record_start + length], position)
+            except IndexError:
+                # the last record was cut short
+                return
+
+            timestamp = entry[2] if index == entry[0] and index > 0 else timestamp + duration
+            offset = record_start + length
+            self.end = max(self.end, offset)
+            if index >= start:
+                if step_type == Step.END_PROTOCOL.value:
+                    args = unpack_statistics(*args)
+                step = None if step_type == RUN_START else Step(step_type)
+                yield TraceEvent(index, timestamp, duration if index > 0 else 0, step, tuple(args))
+            index += 1
+
+
+class TraceQueue:
+    """
+    Replays a run of a trace file in the visualiser, in place of the queue a running protocol puts its steps in.
+    Like the queue, get returns batches of steps and raises Empty when there are no steps left.
+    """
+    def __init__(self, reader: TraceReader, run: int = 0, batch_size: int = REPLAY_BATCH_SIZE):
+        self.events = reader.run_events(run)
+        self.batch_size = batch_size
+
+    def get(self, block: bool = True, timeout: float | None = None) -> list[tuple[Step, tuple]]:
+        batch: list[tuple[Step, tuple]] = []
+        for event in self.events:
+            batch.append((event.step, event.args))  # type: ignore
+            if len(batch) == self.batch_size:
+                break
+        if len(batch) == 0:
+            raise Empty
+        return batch
@@ -0,0 +1,68 @@
+from __future__ import annotations
+import socket
+
+class TransportConfig():
+    def __init__(self, tcp_nodelay: bool = True, send_buffer_size: int | None = None, receive_buffer_size: int | None = None,
+                 keepalive: bool = False, keepalive_idle: int | None = None, keepalive_interval: int | None = None,
+                 keepalive_count: int | None = None, backlog: int = 128, select_timeout: float = 0.1, recv_size: int = 65536,
+                 stream_threshold: int = 1 << 20, chunk_size: int = 1 << 18, stream_window: int = 8,
+                 spill_threshold: int | None = None, spill_directory: str | None = None):
+        """
+        The options of the sockets used by a party.
+
+        tcp_nodelay: disables Nagle's algorithm, such that small messages are send immediately instead of being delayed
+                     untill more data is available.
+        send_buffer_size, receive_buffer_size: the SO_SNDBUF and SO_RCVBUF sizes in bytes, if None the default of the OS is used.
+        keepalive: enables TCP keepalive probes, keepalive_idle, keepalive_interval (seconds) and keepalive_count set
+                   when the probes start, the time between probes and the number of probes before the connection is dropped.
+        backlog: the number of connections which can wait on being accepted by the listening socket.
+        select_timeout: the time in seconds the listening thread waits for data before checking if the socket has been closed.
+        recv_size: the maximum number of bytes read from a connection at once.
+        stream_threshold: messages of at least this number of bytes are streamed in chunks of chunk_size bytes. The receiver
+                          reads a stream directly into a buffer of the final size and grants the sender credits for
+                          stream_window chunks at a time, such that a large message never fills the receiver's memory faster
+                          than it can be read.
+        spill_threshold: received streams of at least this number of bytes are stored in a memory mapped temporary file in
+                         spill_directory (the default temporary directory if None) instead of in memory. The numpy arrays,
+                         bytes and bytearrays in such a message are received as read-only views on the file. Only streamed
+                         messages are spilled, None disables spilling.
+        """
+        if chunk_size < 1 or stream_window < 1:
+            raise ValueError("chunk_size and stream_window should be at least 1")
+
+        self.tcp_nodelay = tcp_nodelay
+        self.send_buffer_size = send_buffer_size
+        self.receive_buffer_size = receive_buffer_size
+        self.keepalive = keepalive
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count = keepalive_count
+        self.backlog = backlog
+        self.select_timeout = select_timeout
+        self.recv_size = recv_size
+        self.stream_threshold = stream_threshold
+        self.chunk_size = chunk_size
+        self.stream_window = stream_window
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+
+    def apply(self, sock: socket.socket):
+        """
+        Sets the options on a socket, the TCP specific options are skipped for unix domain sockets.
+        """
+        if self.send_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        if self.receive_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size)
+
+        if sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.tcp_nodelay))
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(self.keepalive))
+        if self.keepalive:
+            # these options are not available on every platform
+            for option, value in [("TCP_KEEPIDLE", self.keepalive_idle), ("TCP_KEEPINTVL", self.keepalive_interval),
+                                  ("TCP_KEEPCNT", self.keepalive_count)]:
+                if value is not None and hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
@@ -6,11 +6,15 @@ import sys
 from SMPCbox.AbstractProtocol import AbstractProtocol
 from SMPCbox.ProtocolParty import ProtocolParty
 from multiprocessing import Process, Queue, Event
+from collections import deque
+from queue import Empty
 from enum import Enum
 import inspect
-from SMPCbox.CommunicationLayer import Step, ProtocolSide
+from SMPCbox.CommunicationLayer import Step, ProtocolSide, EventPolicy
+from SMPCbox.TraceFile import TraceReader, TraceQueue
 import signal
-from .constants import TIMER_INTERVAL, NoDefault, QUEUE_SIZE
+import time
+from .constants import TIMER_INTERVAL, QUEUE_TIME_BUDGET, NoDefault, QUEUE_SIZE
 from SMPCbox.Lobby import PeerLobby, Host, Peer
 
 
@@ -124,7 +128,7 @@ class State(Enum):
 
 
 class ProtocolVisualizer(ProtocolSide):
-    def __init__(self, distributed = False):
+    def __init__(self, distributed = False, policy: EventPolicy = EventPolicy.BLOCK, queue_size: int = QUEUE_SIZE):
         self.app = QApplication(sys.argv)
         self.protocols: dict[str, type[AbstractProtocol]] = {}
         self.protocol_name: str = ""
@@ -145,7 +149,12 @@ class ProtocolVisualizer(ProtocolSide):
         self.is_protocols_being_set = Event()
 
         self.running_protocol: Process | None = None
-        self.queue: Queue
+        self.queue: Queue | TraceQueue
+        self.queue_size = queue_size
+        # what the running protocol does with its steps while the gui can't keep up
+        self.policy = policy
+        # the steps of the batches taken from the queue which haven't been handled yet
+        self.pending_steps: deque[tuple[Step, tuple]] = deque()
 
         self.one_step_timer: QTimer | None = None
         self.running_timer: QTimer | None = None
@@ -157,6 +166,10 @@ class ProtocolVisualizer(ProtocolSide):
 
         self.distributed_setup: tuple[dict[str, str], str] | None = None
 
+        # the trace file and run which are replayed instead of running a protocol
+        self.trace: TraceReader | None = None
+        self.trace_run = 0
+
     def set_status(self, status: State):
         string = status.name.replace("_", " ").capitalize()
         self.gui.set_status(string)
@@ -169,7 +182,38 @@ class ProtocolVisualizer(ProtocolSide):
 
         self.gui.update_party_names([])
 
-        self.gui.list_widget.clear()
+        self.gui.clear_steps()
+
+    def setup_replay(self):
+        if self.trace is None:
+            return
+
+        self.protocol_name, self.party_names = self.trace.runs()[self.trace_run].args
+        self.gui.set_protocol_name(f"{self.protocol_name} (replay)")
+        self.parties = {party: ProtocolParty(party) for party in self.party_names}
+        self.gui.update_party_names(self.party_names)
+        self.subroutine_stack = []
+        self.gui.clear_steps()
+
+    def replay_trace(self, path: str, run: int = 0):
+        """Shows a run recorded by a TraceRecorder, One step and Run go through its steps like through a running protocol.
+
+        Args:
+            path (str): The path of the trace file.
+            run (int): The index of the run in the trace file.
+        """
+        trace = TraceReader(path)
+        runs = trace.runs()
+        if not -len(runs) <= run < len(runs):
+            trace.close()
+            raise IndexError(f"The trace file '{path}' has {len(runs)} runs")
+
+        if self.trace is not None:
+            self.trace.close()
+        self.trace = trace
+        self.trace_run = run
+        self.protocol = None
+        self.reset()
 
     def setup_input(self, distributed_name: str | None = None):
         if self.protocol is None:
@@ -205,14 +249,15 @@ class ProtocolVisualizer(ProtocolSide):
             self.add_input(i, [int for _ in i])
 
     @staticmethod
-    def run_protocol(protocol: AbstractProtocol, queue: Queue, distributed_setup: tuple[dict[str, str], str] | None = None):
+    def run_protocol(protocol: AbstractProtocol, queue: Queue, policy: EventPolicy, distributed_setup: tuple[dict[str, str], str] | None = None):
         """Starts a protocol and adds the visualizer. Is supposed to be run in a separate process.
 
         Args:
             protocol (AbstractProtocol): The protocol to run
             queue (Queue): The queue to send the steps to
+            policy (EventPolicy): What the protocol does with its steps while the queue is full
         """
-        protocol.set_protocol_visualiser(ProtocolSide(queue))
+        protocol.set_protocol_visualiser(ProtocolSide(queue, policy))
 
         def signal_handler(signal, frame):
             protocol.terminate_protocol()
@@ -226,6 +271,11 @@ class ProtocolVisualizer(ProtocolSide):
         protocol.run()
 
     def start_protocol(self):
+        if self.trace is not None:
+            self.queue = TraceQueue(self.trace, self.trace_run)
+            self.pending_steps.clear()
+            return
+
         if self.protocol is None:
             return
 
@@ -248,10 +298,11 @@ class ProtocolVisualizer(ProtocolSide):
 
         self.protocol.set_input(input_dict)
 
-        self.queue = Queue(QUEUE_SIZE)
+        self.queue = Queue(self.queue_size)
+        self.pending_steps.clear()
 
         self.running_protocol = Process(
-            target=self.run_protocol, args=(self.protocol, self.queue, self.distributed_setup)
+            target=self.run_protocol, args=(self.protocol, self.queue, self.policy, self.distributed_setup)
         )
         self.running_protocol.start()
 
@@ -261,17 +312,28 @@ class ProtocolVisualizer(ProtocolSide):
         sys.exit(self.app.exec_())
 
     def check_queue(self):
+        # a running protocol handles all the steps which have arrived, as long as it takes less than QUEUE_TIME_BUDGET
+        # milliseconds such that the gui stays responsive
+        deadline = time.perf_counter() + QUEUE_TIME_BUDGET / 1000
         try:
-            step = self.queue.get(block=False)
-            self.handle_step(step)
-
-            if self.one_step_timer and not self.subroutine_stack:
-                self.one_step_timer.stop()
-                self.one_step_timer = None
-                self.set_status(State.PAUSED)
-                self.gui.set_paused()
-        except Exception:
+            while True:
+                if not self.pending_steps:
+                    self.pending_steps.extend(self.queue.get(block=False))
+                self.handle_step(self.pending_steps.popleft())
+
+                if self.one_step_timer:
+                    if not self.subroutine_stack:
+                        self.one_step_timer.stop()
+                        self.one_step_timer = None
+                        self.set_status(State.PAUSED)
+                        self.gui.set_paused()
+                    break
+                if self.state != State.RUNNING or time.perf_counter() >= deadline:
+                    break
+        except Empty:
             pass
+        except Exception as e:
+            print(e)
 
     def one_step(self):
         if self.state == State.NOT_STARTED:
@@ -327,8 +389,13 @@ class ProtocolVisualizer(ProtocolSide):
             self.running_timer.stop()
             self.running_timer = None
 
+        self.pending_steps.clear()
+
         if not self.distributed_setup:
             self.gui.set_paused()
+        if self.trace is not None:
+            self.setup_replay()
+            return
         self.setup_protocol()
         self.setup_input()
 
@@ -493,6 +560,10 @@ class ProtocolVisualizer(ProtocolSide):
         self.reset()
 
     def choose_protocol(self, protocol_class: type["AbstractProtocol"]):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+
         params = self.get_function_params(protocol_class.__init__)
         del params["self"]
 
@@ -529,6 +600,9 @@ class ProtocolVisualizer(ProtocolSide):
         if self.running_protocol:
             self.running_protocol.terminate()
 
+        if self.trace is not None:
+            self.trace.close()
+
         for func in self.atexit:
             func()
 
@@ -537,8 +611,8 @@ class ProtocolVisualizer(ProtocolSide):
 
 
 class DistributedVisualizer(ProtocolVisualizer):
-    def __init__(self):
-        super().__init__(True)
+    def __init__(self, policy: EventPolicy = EventPolicy.BLOCK, queue_size: int = QUEUE_SIZE):
+        super().__init__(True, policy, queue_size)
 
         self.gui = ui.ParticipantWindow("", [], self.on_ready, self.on_close)
 
@@ -1,6 +1,13 @@
-from .AbstractProtocol import AbstractProtocol, local
+from .AbstractProtocol import AbstractProtocol, BroadcastStrategy, local
 from .ProtocolParty import TrackedStatistics, ProtocolParty
+from .ProtocolPlan import ProtocolPlan
+from .Serializer import Serializer, register_type
+from .Compression import CompressionAlgorithm, CompressionSettings
+from .TLS import TLSSettings
+from .Transport import TransportConfig
+from .TraceFile import TraceRecorder, TraceReader
+from . import Arithmetic
 from .exceptions import *
 
 
-__all__ = ['local', 'AbstractProtocol', 'AbstractProtocolVisualiser', 'TrackedStatistics', 'ProtocolParty']
\ No newline at end of file
+__all__ = ['local', 'AbstractProtocol', 'BroadcastStrategy', 'AbstractProtocolVisualiser', 'TrackedStatistics', 'ProtocolParty', 'ProtocolPlan', 'Serializer', 'register_type', 'CompressionAlgorithm', 'CompressionSettings', 'TLSSettings', 'TransportConfig', 'TraceRecorder', 'TraceReader', 'Arithmetic']
\ No newline at end of file
@@ -1,7 +1,13 @@
 TIMER_INTERVAL = 10
+# the number of milliseconds of every timer tick the visualiser spends on handling steps
+QUEUE_TIME_BUDGET = 8
 
 
 QUEUE_SIZE = 10
+# the number of steps a protocol keeps while the queue of the visualiser is full
+MAX_BUFFERED_STEPS = 1000
+# the maximum length of the values of variables shown by the visualiser
+MAX_VALUE_LENGTH = 100
 
 
 class NoDefault:
@@ -13,4 +19,4 @@ MCAST_GROUP = "224.1.1.1"
 MCAST_PORT = 5007
 BUFFER_SIZE = 1024
 
-DISCOVERY_INTERVAL = 5
\ No newline at end of file
+DISCOVERY_INTERVAL = 5
@@ -28,8 +28,8 @@ class IncorrectComputationResultDimension(SMPCboxError):
         super().__init__(f"The computation '{comp_description}' returns {res}, but is trying to assign {comp_var_len} variable(s)!")
 
 class UnableToConnect(SMPCboxError):
-    def __init__(self, ip: str, port: int):
-        super().__init__(f"Unable to connect to party with listening address {ip}:{port}")
+    def __init__(self, address: str):
+        super().__init__(f"Unable to connect to party with listening address {address}")
 
 class VariableNotReceived(SMPCboxError):
     def __init__(self, sending_party: str, variable_name: str):
@@ -43,6 +43,25 @@ class NonExistentParty(SMPCboxError):
     def __init__(self, protocol_name: str, party: str):
         super().__init__(f"The party '{party}' doesn't exist in the protocol '{protocol_name}'")
 
+class UnserializableValue(SMPCboxError):
+    """
+    The exception thrown when a variable is send which has a type that is not known to the serializer.
+    """
+    def __init__(self, value: Any):
+        super().__init__(f"Unable to serialize a value of type '{type(value).__name__}', use register_type to add support for this type")
+
+class UnknownSerializerTag(SMPCboxError):
+    def __init__(self, tag: str):
+        super().__init__(f"Received a value with unknown type tag '{tag}'")
+
+class CompressionUnavailable(SMPCboxError):
+    def __init__(self, algorithm: str):
+        super().__init__(f"The compression algorithm '{algorithm}' is not available, make sure the package implementing it is installed")
+
 __all__ = ["SMPCboxError", "InvalidProtocolInput", "InvalidVariableName", "NonExistentVariable", 
            "IncorrectComputationResultDimension", "UnableToConnect", "VariableNotReceived",
-           "InvalidLocalVariableAccess", "NonExistentParty"]
\ No newline at end of file
+           "InvalidLocalVariableAccess", "NonExistentParty", "UnserializableValue",
+           "UnknownSerializerTag", "CompressionUnavailable"]
+class InvalidTraceFile(SMPCboxError):
+    def __init__(self, path: str, reason: str):
+        super().__init__(f"'{path}' is not a valid trace file: {reason}")
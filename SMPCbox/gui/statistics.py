@@ -13,7 +13,11 @@ def format_statistics(statistics: TrackedStatistics, name: str) -> str:
     messages_send: {statistics.messages_send}
     bytes_send: {statistics.bytes_send}
     messages_received: {statistics.messages_received}
-    bytes_received: {statistics.bytes_received}"""
+    bytes_received: {statistics.bytes_received}
+    uncompressed_bytes_send: {statistics.uncompressed_bytes_send}
+    compressed_bytes_send: {statistics.compressed_bytes_send}
+    tls_handshake_time: {statistics.tls_handshake_time}
+    tls_crypto_time: {statistics.tls_crypto_time}"""
 
 
 class StatisticsWidget(QWidget):
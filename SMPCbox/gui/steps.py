@@ -0,0 +1,226 @@
+from typing import Any
+from enum import Enum
+import math
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyleOptionViewItem, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QPoint
+from PyQt5.QtGui import QColor, QPainter, QPen
+
+# every step has the same height, so the view can place the rows without asking for the size of every row
+ROW_HEIGHT = 100
+MARGIN = 10
+# the role of the StepRow of an index
+STEP_ROLE = Qt.UserRole  # type: ignore
+
+
+class RowKind(Enum):
+    COMMENT = 1
+    COMPUTATION = 2
+    SEND = 3
+    BROADCAST = 4
+    SUBROUTINE = 5
+
+
+class StepRow:
+    """
+    The texts shown by a row of the step list. texts and results have an entry for every party, except for comments
+    and broadcasts which span the whole row.
+    """
+    def __init__(self, kind: RowKind, texts: list[str], results: list[str] | None = None, subroutine_object: Any = None):
+        self.kind = kind
+        self.texts = texts
+        self.results = results if results is not None else ["" for _ in texts]
+        # the columns of the sending and receiving party of a message
+        self.sender = -1
+        self.receiver = -1
+        self.subroutine_object = subroutine_object
+
+    def __str__(self) -> str:
+        return " | ".join(text for text in self.texts if text)
+
+
+class StepListModel(QAbstractListModel):
+    """
+    The steps of a protocol, with a column for every party. The computations of different parties are shown next to
+    each other in the same row until another step follows.
+    """
+    def __init__(self, num_parties: int = 0):
+        super().__init__()
+        self.rows: list[StepRow] = []
+        self.num_parties = num_parties
+        # the row of the next computation of every party
+        self.party_rows: list[int] = [0] * num_parties
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:  # type: ignore
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        row = self.rows[index.row()]
+        if role == Qt.DisplayRole:  # type: ignore
+            return str(row)
+        if role == STEP_ROLE:
+            return row
+        return None
+
+    def clear(self, num_parties: int | None = None):
+        self.beginResetModel()
+        self.rows = []
+        if num_parties is not None:
+            self.num_parties = num_parties
+        self.party_rows = [0] * self.num_parties
+        self.endResetModel()
+
+    def add_row(self, row: StepRow):
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows))
+        self.rows.append(row)
+        self.endInsertRows()
+        # the computations after this step start in a new row
+        self.party_rows = [len(self.rows)] * self.num_parties
+
+    def add_comment(self, comment: str):
+        self.add_row(StepRow(RowKind.COMMENT, [comment]))
+
+    def add_computation(self, column: int, calculation: str, result: str):
+        row_index = self.party_rows[column]
+        if row_index == len(self.rows):
+            self.beginInsertRows(QModelIndex(), row_index, row_index)
+            self.rows.append(StepRow(RowKind.COMPUTATION, ["" for _ in range(self.num_parties)]))
+            self.endInsertRows()
+
+        row = self.rows[row_index]
+        row.texts[column] = calculation
+        row.results[column] = result
+        self.party_rows[column] += 1
+        self.dataChanged.emit(self.index(row_index), self.index(row_index))
+
+    def add_send(self, sender: int, receiver: int, variables: dict[str, Any]):
+        variables_string = ", ".join(f"{name}: {value}" for name, value in variables.items())
+        texts = ["" for _ in range(self.num_parties)]
+        texts[sender], texts[receiver] = "Send", "Receive"
+        row = StepRow(RowKind.SEND, texts)
+        row.results[sender] = row.results[receiver] = variables_string
+        row.sender, row.receiver = sender, receiver
+        self.add_row(row)
+
+    def add_broadcast(self, party_name: str, variables: list[str]):
+        self.add_row(StepRow(RowKind.BROADCAST, [f"Broadcast from {party_name}"], [", ".join(variables)]))
+
+    def add_subroutine(self, subroutine_name: str, clients: list[str], subroutine_object: object):
+        # the first text is the name of the subroutine, followed by the role of every party
+        self.add_row(StepRow(RowKind.SUBROUTINE, [subroutine_name] + clients, subroutine_object=subroutine_object))
+
+    def end_subroutine(self, output_values: dict[str, dict[str, str]]):
+        if len(self.rows) == 0 or self.rows[-1].kind != RowKind.SUBROUTINE:
+            raise ValueError("End of subroutine called without a subroutine step.")
+
+        row = self.rows[-1]
+        for i, client in enumerate(row.texts[1:]):
+            if client in output_values:
+                row.results[i + 1] = ", ".join(f"{name}: {value}" for name, value in output_values[client].items())
+        self.dataChanged.emit(self.index(len(self.rows) - 1), self.index(len(self.rows) - 1))
+
+
+class StepDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of a StepListModel, only the rows which are visible are painted.
+    """
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        row: StepRow | None = index.data(STEP_ROLE)
+        if row is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)  # type: ignore
+        rect = option.rect.adjusted(MARGIN, MARGIN // 2, -MARGIN, -MARGIN // 2)
+
+        if row.kind == RowKind.COMMENT:
+            self.draw_section(painter, rect, row.texts[0], "", "lightgrey", "grey")
+        elif row.kind == RowKind.BROADCAST:
+            self.draw_section(painter, rect, row.texts[0], row.results[0], "lightyellow", "orange")
+        elif row.kind == RowKind.COMPUTATION:
+            for column, (text, result) in enumerate(zip(row.texts, row.results)):
+                if text:
+                    self.draw_section(painter, self.column_rect(rect, column, len(row.texts)), text, result, "lightblue", "blue")
+        elif row.kind == RowKind.SEND:
+            self.draw_send(painter, rect, row)
+        elif row.kind == RowKind.SUBROUTINE:
+            self.draw_subroutine(painter, rect, row)
+
+        painter.restore()
+
+    @staticmethod
+    def column_rect(rect: QRect, column: int, num_columns: int) -> QRect:
+        width = rect.width() // max(num_columns, 1)
+        return QRect(rect.left() + column * width + MARGIN, rect.top(), width - 2 * MARGIN, rect.height())
+
+    @staticmethod
+    def draw_section(painter: QPainter, rect: QRect, text: str, result: str, background_color: str, border_color: str,
+                     text_color: str = "black"):
+        painter.setPen(QPen(QColor(border_color), 2))
+        painter.setBrush(QColor(background_color))
+        painter.drawRoundedRect(QRectF(rect), 5, 5)
+
+        painter.setPen(QColor(text_color))
+        metrics = painter.fontMetrics()
+        inner = rect.adjusted(MARGIN, 0, -MARGIN, 0)
+        lines = [line for line in (text, result) if line]
+        line_height = metrics.height() + MARGIN // 2
+        top = inner.top() + (inner.height() - line_height * len(lines)) // 2
+        for i, line in enumerate(lines):
+            line_rect = QRect(inner.left(), top + i * line_height, inner.width(), line_height)
+            painter.drawText(line_rect, Qt.AlignCenter, metrics.elidedText(line, Qt.ElideRight, inner.width()))  # type: ignore
+
+    def draw_send(self, painter: QPainter, rect: QRect, row: StepRow):
+        num_columns = len(row.texts)
+        send_rect = self.column_rect(rect, row.sender, num_columns)
+        receive_rect = self.column_rect(rect, row.receiver, num_columns)
+        self.draw_section(painter, send_rect, row.texts[row.sender], row.results[row.sender], "lightgreen", "green")
+        self.draw_section(painter, receive_rect, row.texts[row.receiver], row.results[row.receiver], "lightcoral", "red")
+
+        if row.sender < row.receiver:
+            start, end = QPoint(send_rect.right(), send_rect.center().y()), QPoint(receive_rect.left(), receive_rect.center().y())
+        else:
+            start, end = QPoint(send_rect.left(), send_rect.center().y()), QPoint(receive_rect.right(), receive_rect.center().y())
+
+        painter.setPen(QPen(QColor("black"), 2))
+        painter.drawLine(start, end)
+        angle = math.atan2(end.y() - start.y(), end.x() - start.x())
+        arrow_head_size = 10
+        for side in (math.pi / 6, -math.pi / 6):
+            painter.drawLine(end, end - QPoint(int(arrow_head_size * math.cos(angle + side)), int(arrow_head_size * math.sin(angle + side))))
+
+    def draw_subroutine(self, painter: QPainter, rect: QRect, row: StepRow):
+        painter.setPen(QPen(QColor("#8A2BE2"), 2))
+        painter.setBrush(QColor("#9370DB"))
+        painter.drawRoundedRect(QRectF(rect), 5, 5)
+
+        painter.setPen(QColor("white"))
+        metrics = painter.fontMetrics()
+        name_rect = QRect(rect.left() + MARGIN, rect.top() + MARGIN // 2, rect.width() - 2 * MARGIN, metrics.height())
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter, row.texts[0])  # type: ignore
+
+        clients_rect = rect.adjusted(0, metrics.height() + MARGIN, 0, -MARGIN // 2)
+        clients = row.texts[1:]
+        for column, (client, result) in enumerate(zip(clients, row.results[1:])):
+            if client:
+                self.draw_section(painter, self.column_rect(clients_rect, column, len(clients)), client, result,
+                                  "#7B68EE", "#7B68EE", "white")
+
+
+class StepListView(QListView):
+    """
+    A list of the steps of a protocol, backed by a StepListModel. Since all rows have the same height and are painted
+    by a delegate, the time and memory to show a step don't depend on the number of steps.
+    """
+    def __init__(self, model: StepListModel):
+        super().__init__()
+        self.setModel(model)
+        self.setItemDelegate(StepDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)  # type: ignore
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)  # type: ignore
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
@@ -9,9 +9,10 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QListWidgetItem,
     QComboBox,
-    QHBoxLayout
+    QHBoxLayout,
+    QSplitter,
 )
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QModelIndex
 from PyQt5.QtGui import QCursor
 from typing import Any, Callable
 from SMPCbox.constants import NoDefault
@@ -19,12 +20,8 @@ from SMPCbox.ProtocolParty import TrackedStatistics
 from SMPCbox.Lobby import Peer
 from .statistics import StatisticsWidget
 
-from .comment import CommentWidget
 from .input import InputWidget, Input
-from .calculation import CalculationWidget
-from .send_receive import SendReceiveWidget
-from .broadcast import BroadcastWidget
-from .subroutine import SubroutineWidget
+from .steps import StepListModel, StepListView, STEP_ROLE
 
 
 class StyledButton(QPushButton):
@@ -138,8 +135,17 @@ class MainWindow(QMainWindow):
             self.client_layout.addWidget(label, 0, i)
         self.client_frame.setLayout(self.client_layout)
 
+        # the inputs of the parties, followed by the steps of the protocol and its statistics
         self.list_widget = NoHighlightListWidget()
-        self.list_widget.itemClicked.connect(self.on_item_click)
+        self.list_widget.setFixedHeight(0)
+        self.step_model = StepListModel(len(parties))
+        self.step_view = StepListView(self.step_model)
+        self.step_view.clicked.connect(self.on_step_click)
+        self.statistics_list = NoHighlightListWidget()
+        self.statistics_list.hide()
+        self.step_splitter = QSplitter(Qt.Vertical)  # type: ignore
+        self.step_splitter.addWidget(self.step_view)
+        self.step_splitter.addWidget(self.statistics_list)
 
         self.status_label = QLabel("Status: Not started")
 
@@ -154,6 +160,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.protocol_input_list)
         layout.addWidget(self.client_frame)
         layout.addWidget(self.list_widget)
+        layout.addWidget(self.step_splitter, stretch=1)
         layout.addWidget(self.status_label)
         layout.addWidget(self.one_step_button)
         layout.addWidget(self.run_button)
@@ -165,13 +172,12 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(container)
 
         self.num_parties = len(parties)
+        self.party_names = list(parties)
 
         self.one_step_button.clicked.connect(one_step_callback)
         self.run_button.clicked.connect(run_callback)
         self.reset_button.clicked.connect(reset_callback)
 
-        self.party_indexes = {party: 0 for party in parties}
-
     def closeEvent(self, a0):
         super().closeEvent(a0)
         self.on_close()
@@ -224,7 +230,15 @@ class MainWindow(QMainWindow):
             self.client_layout.addWidget(label, 0, i)
 
         self.num_parties = len(parties)
-        self.party_indexes = {party: 0 for party in parties}
+        self.party_names = list(parties)
+        self.step_model.clear(self.num_parties)
+
+    def clear_steps(self):
+        self.list_widget.clear()
+        self.list_widget.setFixedHeight(0)
+        self.step_model.clear()
+        self.statistics_list.clear()
+        self.statistics_list.hide()
 
     def get_starting_values(self, kwargs: dict[str, Any], callback: Callable):
         input_widgets: list[Input] = []
@@ -263,20 +277,13 @@ class MainWindow(QMainWindow):
 
         on_change(False)
 
-    def on_item_click(self, item: QListWidgetItem):
-        widget = self.list_widget.itemWidget(item)
-        if isinstance(widget, SubroutineWidget):
-            widget.on_click()
+    def on_step_click(self, index: QModelIndex):
+        row = index.data(STEP_ROLE)
+        if row is not None and row.subroutine_object is not None:
+            row.subroutine_object.show()
 
-    def add_comment(self, comment: str) -> CommentWidget:
-        widget = CommentWidget(comment)
-        list_item = QListWidgetItem(self.list_widget)
-        list_item.setSizeHint(widget.sizeHint() + QSize(0, 20))
-        self.list_widget.setItemWidget(list_item, widget)
-
-        self.update_all_indexes()
-
-        return widget
+    def add_comment(self, comment: str):
+        self.step_model.add_comment(comment)
 
     def add_input_step(
         self, prompts: list[str], defaults: list[Any] | None = None, mutable=True
@@ -286,31 +293,14 @@ class MainWindow(QMainWindow):
         list_item.setSizeHint(widget.sizeHint() + QSize(0, 20))
         self.list_widget.setItemWidget(list_item, widget)
 
-        self.update_all_indexes()
+        # the inputs are shown in full, the steps below them have their own scroll bar
+        height = sum(self.list_widget.item(i).sizeHint().height() for i in range(self.list_widget.count()))
+        self.list_widget.setFixedHeight(min(height + 4, 300))
 
         return widget
 
     def add_computation_step(self, party_name: str, calculation: str, result: str):
-        index = self.party_indexes[party_name]
-
-        item = self.list_widget.item(index)
-        widget = self.list_widget.itemWidget(item)
-
-        if widget is None:
-            calculations = ["" for _ in range(self.num_parties)]
-            calculations[self.get_party_index(party_name)] = calculation
-            widget = CalculationWidget(calculations)
-            list_item = QListWidgetItem(self.list_widget)
-            list_item.setSizeHint(widget.sizeHint() + QSize(0, 20))
-            self.list_widget.setItemWidget(list_item, widget)
-        else:
-            widget.update_calculation(self.get_party_index(party_name), calculation)
-
-        widget.update_result(self.get_party_index(party_name), result)
-
-        self.party_indexes[party_name] += 1
-
-        return widget
+        self.step_model.add_computation(self.get_party_index(party_name), calculation, result)
 
     def add_send_step(
         self,
@@ -318,63 +308,18 @@ class MainWindow(QMainWindow):
         receiver: str,
         variables: dict[str, Any],
     ):
-        sender_pos = self.get_party_index(sender)
-        receiver_pos = self.get_party_index(receiver)
-
-        widget = SendReceiveWidget(
-            self.num_parties, sender_pos, receiver_pos, variables
-        )
-        list_item = QListWidgetItem(self.list_widget)
-        list_item.setSizeHint(widget.sizeHint() + QSize(0, 20))
-        self.list_widget.setItemWidget(list_item, widget)
-
-        self.update_all_indexes()
-
-        return widget
+        self.step_model.add_send(self.get_party_index(sender), self.get_party_index(receiver), variables)
 
     def add_broadcast_step(self, party_name: str, variables: list[str]):
-        widget = BroadcastWidget(party_name, variables)
-        list_item = QListWidgetItem(self.list_widget)
-        list_item.setSizeHint(widget.sizeHint() + QSize(0, 20))
-        self.list_widget.setItemWidget(list_item, widget)
-
-        self.update_all_indexes()
-
-        return widget
+        self.step_model.add_broadcast(party_name, variables)
 
     def add_subroutine_step(
         self, subroutine_name: str, clients: list[str], subroutine_object: object
     ):
-        widget = SubroutineWidget(subroutine_name, clients, subroutine_object)
-        list_item = QListWidgetItem(self.list_widget)
-        list_item.setSizeHint(widget.sizeHint() + QSize(0, 20))
-        self.list_widget.setItemWidget(list_item, widget)
-
-        self.update_all_indexes()
-
-        return widget
+        self.step_model.add_subroutine(subroutine_name, clients, subroutine_object)
 
     def add_end_subroutine_step(self, output_values: dict[str, dict[str, str]]):
-        indexes = list(self.party_indexes.values())
-        index = indexes[0]
-
-        # Check if all indexes are the same.
-        if all(i == index for i in indexes):
-            item = self.list_widget.item(index - 1)
-            widget = self.list_widget.itemWidget(item)
-            if widget is None:
-                raise ValueError("End of subroutine called without a widget.")
-
-            if not isinstance(widget, SubroutineWidget):
-                raise ValueError(
-                    "End of subroutine called without a subroutine widget."
-                )
-
-            widget.display_result(output_values)
-        else:
-            raise ValueError(
-                "The indexes of the parties are not the same with a call to end_subroutine."
-            )
+        self.step_model.end_subroutine(output_values)
 
     def add_statistics(
         self,
@@ -382,19 +327,17 @@ class MainWindow(QMainWindow):
         total_statistics: TrackedStatistics,
     ):
         widget = StatisticsWidget(party_statistics, total_statistics)
-        list_item = QListWidgetItem(self.list_widget)
+        self.statistics_list.clear()
+        list_item = QListWidgetItem(self.statistics_list)
         list_item.setSizeHint(widget.sizeHint() + QSize(0, 20))
-        self.list_widget.setItemWidget(list_item, widget)
-
-        self.update_all_indexes()
+        self.statistics_list.setItemWidget(list_item, widget)
+        self.statistics_list.show()
+        # the statistics take a third of the space below the inputs, the splitter can move
+        height = self.step_splitter.height()
+        self.step_splitter.setSizes([height - height // 3, height // 3])
 
     def get_party_index(self, party_name: str):
-        return list(self.party_indexes.keys()).index(party_name)
-
-    def update_all_indexes(self):
-        highest_index = max(self.party_indexes.values())
-        for party in self.party_indexes:
-            self.party_indexes[party] = highest_index + 1
+        return self.party_names.index(party_name)
 
 
 class PartyParticipantMapper(QWidget):
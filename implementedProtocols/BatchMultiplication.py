@@ -0,0 +1,62 @@
+# temporary for now to allow the import of the SMPCbox from the implementedProtocols
+# folder. Should remove once it is pip installable
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol
+from MultiplicationProtocol import SecretShareMultiplication
+from OTExtension import OTExtension
+import random
+import time
+
+class BatchSecretShareMultiplication(SecretShareMultiplication):
+    """
+    Computes the products a_j * b_j of two vectors, Alice inputs the vector a and Bob the vector b.
+    The outputs x and y are vectors with (x_j + y_j) mod 2^l = (a_j * b_j) mod 2^l.
+    The l transfers of every product are all done in a single run of the OT protocol, so the number of rounds
+    and messages doesn't depend on the length of the vectors. By default the transfers use OT extension, such that
+    only the 128 base OTs need public key operations.
+    """
+    protocol_name = "BatchSecretShareMultiplication"
+
+    def __init__(self, l: int = 32, ot_class: type[AbstractProtocol] = OTExtension):
+        super().__init__(l, ot_class)
+
+    def __call__(self):
+        bob = self.parties["Bob"]
+        alice = self.parties["Alice"]
+        modulus = 2**self.l
+
+        self.compute(alice, ["r", "m1_input"], lambda: self.batch_masked_multiples(alice["a"]), "r_ij = rand(), a_j*2^i + r_ij")
+        self.compute(bob, "b_bits", lambda: [(b >> i) & 1 for b in bob["b"] for i in range(self.l)], "Determine the bits b_ij")
+
+        ot_inputs = {"Sender": {"m0": "r", "m1": "m1_input"}, "Receiver": {"b": "b_bits"}}
+        ot_output = {"Receiver": {"mb": "m_b"}}
+        self.run_subroutine_protocol(self.ot_class(), {"Sender": alice, "Receiver": bob}, ot_inputs, ot_output)
+
+        self.compute(alice, "x", lambda: [(-sum(r_j)) % modulus for r_j in self.per_product(alice["r"])], "minus Sum of all r_ij for every j")
+        self.compute(bob, "y", lambda: [sum(m_j) % modulus for m_j in self.per_product(bob["m_b"])], "Sum of all m_ij for every j")
+
+    def batch_masked_multiples(self, a: list[int]) -> tuple[list[int], list[int]]:
+        r, m1 = [], []
+        for a_j in a:
+            r_j, m1_j = self.masked_multiples(a_j)
+            r += r_j
+            m1 += m1_j
+        return r, m1
+
+    def per_product(self, values: list[int]) -> list[list[int]]:
+        # the transfers of product j are the l values starting at j * l
+        return [values[j:j + self.l] for j in range(0, len(values), self.l)]
+
+if __name__ == "__main__":
+    n = 100
+    a = [random.randint(-1000, 1000) for _ in range(n)]
+    b = [random.randint(-1000, 1000) for _ in range(n)]
+    p = BatchSecretShareMultiplication()
+    p.set_input({"Alice": {"a": a}, "Bob": {"b": b}})
+    s = time.time()
+    p()
+    print("execution time:", time.time() - s)
+    out = p.get_output()
+    print(all((x + y) % 2**32 == a_j * b_j % 2**32 for x, y, a_j, b_j in zip(out["Alice"]["x"], out["Bob"]["y"], a, b)))
@@ -1,4 +1,4 @@
-from SMPCbox import AbstractProtocol
+from SMPCbox import AbstractProtocol, register_type
 
 class CustomList(list):
     def __init__(self, inp: str):
@@ -9,6 +9,9 @@ class CustomList(list):
         super().__init__(list(map(int, items)))
 
 
+# a CustomList is send as a normal list and converted back on arrival
+register_type(CustomList, "CustomList", list, lambda items: CustomList(str(items)))
+
 class List(AbstractProtocol):
     def __init__(self, list: CustomList):
         self.list = list
@@ -8,19 +8,19 @@ sys.path.append('../')
 import time
 from SMPCbox import AbstractProtocol
 from OT import OT
-import os
-
-def rand_int():
-    return int.from_bytes(os.urandom(2), byteorder='big')
+import secrets
 
 class SecretShareMultiplication(AbstractProtocol):
     protocol_name = "SecretShareMultiplication"
 
-    def __init__(self, l: int = 32):
+    def __init__(self, l: int = 32, ot_class: type[AbstractProtocol] = OT):
         """
         The opperations are done module 2^l
+        ot_class: the oblivious transfer protocol used, either the RSA based OT or SimplestOT.
+                  All l transfers are done in a single run of the OT protocol.
         """
         self.l = l
+        self.ot_class = ot_class
         super().__init__()
 
     def input_variables(self):
@@ -33,26 +33,25 @@ class SecretShareMultiplication(AbstractProtocol):
         return {"Alice": ["x"], "Bob": ["y"]}
 
     def __call__(self):
-        r_vars = ["r" + str(num) for num in range(self.l)]
-        self.compute(self.parties["Alice"], r_vars, lambda: [rand_int() % pow(2, self.l) for _ in range(self.l)], "rand()")
-
         bob = self.parties["Bob"]
         alice = self.parties["Alice"]
+        modulus = 2**self.l
 
-        for i in range(self.l):
-            # calculate a*2^i + r_i:
-            self.compute(alice, ["m1_input"], lambda: (alice["a"] * (2**i) + alice["r" + str(i)]) % pow(2, self.l), "a*2^i + r_i")
-            # get ith bit of Bob's b variable
-            self.compute(bob, "b_i", lambda: (bob["b"] >> i) & 1, "Determine b_i")
+        # the r_i, the a*2^i + r_i and the bits of b are stored as one list each, instead of one variable per bit
+        self.compute(alice, ["r", "m1_input"], lambda: self.masked_multiples(alice["a"]), "r_i = rand(), a*2^i + r_i")
+        self.compute(bob, "b_bits", lambda: [(bob["b"] >> i) & 1 for i in range(self.l)], "Determine the bits b_i")
 
-            ot_inputs = {"Sender": {"m0": "r"+str(i), "m1": "m1_input"}, "Receiver": {"b": "b_i"}}
-            ot_output = {"Receiver": {"mb": f"m{i}_b{i}"}}
-            self.run_subroutine_protocol(OT(), {"Sender": self.parties["Alice"], "Receiver": self.parties["Bob"]}, ot_inputs, ot_output)
+        ot_inputs = {"Sender": {"m0": "r", "m1": "m1_input"}, "Receiver": {"b": "b_bits"}}
+        ot_output = {"Receiver": {"mb": "m_b"}}
+        self.run_subroutine_protocol(self.ot_class(), {"Sender": alice, "Receiver": bob}, ot_inputs, ot_output)
 
-        self.compute(alice, "x", lambda: (-sum(alice[var] for var in r_vars)) % pow(2, self.l), "minus Sum of all r_i")
+        self.compute(alice, "x", lambda: (-sum(alice["r"])) % modulus, "minus Sum of all r_i")
+        self.compute(bob, "y", lambda: sum(bob["m_b"]) % modulus, "Sum of all mi_bi")
 
-        exchanged_messages = [f"m{i}_b{i}" for i in range(self.l)]
-        self.compute(bob, "y", lambda: (sum([bob[var] for var in exchanged_messages])) % pow(2, self.l), "Sum of all mi_bi")
+    def masked_multiples(self, a: int) -> tuple[list[int], list[int]]:
+        modulus = 2**self.l
+        r = [secrets.randbelow(modulus) for _ in range(self.l)]
+        return r, [(a * 2**i + r_i) % modulus for i, r_i in enumerate(r)]
 
 
 if __name__ == "__main__":
@@ -7,9 +7,31 @@ from SMPCbox import AbstractProtocol
 
 import time
 from SMPCbox import AbstractProtocol, ProtocolParty
+from SMPCbox.Arithmetic import powmod, crt_key, crt_powmod
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import rsa
 import os
+from typing import Any, Callable
+
+
+def elementwise(function: Callable, *values: Any, outputs: int = 1) -> Any:
+    """
+    Applies the function to the values of a single transfer, or to the elements of the values when some of the values are lists
+    of transfers. Values which aren't lists are used for every transfer. A function with several outputs returns one list per output,
+    so the results can be stored in separate variables.
+    """
+    lists = [value for value in values if isinstance(value, list)]
+    if not lists:
+        return function(*values)
+
+    columns = [value if isinstance(value, list) else [value] * len(lists[0]) for value in values]
+    results = [function(*args) for args in zip(*columns)]
+    if outputs == 1:
+        return results
+    return tuple([result[i] for result in results] for i in range(outputs))
+
+def random_value(_: Any = None) -> int:
+    return int.from_bytes(os.urandom(16), byteorder='big')
 
 
 def getRSAvars():
@@ -19,16 +41,21 @@ def getRSAvars():
         key_size=2048,
         backend=default_backend()
     )
-    d = private_key.private_numbers().d
+    private_numbers = private_key.private_numbers()
     public_key = private_key.public_key()
 
     # Extracting e and N from the public key
     e = public_key.public_numbers().e
     N = public_key.public_numbers().n
-    return N, d, e
+    # the sender only decrypts, which is done with the CRT form of the private key
+    return N, crt_key(private_numbers.p, private_numbers.q, private_numbers.d), e
 
 
 class OT(AbstractProtocol):
+    """
+    RSA based 1-out-of-2 oblivious transfer. The inputs can also be lists, in which case one transfer is done for every element
+    with a single RSA key and the same number of messages as a single transfer.
+    """
     protocol_name="ObliviousTransfer"
 
     def __init__(self):
@@ -47,26 +74,26 @@ class OT(AbstractProtocol):
         p_send = self.parties["Sender"]
         p_recv = self.parties["Receiver"]
 
-        self.compute(p_send, ["N", "d", "e"], getRSAvars, "RSA()")
+        self.compute(p_send, ["N", "key", "e"], getRSAvars, "RSA()")
         self.send_variables(p_send, p_recv, ["N", "e"])
-        self.compute(p_send, ["x0", "x1"], lambda: (int.from_bytes(os.urandom(16), byteorder='big'), int.from_bytes(os.urandom(16), byteorder='big')), "rand()")
+        self.compute(p_send, ["x0", "x1"], lambda: (elementwise(random_value, p_send["m0"]), elementwise(random_value, p_send["m0"])), "rand()")
         self.send_variables(p_send, p_recv, ["x0", "x1"])
 
         # Calculate v
-        self.compute(p_recv, "k", lambda: (int.from_bytes(os.urandom(16), byteorder='big')), "rand()")
-        self.compute(p_recv, "x_b", lambda: p_recv["x0"] if (p_recv["b"] == 0) else p_recv["x1"], "choose x_b")
-        self.compute(p_recv, "v", lambda: ((p_recv["x_b"] + pow(p_recv["k"], p_recv["e"])) % p_recv["N"]), "(x_b + k^e) mod N")
+        self.compute(p_recv, "k", lambda: elementwise(random_value, p_recv["b"]), "rand()")
+        self.compute(p_recv, "x_b", lambda: elementwise(lambda b, x0, x1: x0 if b == 0 else x1, p_recv["b"], p_recv["x0"], p_recv["x1"]), "choose x_b")
+        self.compute(p_recv, "v", lambda: elementwise(lambda x_b, k: (x_b + powmod(k, p_recv["e"], p_recv["N"])) % p_recv["N"], p_recv["x_b"], p_recv["k"]), "(x_b + k^e) mod N")
         self.send_variables(p_recv, p_send, "v")
 
         # calculate the encrypted m0 and m1
-        self.compute(p_send, "k0", lambda: pow(p_send["v"] - p_send["x0"], p_send["d"], p_send["N"]), "(v-x0)^d mod N")
-        self.compute(p_send, "k1", lambda: pow(p_send["v"] - p_send["x1"], p_send["d"], p_send["N"]), "(v-x1)^d mod N")
-        self.compute(p_send, "m0_enc", lambda: ((p_send["m0"] + p_send["k0"]) % p_send["N"]), "(m0 + k0) mod N")
-        self.compute(p_send, "m1_enc", lambda: ((p_send["m1"] + p_send["k1"]) % p_send["N"]), "(m1 + k1) mod N")
+        self.compute(p_send, "k0", lambda: elementwise(lambda v, x0: crt_powmod(v - x0, p_send["key"]), p_send["v"], p_send["x0"]), "(v-x0)^d mod N")
+        self.compute(p_send, "k1", lambda: elementwise(lambda v, x1: crt_powmod(v - x1, p_send["key"]), p_send["v"], p_send["x1"]), "(v-x1)^d mod N")
+        self.compute(p_send, "m0_enc", lambda: elementwise(lambda m, k: (m + k) % p_send["N"], p_send["m0"], p_send["k0"]), "(m0 + k0) mod N")
+        self.compute(p_send, "m1_enc", lambda: elementwise(lambda m, k: (m + k) % p_send["N"], p_send["m1"], p_send["k1"]), "(m1 + k1) mod N")
         self.send_variables(p_send, p_recv, ["m0_enc", "m1_enc"])
 
-        self.compute(p_recv, "mb_enc", lambda: (p_recv["m0_enc"] if (p_recv["b"] == 0) else p_recv["m1_enc"]), "choose m_b")
-        self.compute(p_recv, "mb", lambda: ((p_recv["mb_enc"] - p_recv["k"]) % p_recv["N"]), "(m'_b - k) mod N")
+        self.compute(p_recv, "mb_enc", lambda: elementwise(lambda b, e0, e1: e0 if b == 0 else e1, p_recv["b"], p_recv["m0_enc"], p_recv["m1_enc"]), "choose m_b")
+        self.compute(p_recv, "mb", lambda: elementwise(lambda e, k: (e - k) % p_recv["N"], p_recv["mb_enc"], p_recv["k"]), "(m'_b - k) mod N")
 
 
 if __name__ == "__main__":
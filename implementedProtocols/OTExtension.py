@@ -0,0 +1,121 @@
+# temporary for now to allow the import of the SMPCbox from the implementedProtocols
+# folder. Should remove once it is pip installable
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol
+from SimplestOT import SimplestOT
+from typing import Any
+import numpy
+import hashlib
+import secrets
+import time
+
+# the security parameter, the number of base OTs
+KAPPA = 128
+
+def expand(seed: int, num_bits: int) -> numpy.ndarray:
+    """
+    Expands a seed of a base OT into num_bits pseudo random bits, packed into bytes.
+    """
+    return numpy.frombuffer(hashlib.shake_256(seed.to_bytes(KAPPA // 8, "big")).digest((num_bits + 7) // 8), dtype=numpy.uint8)
+
+def pack_bits(bits: list[int]) -> numpy.ndarray:
+    return numpy.packbits(numpy.array(bits, dtype=numpy.uint8) != 0)
+
+def transpose(columns: numpy.ndarray, num_bits: int) -> numpy.ndarray:
+    """
+    Transposes the KAPPA packed columns of num_bits bits into num_bits rows of KAPPA bits.
+    """
+    return numpy.packbits(numpy.unpackbits(columns, axis=1)[:, :num_bits].T, axis=1)
+
+def row_key(i: int, row: numpy.ndarray, modulus: int) -> int:
+    size = (modulus.bit_length() + 7) // 8 + 16
+    return int.from_bytes(hashlib.shake_256(i.to_bytes(8, "big") + row.tobytes()).digest(size), "big") % modulus
+
+def as_batch(value: Any) -> list:
+    return value if isinstance(value, list) else [value]
+
+class OTExtension(AbstractProtocol):
+    """
+    The OT extension of Ishai, Kilian, Nissim and Petrank (CRYPTO 2003), secure against semi-honest parties.
+    KAPPA base OTs are done with SimplestOT in the opposite direction, after which any number of transfers only costs
+    a few hashes and XORs. The receiver sends the KAPPA columns u_j = G(k_j^0) xor G(k_j^1) xor r of its choices r,
+    the sender obtains the rows q_i = t_i xor (r_i * s) and encrypts m0_i with H(i, q_i) and m1_i with H(i, q_i xor s).
+    Has the same inputs and outputs as OT and SimplestOT, lists of messages and choices are separate transfers.
+    """
+    protocol_name = "OTExtension"
+
+    def __init__(self, modulus: int = 2**256):
+        self.modulus = modulus
+        super().__init__()
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Sender": ["m0", "m1"], "Receiver": ["b"]}
+
+    def party_names(self) -> list[str]:
+        return ["Sender", "Receiver"]
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Receiver": ["mb"]}
+
+    def __call__(self):
+        p_send = self.parties["Sender"]
+        p_recv = self.parties["Receiver"]
+
+        # base OTs, the receiver of the extension sends the seeds and the sender chooses with its secret s
+        self.compute(p_send, "s", lambda: [secrets.randbits(1) for _ in range(KAPPA)], "s = rand()")
+        self.compute(p_recv, ["k0", "k1"], lambda: ([secrets.randbits(KAPPA) for _ in range(KAPPA)], [secrets.randbits(KAPPA) for _ in range(KAPPA)]),
+                     "k_j^0, k_j^1 = rand()")
+        self.run_subroutine_protocol(SimplestOT(2**KAPPA), {"Sender": p_recv, "Receiver": p_send},
+                                     {"Sender": {"m0": "k0", "m1": "k1"}, "Receiver": {"b": "s"}}, {"Receiver": {"mb": "ks"}})
+
+        self.compute(p_recv, ["t", "u"], lambda: self.receiver_columns(p_recv), "t_j = G(k_j^0), u_j = t_j xor G(k_j^1) xor b")
+        self.send_variables(p_recv, p_send, "u")
+
+        self.compute(p_send, ["m0_enc", "m1_enc"], lambda: self.encrypt(p_send), "(m0_i + H(i, q_i), m1_i + H(i, q_i xor s)) mod M")
+        self.send_variables(p_send, p_recv, ["m0_enc", "m1_enc"])
+
+        self.compute(p_recv, "mb", lambda: self.decrypt(p_recv), "(m'_bi - H(i, t_i)) mod M")
+
+    def receiver_columns(self, p_recv) -> tuple[numpy.ndarray, numpy.ndarray]:
+        choices = as_batch(p_recv["b"])
+        num_bits = len(choices)
+        r = pack_bits(choices)
+        t = numpy.stack([expand(k, num_bits) for k in p_recv["k0"]])
+        u = t ^ numpy.stack([expand(k, num_bits) for k in p_recv["k1"]]) ^ r
+        return t, u
+
+    def encrypt(self, p_send) -> tuple[Any, Any]:
+        m0, m1 = as_batch(p_send["m0"]), as_batch(p_send["m1"])
+        num_bits = len(m0)
+        s = p_send["s"]
+        # q_j = G(k_j^s_j) xor s_j * u_j = t_j xor s_j * r
+        columns = numpy.stack([expand(k, num_bits) for k in p_send["ks"]])
+        columns ^= p_send["u"] * numpy.array(s, dtype=numpy.uint8)[:, None]
+        q = transpose(columns, num_bits)
+        s_row = pack_bits(s)
+        m0_enc = [(m + row_key(i, q[i], self.modulus)) % self.modulus for i, m in enumerate(m0)]
+        m1_enc = [(m + row_key(i, q[i] ^ s_row, self.modulus)) % self.modulus for i, m in enumerate(m1)]
+        if not isinstance(p_send["m0"], list):
+            return m0_enc[0], m1_enc[0]
+        return m0_enc, m1_enc
+
+    def decrypt(self, p_recv) -> Any:
+        choices = as_batch(p_recv["b"])
+        t = transpose(p_recv["t"], len(choices))
+        m0_enc, m1_enc = as_batch(p_recv["m0_enc"]), as_batch(p_recv["m1_enc"])
+        mb = [((m0_enc[i] if b == 0 else m1_enc[i]) - row_key(i, t[i], self.modulus)) % self.modulus for i, b in enumerate(choices)]
+        return mb if isinstance(p_recv["b"], list) else mb[0]
+
+if __name__ == "__main__":
+    n = 10000
+    m0 = [secrets.randbits(32) for _ in range(n)]
+    m1 = [secrets.randbits(32) for _ in range(n)]
+    b = [secrets.randbits(1) for _ in range(n)]
+    ot_protocol = OTExtension()
+    ot_protocol.set_input({"Sender": {"m0": m0, "m1": m1}, "Receiver": {"b": b}})
+    s = time.time()
+    ot_protocol()
+    print(n, "OTs in", time.time() - s)
+    print(ot_protocol.get_output()["Receiver"]["mb"] == [m1[i] if b[i] else m0[i] for i in range(n)])
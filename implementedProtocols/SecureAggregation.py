@@ -0,0 +1,254 @@
+# temporary for now to allow the import of the SMPCbox from the implementedProtocols
+# folder. Should remove once it is pip installable
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey, X25519PublicKey
+from typing import Any, Iterable
+import hashlib
+import math
+import secrets
+import time
+import random
+
+# The prime field in which the secrets are shared, large enough for X25519 private keys
+FIELD_PRIME = 2**521 - 1
+
+def prg(seed: bytes, length: int, modulus: int) -> list[int]:
+    """
+    Expands a seed into length pseudo random values modulo the modulus, using SHAKE-256 as the generator.
+    Every value is taken from 8 bytes more than the modulus needs, which makes the bias of the reduction negligible.
+    """
+    size = (modulus.bit_length() + 7) // 8 + 8
+    stream = hashlib.shake_256(seed).digest(size * length)
+    return [int.from_bytes(stream[i * size:(i + 1) * size], "little") % modulus for i in range(length)]
+
+def share_secret(secret: int, points: list[int], threshold: int) -> dict[int, int]:
+    """
+    Shamir secret sharing, any threshold of the shares evaluated at the points reconstruct the secret.
+    """
+    coefficients = [secret] + [secrets.randbelow(FIELD_PRIME) for _ in range(threshold - 1)]
+    shares = {}
+    for x in points:
+        y = 0
+        for coefficient in reversed(coefficients):
+            y = (y * x + coefficient) % FIELD_PRIME
+        shares[x] = y
+    return shares
+
+def reconstruct_secret(shares: dict[int, int]) -> int:
+    """
+    Lagrange interpolation of the shares at 0.
+    """
+    secret = 0
+    for x, y in shares.items():
+        numerator, denominator = 1, 1
+        for other in shares:
+            if other != x:
+                numerator = numerator * other % FIELD_PRIME
+                denominator = denominator * (other - x) % FIELD_PRIME
+        secret = (secret + y * numerator * pow(denominator, -1, FIELD_PRIME)) % FIELD_PRIME
+    return secret
+
+def as_result(values: list[Any]) -> Any:
+    # compute stores the result of a computation with a single variable as is
+    return values[0] if len(values) == 1 else tuple(values)
+
+class SecureAggregation(AbstractProtocol):
+    """
+    Dropout resilient secure aggregation in the style of Bonawitz et al. (CCS 2017), with the sparse neighbourhood
+    graph of SecAgg+ (Bell et al., CCS 2020) such that the work of a party grows logarithmically with the number of parties.
+
+    Every client masks its input with a self mask and with a pairwise mask for each of its neighbours, the pairwise masks
+    are derived from X25519 key agreements and cancel out in the sum. The seed of the self mask and the private key are
+    Shamir shared among the neighbours. Once the server knows which clients dropped out before sending their masked input,
+    the surviving clients reveal the shares of the self masks of the survivors and the shares of the private keys of the
+    dropped clients, which lets the server remove the remaining masks. The server only learns the sum of the survivors' inputs.
+
+    num_neighbours: the (even) number of neighbours of each client, by default 2 * ceil(log2(n)) + 2.
+    threshold: the number of shares needed to reconstruct a secret, by default a majority of the neighbours.
+    dropouts: clients which drop out after sharing their keys, used to simulate dropouts.
+    round_timeout: the number of seconds the server waits on the messages of a round before considering the clients dropped.
+    """
+    protocol_name = "SecureAggregation"
+
+    def __init__(self, num_clients: int, vector_length: int = 1, modulus: int = 2**64, num_neighbours: int | None = None,
+                 threshold: int | None = None, dropouts: Iterable[str] = (), round_timeout: float = 10):
+        self.num_clients = num_clients
+        self.vector_length = vector_length
+        self.modulus = modulus
+        if num_neighbours is None:
+            num_neighbours = 2 * math.ceil(math.log2(max(num_clients, 2))) + 2
+        self.num_neighbours = min(num_neighbours + num_neighbours % 2, num_clients - 1)
+        self.threshold = threshold if threshold is not None else self.num_neighbours // 2 + 1
+        self.dropouts = set(dropouts)
+        self.round_timeout = round_timeout
+        super().__init__()
+
+    def party_names(self) -> list[str]:
+        return [f"party_{i}" for i in range(self.num_clients)] + ["server"]
+
+    def client_names(self) -> list[str]:
+        return self.party_names()[:-1]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {name: ["value"] for name in self.client_names()}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"server": ["sum", "survivors"]}
+
+    def communication_topology(self) -> dict[str, list[str]]:
+        names = self.client_names()
+        topology = {name: [names[j] for j in self.neighbours(i)] + ["server"] for i, name in enumerate(names)}
+        topology["server"] = list(names)
+        return topology
+
+    def neighbours(self, i: int) -> list[int]:
+        """
+        The neighbours of client i in a Harary graph, the clients which are at most num_neighbours / 2 positions away in a ring.
+        """
+        n = self.num_clients
+        if self.num_neighbours >= n - 1:
+            return [j for j in range(n) if j != i]
+        half = self.num_neighbours // 2
+        return sorted({(i + d) % n for d in range(-half, half + 1) if d != 0})
+
+    def is_survivor(self, i: int) -> bool:
+        """
+        Whether client i has send its masked input, only the server knows this for the other clients.
+        The process of a client assumes that it survived itself, if it didn't it never receives the dropped neighbours.
+        """
+        name = self.client_names()[i]
+        if name in self.dropouts:
+            return False
+        server = self.parties["server"]
+        if self.is_local(server):
+            return i in server["survivors"]
+        return True
+
+    def __call__(self):
+        clients = [self.parties[name] for name in self.client_names()]
+        server = self.parties["server"]
+
+        # round 1: every client shares its keys with its neighbours and sends its public key to the server
+        for i, client in enumerate(clients):
+            share_names = [f"shares_{i}_{j}" for j in self.neighbours(i)]
+            self.compute(client, ["sk", f"pk_{i}", "b"], generate_keys, "generate a key pair and a self mask seed")
+            self.compute(client, share_names, lambda i = i, client = client: self.share_keys(i, client),
+                         "Shamir share b and sk with the neighbours")
+            for j in self.neighbours(i):
+                self.send_variables(client, clients[j], [f"pk_{i}", f"shares_{i}_{j}"])
+            self.send_variables(client, server, f"pk_{i}")
+
+        # round 2: the clients which haven't dropped out send their masked input
+        for i, client in enumerate(clients):
+            if client.name in self.dropouts:
+                # the client drops out once the shares of its neighbours have arrived, such that their sends don't fail
+                self.compute(client, "neighbour_shares", lambda i = i, client = client: [client[f"shares_{j}_{i}"] for j in self.neighbours(i)],
+                             "wait for the shares of the neighbours")
+                continue
+            self.compute(client, f"masked_{i}", lambda i = i, client = client: self.mask_input(i, client),
+                         "value + PRG(b) + pairwise masks")
+            self.send_variables(client, server, f"masked_{i}")
+
+        self.compute(server, "survivors", lambda: self.collect(server, "masked"), "clients whose masked input arrived")
+
+        # round 3: the server tells every survivor which of its neighbours dropped out, the survivors reveal their shares
+        for i, client in enumerate(clients):
+            if not self.is_survivor(i):
+                continue
+            self.compute(server, f"dropped_{i}", lambda i = i: [j for j in self.neighbours(i) if j not in server["survivors"]],
+                         "dropped neighbours")
+            self.send_variables(server, client, f"dropped_{i}")
+            self.compute(client, f"unmask_{i}", lambda i = i, client = client: self.reveal_shares(i, client),
+                         "shares of b of the surviving neighbours and of sk of the dropped neighbours")
+            self.send_variables(client, server, f"unmask_{i}")
+
+        self.compute(server, "responders", lambda: self.collect(server, "unmask"), "clients whose shares arrived")
+        self.compute(server, "sum", lambda: self.unmask_sum(server), "sum of the masked inputs - remaining masks")
+
+    def share_keys(self, i: int, client) -> Any:
+        neighbours = self.neighbours(i)
+        points = [j + 1 for j in neighbours]
+        sk = int.from_bytes(client["sk"], "little")
+        b_shares = share_secret(client["b"], points, self.threshold)
+        sk_shares = share_secret(sk, points, self.threshold)
+        return as_result([(b_shares[j + 1], sk_shares[j + 1]) for j in neighbours])
+
+    def pairwise_mask(self, sk: bytes, pk: bytes) -> list[int]:
+        shared = X25519PrivateKey.from_private_bytes(sk).exchange(X25519PublicKey.from_public_bytes(pk))
+        return prg(shared, self.vector_length, self.modulus)
+
+    def mask_input(self, i: int, client) -> list[int]:
+        value = client["value"]
+        values = [value] if self.vector_length == 1 and not isinstance(value, (list, tuple)) else list(value)
+        if len(values) != self.vector_length:
+            raise ValueError(f"Expected a vector of length {self.vector_length}, got {len(values)} values")
+
+        masked = [(v + mask) % self.modulus for v, mask in zip(values, prg(client["b"].to_bytes(16, "little"), self.vector_length, self.modulus))]
+        for j in self.neighbours(i):
+            mask = self.pairwise_mask(client["sk"], client[f"pk_{j}"])
+            sign = 1 if i < j else -1
+            masked = [(v + sign * m) % self.modulus for v, m in zip(masked, mask)]
+        return masked
+
+    def collect(self, server, prefix: str) -> list[int]:
+        """
+        Waits on the variables of a round untill the round timeout, the clients whose variable didn't arrive dropped out.
+        """
+        deadline = time.time() + self.round_timeout
+        arrived = []
+        for i, name in enumerate(self.client_names()):
+            if server.wait_for_variable(f"{prefix}_{i}", max(deadline - time.time(), 0)):
+                arrived.append(i)
+        return arrived
+
+    def reveal_shares(self, i: int, client) -> dict[int, int]:
+        dropped = set(client[f"dropped_{i}"])
+        # a share is a tuple (share of b, share of sk), only one of them is ever revealed for a neighbour
+        return {j: client[f"shares_{j}_{i}"][1 if j in dropped else 0] for j in self.neighbours(i)}
+
+    def reconstruct(self, server, owner: int) -> int:
+        shares = {j + 1: server[f"unmask_{j}"][owner] for j in self.neighbours(owner) if j in server["responders"]}
+        if len(shares) < self.threshold:
+            raise RuntimeError(f"Only {len(shares)} of the {self.threshold} shares needed to unmask client {owner} arrived")
+        return reconstruct_secret(dict(list(shares.items())[:self.threshold]))
+
+    def unmask_sum(self, server) -> int | list[int]:
+        survivors = set(server["survivors"])
+        total = [0] * self.vector_length
+        for u in survivors:
+            total = [(t + v) % self.modulus for t, v in zip(total, server[f"masked_{u}"])]
+            b = self.reconstruct(server, u)
+            total = [(t - m) % self.modulus for t, m in zip(total, prg(b.to_bytes(16, "little"), self.vector_length, self.modulus))]
+
+        for d in range(self.num_clients):
+            if d in survivors:
+                continue
+            sk = self.reconstruct(server, d).to_bytes(32, "little")
+            for u in self.neighbours(d):
+                if u not in survivors:
+                    continue
+                # undo the mask which survivor u added for its dropped neighbour d
+                mask = self.pairwise_mask(sk, server[f"pk_{u}"])
+                sign = 1 if u < d else -1
+                total = [(t - sign * m) % self.modulus for t, m in zip(total, mask)]
+
+        # the values are interpreted as signed numbers
+        total = [t - self.modulus if t >= self.modulus // 2 else t for t in total]
+        return total[0] if self.vector_length == 1 else total
+
+def generate_keys() -> tuple[bytes, bytes, int]:
+    sk = X25519PrivateKey.generate()
+    return sk.private_bytes_raw(), sk.public_key().public_bytes_raw(), secrets.randbits(128)
+
+if __name__ == "__main__":
+    n = 20
+    dropouts = random.sample([f"party_{i}" for i in range(n)], 3)
+    protocol = SecureAggregation(n, dropouts=dropouts)
+    input = {f"party_{i}": {"value": random.randint(-1000, 1000)} for i in range(n)}
+    protocol.set_input(input)
+    protocol()
+    print(protocol.get_output())
+    print("REAL:", sum(input[name]["value"] for name in input if name not in dropouts))
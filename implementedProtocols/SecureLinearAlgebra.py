@@ -0,0 +1,138 @@
+# temporary for now to allow the import of the SMPCbox from the implementedProtocols
+# folder. Should remove once it is pip installable
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol
+from OTExtension import OTExtension
+import numpy
+import secrets
+import time
+
+# the vectors of shares are send as integers with one 64 bit lane per row
+LANE_BYTES = 8
+
+def pack(lanes: numpy.ndarray) -> int:
+    return int.from_bytes(numpy.ascontiguousarray(lanes, dtype="<u8").tobytes(), "little")
+
+def unpack(value: int, num_lanes: int) -> numpy.ndarray:
+    return numpy.frombuffer(value.to_bytes(LANE_BYTES * num_lanes, "little"), dtype="<u8")
+
+def to_ring(value) -> numpy.ndarray:
+    # shares are integers modulo 2^l, negative integers wrap around like they do modulo 2^64
+    return numpy.asarray(value, dtype=numpy.int64).astype(numpy.uint64)
+
+class SecureMatrixVector(AbstractProtocol):
+    """
+    Computes additive shares of the product A x modulo 2^l of a rows x columns matrix A and a vector x, where Alice and
+    Bob each hold an additive share of both A and x as numpy arrays. The outputs y of Alice and Bob add up to A x modulo 2^l.
+
+    Besides the local products A_Alice x_Alice and A_Bob x_Bob, the cross terms A_Alice x_Bob and A_Bob x_Alice are computed
+    with the multiplication of Gilboa in which one OT per bit of the vector multiplies a whole column of the matrix:
+    the messages of the transfer for bit k of x_j are the vectors r_jk and A[:, j] * 2^k + r_jk. The cross terms thus take
+    2 * columns * l transfers in two runs of the OT protocol, regardless of the number of rows.
+
+    Rounds: two runs of the OT protocol, a constant which doesn't depend on the size of the matrix.
+    Communication: 2 * columns * l pairs of messages of rows * 8 bytes, about 32 * rows * columns * l bytes in total.
+    Memory: every sender holds its columns * l * rows random lanes and both messages, about 24 * rows * columns * l bytes.
+
+    l: the number of bits of the ring, at most 64.
+    ot_class: an OT protocol which takes the modulus of the messages, OTExtension or SimplestOT.
+    """
+    protocol_name = "SecureMatrixVector"
+
+    def __init__(self, rows: int, columns: int, l: int = 32, ot_class: type[AbstractProtocol] = OTExtension):
+        if not 1 <= l <= 64:
+            raise ValueError("l should be between 1 and 64")
+
+        self.rows = rows
+        self.columns = columns
+        self.l = l
+        self.mask = numpy.uint64(2**l - 1)
+        self.ot_class = ot_class
+        super().__init__()
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["A", "x"], "Bob": ["A", "x"]}
+
+    def party_names(self) -> list[str]:
+        return ["Alice", "Bob"]
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["y"], "Bob": ["y"]}
+
+    def __call__(self):
+        alice = self.parties["Alice"]
+        bob = self.parties["Bob"]
+
+        for d, (sender, receiver) in enumerate([(alice, bob), (bob, alice)]):
+            self.compute(sender, [f"r_{d}", f"m0_{d}", f"m1_{d}"], lambda sender = sender: self.cross_messages(sender["A"]),
+                         "r_jk = rand(), A[:, j] * 2^k + r_jk")
+            self.compute(receiver, f"x_bits_{d}", lambda receiver = receiver: self.bits(receiver["x"]), "Determine the bits x_jk")
+            ot_inputs = {"Sender": {"m0": f"m0_{d}", "m1": f"m1_{d}"}, "Receiver": {"b": f"x_bits_{d}"}}
+            ot_output = {"Receiver": {"mb": f"received_{d}"}}
+            self.run_subroutine_protocol(self.ot_class(2**(8 * LANE_BYTES * self.rows)), {"Sender": sender, "Receiver": receiver},
+                                         ot_inputs, ot_output)
+
+        # every party adds its local product, minus its random lanes and plus the lanes it received
+        for party, sent, received in [(alice, 0, 1), (bob, 1, 0)]:
+            self.compute(party, "y", lambda party = party, sent = sent, received = received: self.combine(party, sent, received),
+                         "A x - Sum of all r_jk + Sum of all received messages")
+
+    def cross_messages(self, A) -> tuple[numpy.ndarray, list[int], list[int]]:
+        A = to_ring(A).reshape(self.rows, self.columns)
+        r = numpy.frombuffer(secrets.token_bytes(LANE_BYTES * self.columns * self.l * self.rows), dtype="<u8").reshape(self.columns, self.l, self.rows)
+        shifts = numpy.arange(self.l, dtype=numpy.uint64)
+        # m1[j, k] = A[:, j] * 2^k + r[j, k], the uint64 arithmetic wraps around modulo 2^64
+        m1 = (A.T[:, None, :] << shifts[None, :, None]) + r
+        m0_messages = [pack(lanes) for lanes in r.reshape(-1, self.rows)]
+        m1_messages = [pack(lanes) for lanes in m1.reshape(-1, self.rows)]
+        return r.sum(axis=(0, 1), dtype=numpy.uint64), m0_messages, m1_messages
+
+    def bits(self, x) -> list[int]:
+        x = to_ring(x).reshape(self.columns)
+        return [int(x_j >> numpy.uint64(k)) & 1 for x_j in x for k in range(self.l)]
+
+    def combine(self, party, sent: int, received: int) -> numpy.ndarray:
+        A = to_ring(party["A"]).reshape(self.rows, self.columns)
+        x = to_ring(party["x"]).reshape(self.columns)
+        y = A @ x - party[f"r_{sent}"]
+        for value in party[f"received_{received}"]:
+            y += unpack(value, self.rows)
+        return y & self.mask
+
+class SecureInnerProduct(SecureMatrixVector):
+    """
+    Computes additive shares of the inner product <a, x> modulo 2^l, where Alice and Bob each hold an additive share
+    of both vectors. The inner product is the matrix vector product of a matrix with a single row.
+    """
+    protocol_name = "SecureInnerProduct"
+
+    def __init__(self, length: int, l: int = 32, ot_class: type[AbstractProtocol] = OTExtension):
+        super().__init__(1, length, l, ot_class)
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["a", "x"], "Bob": ["a", "x"]}
+
+    def __call__(self):
+        # the vector a is the single row of A
+        for party in self.parties.values():
+            self.compute(party, "A", lambda party = party: to_ring(party["a"]).reshape(1, self.columns), "A = [a]")
+        super().__call__()
+        for party in self.parties.values():
+            self.compute(party, "y", lambda party = party: int(party["y"][0]), "y[0]")
+
+if __name__ == "__main__":
+    rows, columns = 50, 40
+    A = numpy.random.randint(-100, 100, size=(rows, columns))
+    x = numpy.random.randint(-100, 100, size=columns)
+    A_alice = numpy.random.randint(-2**31, 2**31, size=(rows, columns))
+    x_alice = numpy.random.randint(-2**31, 2**31, size=columns)
+    p = SecureMatrixVector(rows, columns)
+    p.set_input({"Alice": {"A": A_alice, "x": x_alice}, "Bob": {"A": A - A_alice, "x": x - x_alice}})
+    s = time.time()
+    p()
+    print("execution time:", time.time() - s)
+    out = p.get_output()
+    y = (out["Alice"]["y"] + out["Bob"]["y"]) % 2**32
+    print(numpy.array_equal(y.astype(numpy.int64), (A @ x) % 2**32))
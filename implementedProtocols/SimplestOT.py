@@ -0,0 +1,133 @@
+# temporary for now to allow the import of the SMPCbox from the implementedProtocols
+# folder. Should remove once it is pip installable
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol
+from SMPCbox.Arithmetic import invert
+from OT import elementwise
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives import serialization
+import hashlib
+import secrets
+import time
+
+CURVE = ec.SECP256R1()
+# the prime of the field over which P-256 is defined
+P256_PRIME = 2**256 - 2**224 + 2**192 + 2**96 - 1
+# the order of the generator of P-256
+P256_ORDER = 0xffffffff00000000ffffffffffffffffbce6faada7179e84f3b9cac2fc632551
+
+def random_scalar() -> int:
+    # the scalars are stored as integers, so the variables can be shown by the visualiser
+    return secrets.randbelow(P256_ORDER - 1) + 1
+
+def scalar_key(scalar: int) -> ec.EllipticCurvePrivateKey:
+    return ec.derive_private_key(scalar, CURVE)
+
+def encode_point(public_key: ec.EllipticCurvePublicKey) -> bytes:
+    return public_key.public_bytes(serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint)
+
+def decode_point(data: bytes) -> ec.EllipticCurvePublicKey:
+    # checks that the point is on the curve, so a party can't send a point of a small subgroup
+    return ec.EllipticCurvePublicKey.from_encoded_point(CURVE, data)
+
+def add_points(P: ec.EllipticCurvePublicKey, Q: ec.EllipticCurvePublicKey, negate_Q: bool = False) -> ec.EllipticCurvePublicKey:
+    """
+    P + Q (or P - Q) in affine coordinates. The cryptography package only exposes scalar multiplications,
+    but the few additions Simplest OT needs are cheap in python.
+    """
+    p, q = P.public_numbers(), Q.public_numbers()
+    qy = (P256_PRIME - q.y) % P256_PRIME if negate_Q else q.y
+    if p.x == q.x:
+        if (p.y + qy) % P256_PRIME == 0:
+            raise ValueError("The sum of the points is the point at infinity")
+        # doubling, a = -3 for P-256
+        slope = (3 * p.x * p.x - 3) * invert(2 * p.y, P256_PRIME) % P256_PRIME
+    else:
+        slope = (qy - p.y) * invert(q.x - p.x, P256_PRIME) % P256_PRIME
+    x = (slope * slope - p.x - q.x) % P256_PRIME
+    y = (slope * (p.x - x) - p.y) % P256_PRIME
+    return ec.EllipticCurvePublicNumbers(x, y, CURVE).public_key()
+
+def derive_key(A: bytes, B: bytes, shared: bytes, modulus: int) -> int:
+    """
+    Hashes the transcript and the shared x-coordinate into a key which is statistically close to uniform modulo the modulus.
+    """
+    size = (modulus.bit_length() + 7) // 8 + 16
+    return int.from_bytes(hashlib.shake_256(A + B + shared).digest(size), "big") % modulus
+
+# the decoded points and the private key are passed in, so a batch of transfers only decodes them once
+
+def sender_keys(a: ec.EllipticCurvePrivateKey, A: bytes, A_point: ec.EllipticCurvePublicKey, B: bytes, modulus: int) -> tuple[int, int]:
+    B_point = decode_point(B)
+    k0 = derive_key(A, B, a.exchange(ec.ECDH(), B_point), modulus)
+    k1 = derive_key(A, B, a.exchange(ec.ECDH(), add_points(B_point, A_point, negate_Q=True)), modulus)
+    return k0, k1
+
+def receiver_point(choice: int, A_point: ec.EllipticCurvePublicKey) -> tuple[int, bytes]:
+    k = random_scalar()
+    kG = scalar_key(k).public_key()
+    B = kG if choice == 0 else add_points(A_point, kG)
+    return k, encode_point(B)
+
+def receiver_key(k: int, A: bytes, A_point: ec.EllipticCurvePublicKey, B: bytes, modulus: int) -> int:
+    return derive_key(A, B, scalar_key(k).exchange(ec.ECDH(), A_point), modulus)
+
+class SimplestOT(AbstractProtocol):
+    """
+    1-out-of-2 oblivious transfer of Chou and Orlandi ("The Simplest Protocol for Oblivious Transfer") on the P-256 curve.
+    The sender sends A = aG, the receiver with choice c sends B = kG + cA. The sender derives the keys H(aB) and H(a(B - A)),
+    of which the receiver can only compute H(kA) = the key of message m_c.
+    The messages are encrypted by adding the keys modulo the modulus, so the receiver learns m_c mod modulus.
+    Has the same inputs and outputs as the RSA based OT, a choice b != 0 selects m1. When the inputs are lists
+    every element is a separate transfer, all transfers use the same A and are send in the same messages.
+    """
+    protocol_name = "SimplestObliviousTransfer"
+
+    def __init__(self, modulus: int = 2**256):
+        self.modulus = modulus
+        super().__init__()
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Sender": ["m0", "m1"], "Receiver": ["b"]}
+
+    def party_names(self) -> list[str]:
+        return ["Sender", "Receiver"]
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Receiver": ["mb"]}
+
+    def __call__(self):
+        p_send = self.parties["Sender"]
+        p_recv = self.parties["Receiver"]
+
+        self.compute(p_send, "a", random_scalar, "a = rand()")
+        self.compute(p_send, "A", lambda: encode_point(scalar_key(p_send["a"]).public_key()), "A = aG")
+        self.send_variables(p_send, p_recv, "A")
+
+        self.compute(p_recv, ["k", "B"], lambda: elementwise(receiver_point, p_recv["b"], decode_point(p_recv["A"]), outputs=2),
+                     "k = rand(), B = kG + bA")
+        self.send_variables(p_recv, p_send, "B")
+
+        self.compute(p_send, ["k0", "k1"], lambda: elementwise(sender_keys, scalar_key(p_send["a"]), p_send["A"], decode_point(p_send["A"]),
+                                                               p_send["B"], self.modulus, outputs=2),
+                     "H(aB), H(a(B - A))")
+        self.compute(p_send, ["m0_enc", "m1_enc"], lambda: (elementwise(lambda m, k: (m + k) % self.modulus, p_send["m0"], p_send["k0"]),
+                                                            elementwise(lambda m, k: (m + k) % self.modulus, p_send["m1"], p_send["k1"])),
+                     "(m0 + k0, m1 + k1) mod M")
+        self.send_variables(p_send, p_recv, ["m0_enc", "m1_enc"])
+
+        self.compute(p_recv, "kb", lambda: elementwise(receiver_key, p_recv["k"], p_recv["A"], decode_point(p_recv["A"]), p_recv["B"], self.modulus),
+                     "H(kA)")
+        self.compute(p_recv, "mb_enc", lambda: elementwise(lambda b, e0, e1: e0 if b == 0 else e1, p_recv["b"], p_recv["m0_enc"], p_recv["m1_enc"]),
+                     "choose m_b")
+        self.compute(p_recv, "mb", lambda: elementwise(lambda e, k: (e - k) % self.modulus, p_recv["mb_enc"], p_recv["kb"]), "(m'_b - k_b) mod M")
+
+if __name__ == "__main__":
+    ot_protocol = SimplestOT()
+    ot_protocol.set_input({"Sender": {"m0": 21, "m1": 39}, "Receiver": {"b": 1}})
+    s = time.time()
+    ot_protocol()
+    print("OT time", time.time() - s)
+    print(ot_protocol.get_output())
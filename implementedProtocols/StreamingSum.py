@@ -0,0 +1,66 @@
+# temporary for now to allow the import of the SMPCbox from the implementedProtocols
+# folder. Should remove once it is pip installable
+import sys
+sys.path.append('../')
+
+from Sum import Sum, rand
+import random
+
+class StreamingSum(Sum):
+    """
+    Computes the sum of all the values of all parties, where each party gives its values as an iterable (for instance a generator).
+    The values are processed in chunks, in each round every party adds the sum of its next chunk to the accumulation passed along the ring.
+    Party_0 masks the accumulation with a fresh random value every round, so only the final sum is revealed.
+    The memory used by a party only depends on the chunk size, not on the number of values.
+    """
+    protocol_name = "StreamingSum"
+
+    def stream_input_variables(self) -> dict[str, list[str]]:
+        return self.input_variables()
+
+    def communication_topology(self) -> dict[str, list[str]]:
+        # besides the ring, party_0 tells every party whether another round follows
+        topology = super().communication_topology()
+        topology["party_0"] = [name for name in self.party_names() if name != "party_0"]
+        return topology
+
+    def __call__(self):
+        names = self.party_names()
+        party_0 = self.parties["party_0"]
+        self.compute(party_0, ["accum", "r"], lambda: (0, 0), "accum = 0, r = 0")
+
+        running = True
+        while running:
+            self.read_input_chunk(party_0, "value", "chunk")
+            self.compute(party_0, "r_next", rand, "rand()")
+            self.compute(party_0, "accum", lambda: party_0["accum"] - party_0["r"] + party_0["r_next"] + sum(party_0["chunk"]),
+                         "accum - r + r_next + sum(chunk)")
+            self.compute(party_0, "r", lambda: party_0["r_next"], "r_next")
+            # whether any party has values left after this round
+            self.compute(party_0, "active", lambda: not party_0["value"].exhausted, "value has more chunks")
+
+            for i, name in enumerate(names):
+                if i == 0:
+                    continue
+
+                prev_party = self.parties[names[i-1]]
+                cur_party = self.parties[name]
+                self.send_variables(prev_party, cur_party, ["accum", "active"])
+                self.read_input_chunk(cur_party, "value", "chunk")
+                self.compute(cur_party, ["accum", "active"],
+                             lambda cur_party = cur_party: (cur_party["accum"] + sum(cur_party["chunk"]),
+                                                            cur_party["active"] or not cur_party["value"].exhausted),
+                             "accum + sum(chunk), active or value has more chunks")
+
+            self.send_variables(self.parties[names[-1]], party_0, ["accum", "active"])
+            self.broadcast_variables(party_0, "active")
+            running = any(self.parties[name]["active"] for name in names if self.is_local(name))
+
+        self.compute(party_0, "sum", lambda: party_0["accum"] - party_0["r"], "accum - r")
+
+if __name__ == "__main__":
+    protocol = StreamingSum(3)
+    input = {f"party_{i}": {"value": (random.randint(10, 10000) for _ in range(1000 * (i + 1)))} for i in range(3)}
+    protocol.set_input(input, chunk_size=256)
+    protocol()
+    print(protocol.get_output())
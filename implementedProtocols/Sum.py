@@ -27,6 +27,11 @@ class Sum(AbstractProtocol):
     def output_variables(self) -> dict[str, list[str]]:
         return {"party_0":["sum"]}
 
+    def communication_topology(self) -> dict[str, list[str]]:
+        # the accumulation is passed along a ring, so each party only sends to the next party
+        names = self.party_names()
+        return {name: [names[(i + 1) % len(names)]] for i, name in enumerate(names)}
+
     def __call__(self):
         party_0 = self.parties["party_0"]
         self.compute(party_0, "r", rand, "rand()")
@@ -45,8 +50,6 @@ class Sum(AbstractProtocol):
         self.send_variables(self.parties[self.party_names()[-1]], self.parties["party_0"], "accum")
         self.compute(party_0, "sum", lambda: party_0["accum"] - party_0["r"], "accum - r")
 
-        print("SUM:", party_0["sum"])
-
 if __name__ == "__main__":
     protocol = Sum(5)
     input = {}
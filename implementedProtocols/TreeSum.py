@@ -0,0 +1,77 @@
+# temporary for now to allow the import of the SMPCbox from the implementedProtocols
+# folder. Should remove once it is pip installable
+import sys
+sys.path.append('../')
+
+from Sum import Sum, rand
+import random
+
+class TreeSum(Sum):
+    """
+    Computes the sum of the values of all parties using additive secret sharing.
+    Every party splits its value into one share for each party and all shares are exchanged in a single round.
+    The sums of the received shares reveal nothing about individual values, these partial sums are added up along
+    a binomial tree towards party_0. The protocol takes 1 + ceil(log2(n)) rounds instead of the n rounds of the ring based Sum.
+    """
+    protocol_name = "TreeSum"
+
+    def communication_topology(self) -> dict[str, list[str]]:
+        # the shares are exchanged between every pair of parties
+        names = self.party_names()
+        return {name: [other for other in names if other != name] for name in names}
+
+    def __call__(self):
+        names = self.party_names()
+        n = len(names)
+
+        # every party splits its value into n random shares which add up to the value
+        for i, name in enumerate(names):
+            party = self.parties[name]
+            share_names = [f"share_{i}_{j}" for j in range(n)]
+            self.compute(party, share_names, lambda party = party: self.split(party["value"], n), "split value into shares")
+
+        # all parties send their shares at once
+        for i, name in enumerate(names):
+            for j, other in enumerate(names):
+                if i != j:
+                    self.send_variables(self.parties[name], self.parties[other], f"share_{i}_{j}")
+
+        for j, name in enumerate(names):
+            party = self.parties[name]
+            self.compute(party, f"partial_{j}", lambda party = party, j = j: sum(party[f"share_{i}_{j}"] for i in range(n)),
+                         "sum of the received shares")
+
+        # add up the partial sums along a binomial tree, after the round with step s every party j with j % 2s == 0 holds
+        # the sum of the partial sums of the parties j to j + 2s - 1
+        step = 1
+        while step < n:
+            for j in range(step, n, 2 * step):
+                parent, child = self.parties[names[j - step]], self.parties[names[j]]
+                self.send_variables(child, parent, f"partial_{j}")
+                self.compute(parent, f"partial_{j - step}",
+                             lambda parent = parent, j = j: parent[f"partial_{j - step}"] + parent[f"partial_{j}"],
+                             f"partial_{j - step} + partial_{j}")
+            step *= 2
+
+        party_0 = self.parties["party_0"]
+        self.compute(party_0, "sum", lambda: party_0["partial_0"], "partial_0")
+
+    def split(self, value: int, n: int) -> tuple[int, ...] | int:
+        if n == 1:
+            # a single computed variable is stored as is
+            return value
+        shares = [rand() for _ in range(n - 1)]
+        return (value - sum(shares), *shares)
+
+if __name__ == "__main__":
+    protocol = TreeSum(5)
+    input = {}
+    real_sum = 0
+    for i in range(5):
+        val = random.randint(10, 10000)
+        input[f"party_{i}"] = {"value": val}
+        real_sum += val
+    protocol.set_input(input)
+    protocol()
+    print(protocol.get_output())
+    print("REAL:", real_sum)
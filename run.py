@@ -1,38 +1,65 @@
 from SMPCbox.Visualiser import ProtocolVisualizer, DistributedVisualizer
 from SMPCbox.DynamicLoading import ClassWatcher
+from SMPCbox.CommunicationLayer import EventPolicy
 import argparse
-from SMPCbox.constants import QUEUE_SIZE
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Visualise a protocol.")
-    parser.add_argument("path", type=str, help="Path to the protocol file.")
+    parser.add_argument("path", type=str, nargs="?", help="Path to the protocol file.")
     parser.add_argument(
         "-d",
         "--distributed",
         action="store_true",
         help="Whether the protocol is distributed.",
     )
+    parser.add_argument(
+        "-p",
+        "--policy",
+        type=EventPolicy,
+        choices=list(EventPolicy),
+        default=EventPolicy.BLOCK,
+        metavar="{" + ",".join(policy.value for policy in EventPolicy) + "}",
+        help="What the protocol does with its steps when the visualiser can't keep up.",
+    )
     parser.add_argument(
         "-e",
         action="store_true",
-        help="Allow the execution to never block.",
+        help="Allow the execution to never block, the steps are coalesced when the visualiser can't keep up.",
+    )
+    parser.add_argument(
+        "-r",
+        "--replay",
+        type=str,
+        metavar="TRACE",
+        help="Replay a run recorded in a trace file by a TraceRecorder.",
+    )
+    parser.add_argument(
+        "--run",
+        type=int,
+        default=0,
+        help="The index of the run in the trace file which is replayed, negative indexes count from the last run.",
     )
     args = parser.parse_args()
+    if args.path is None and args.replay is None:
+        parser.error("a protocol file or a trace file to replay is required")
 
-    if args.e:
-        QUEUE_SIZE = 0
+    policy = EventPolicy.COALESCE if args.e else args.policy
 
     if args.distributed:
-        v = DistributedVisualizer()
+        v = DistributedVisualizer(policy)
     else:
-        v = ProtocolVisualizer()
+        v = ProtocolVisualizer(policy=policy)
+
+    if args.replay is not None:
+        v.replay_trace(args.replay, args.run)
 
-    def callback(watcher: ClassWatcher):
-        v.set_protocols({name: cls for name, cls in watcher.get_classes()})
+    if args.path is not None:
+        def callback(watcher: ClassWatcher):
+            v.set_protocols({name: cls for name, cls in watcher.get_classes()})
 
-    watcher = ClassWatcher(args.path, callback)
+        watcher = ClassWatcher(args.path, callback)
 
-    v.add_atexit(watcher.stop)
+        v.add_atexit(watcher.stop)
 
     v.run_gui()
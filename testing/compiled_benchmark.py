@@ -0,0 +1,39 @@
+import sys
+sys.path.append('../')
+sys.path.append('../implementedProtocols')
+
+from Sum import Sum
+from testSubroutine import Accumulate
+import time
+
+"""
+Compares running protocols with many small operations normally and with run_compiled, which replays a recorded plan.
+Usage: python compiled_benchmark.py [runs]
+"""
+
+def measure(protocol, inputs, compiled: bool) -> float:
+    start = time.perf_counter()
+    for protocol_input in inputs:
+        protocol.set_input(protocol_input)
+        if compiled:
+            protocol.run_compiled()
+        else:
+            protocol()
+    return (time.perf_counter() - start) / len(inputs)
+
+def run(runs: int):
+    cases = [
+        ("Sum(50)", lambda: Sum(50), [{f"party_{i}": {"value": i + k} for i in range(50)} for k in range(runs)]),
+        ("Accumulate(20)", lambda: Accumulate(20), [{"Alice": {"a": k}, "Bob": {"b": 1}} for k in range(runs)]),
+    ]
+    for name, create, inputs in cases:
+        normal = measure(create(), inputs, False)
+        compiled_protocol = create()
+        # the first run records the plan
+        compiled_protocol.set_input(inputs[0])
+        compiled_protocol.run_compiled()
+        compiled = measure(compiled_protocol, inputs, True)
+        print(f"{name:16} normal {normal * 1e6:8.1f}us  compiled {compiled * 1e6:8.1f}us  speedup {normal / compiled:.2f}x")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
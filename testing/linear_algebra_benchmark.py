@@ -0,0 +1,57 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.SecureLinearAlgebra import SecureMatrixVector
+from test_input import get_addresses
+import multiprocessing as mp
+import numpy
+import time
+import tracemalloc
+
+"""
+Measures SecureMatrixVector between two distributed parties for growing matrices.
+The number of messages is constant, the communication and memory grow with rows * columns * l.
+Usage: python linear_algebra_benchmark.py [l]
+"""
+
+NAMES = ["Alice", "Bob"]
+SIZES = [(10, 10), (100, 10), (10, 100), (100, 100), (1000, 100), (100, 1000)]
+
+def run_party(rows, columns, l, addresses, name, input, queue, barrier):
+    protocol = SecureMatrixVector(rows, columns, l)
+    protocol.set_party_addresses(addresses, name)
+    protocol.set_input(input)
+    barrier.wait()
+    tracemalloc.start()
+    start = time.perf_counter()
+    protocol()
+    protocol.get_output()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = protocol.get_party_statistics()[name]
+    protocol.terminate_protocol()
+    queue.put((duration, stats.messages_send, stats.uncompressed_bytes_send, peak))
+
+def run_once(rows, columns, l, start_port):
+    A = numpy.random.randint(-2**31, 2**31, size=(rows, columns))
+    x = numpy.random.randint(-2**31, 2**31, size=columns)
+    input = {"Alice": {"A": A, "x": x}, "Bob": {"A": A, "x": x}}
+    queue = mp.Queue()
+    barrier = mp.Barrier(2)
+    addresses = get_addresses(start_port, NAMES)
+    processes = [mp.Process(target=run_party, args=(rows, columns, l, addresses, name, input, queue, barrier)) for name in NAMES]
+    [p.start() for p in processes]
+    results = [queue.get() for _ in processes]
+    [p.join() for p in processes]
+    return (max(r[0] for r in results), sum(r[1] for r in results), sum(r[2] for r in results), max(r[3] for r in results))
+
+def run(l: int, start_port: int = 19000):
+    for rows, columns in SIZES:
+        duration, messages, bytes_send, peak = run_once(rows, columns, l, start_port)
+        start_port += 2
+        print(f"rows {rows:5}  columns {columns:5}  messages {messages:3}  sent {bytes_send / 2**20:8.2f} MiB  "
+              f"peak memory {peak / 2**20:8.2f} MiB  time {duration:7.3f}s  {rows * columns / duration:10.0f} products/s")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 32)
@@ -0,0 +1,66 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.MultiplicationProtocol import SecretShareMultiplication
+from implementedProtocols.BatchMultiplication import BatchSecretShareMultiplication
+from implementedProtocols.SimplestOT import SimplestOT
+from test_input import get_addresses
+import multiprocessing as mp
+import random
+import time
+
+"""
+Compares the throughput of multiplications done one at a time with SecretShareMultiplication and SimplestOT to a single run of
+BatchSecretShareMultiplication, which uses OT extension, between two distributed parties.
+Usage: python mult_benchmark.py [max_batch_size] [l]
+"""
+
+NAMES = ["Alice", "Bob"]
+
+def run_party(batched, n, l, start_port, name, input, queue, barrier):
+    if batched:
+        runs = [(BatchSecretShareMultiplication(l), input)]
+    else:
+        # every multiplication is a separate protocol run with its own ports
+        runs = [(SecretShareMultiplication(l, SimplestOT), {party: {var: values[j] for var, values in vars.items()} for party, vars in input.items()})
+                for j in range(n)]
+    for j, (protocol, _) in enumerate(runs):
+        protocol.set_party_addresses(get_addresses(start_port + 2 * j, NAMES), name)
+
+    barrier.wait()
+    start = time.perf_counter()
+    for protocol, protocol_input in runs:
+        protocol.set_input(protocol_input)
+        protocol()
+        protocol.get_output()
+    duration = time.perf_counter() - start
+
+    messages = sum(protocol.get_party_statistics()[name].messages_send for protocol, _ in runs)
+    for protocol, _ in runs:
+        protocol.terminate_protocol()
+    queue.put((duration, messages))
+
+def run_once(batched, n, l, start_port):
+    input = {"Alice": {"a": [random.randrange(2**l) for _ in range(n)]}, "Bob": {"b": [random.randrange(2**l) for _ in range(n)]}}
+    queue = mp.Queue()
+    barrier = mp.Barrier(2)
+    processes = [mp.Process(target=run_party, args=(batched, n, l, start_port, name, input, queue, barrier)) for name in NAMES]
+    [p.start() for p in processes]
+    results = [queue.get() for _ in processes]
+    [p.join() for p in processes]
+    return max(duration for duration, _ in results), sum(messages for _, messages in results)
+
+def run(max_batch_size: int, l: int, start_port: int = 18000):
+    n = 1
+    while n <= max_batch_size:
+        for batched in [False, True]:
+            if not batched and n > 100:
+                # a protocol run per product uses two ports per product
+                continue
+            duration, messages = run_once(batched, n, l, start_port)
+            start_port += 2 * n
+            print(f"{'batched' if batched else 'separate':8}  products {n:5}  messages {messages:5}  time {duration:8.3f}s  {n / duration:8.1f} mult/s")
+        n *= 10
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000, int(sys.argv[2]) if len(sys.argv) > 2 else 32)
@@ -0,0 +1,22 @@
+import sys
+sys.path.append('../')
+
+from testCompiled import test_pipelined_distributed
+
+"""
+Runs the Overlap protocol of testCompiled distributed, in which Alice has a computation that doesn't depend on the
+reply she waits for. Compares the replays of the sequential and the pipelined execution of the recorded plans.
+Usage: python pipelined_benchmark.py [delay in seconds]
+"""
+
+def run(delay: float):
+    for port, pipelined in [(19500, False), (19510, True)]:
+        results = test_pipelined_distributed(delay, pipelined, port)
+        # the first run records the plan
+        replays = results["Alice"][1:]
+        duration = sum(duration for _, duration, _ in replays) / len(replays)
+        wait_time = sum(wait_time for _, _, wait_time in replays) / len(replays)
+        print(f"{'pipelined' if pipelined else 'sequential':10}  delay {delay:.2f}s  run {duration:.3f}s  Alice wait_time {wait_time:.3f}s")
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 0.2)
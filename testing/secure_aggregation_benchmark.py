@@ -0,0 +1,50 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.SecureAggregation import SecureAggregation
+import random
+import time
+
+"""
+Measures the simulated running time of SecureAggregation for a growing number of clients and dropout rates.
+Every client has num_neighbours = 2 * ceil(log2(n)) + 2 neighbours, so the messages grow with n * log(n) instead of n^2.
+With random dropouts a client can lose so many neighbours that fewer than threshold shares remain, such runs are reported as failed.
+Usage: python secure_aggregation_benchmark.py [vector_length] [client counts ...]
+"""
+
+def run_once(n: int, dropout_rate: float, vector_length: int):
+    dropouts = [f"party_{i}" for i in random.sample(range(n), int(n * dropout_rate))]
+    input = {f"party_{i}": {"value": [random.randint(-1000, 1000) for _ in range(vector_length)]} for i in range(n)}
+    protocol = SecureAggregation(n, vector_length, dropouts=dropouts)
+    protocol.set_input(input)
+    start = time.perf_counter()
+    try:
+        protocol()
+    except RuntimeError:
+        protocol.terminate_protocol()
+        return None, 0, protocol.num_neighbours
+    duration = time.perf_counter() - start
+
+    expected = [sum(input[name]["value"][k] for name in input if name not in dropouts) for k in range(vector_length)]
+    result = protocol.get_output()["server"]["sum"]
+    if vector_length == 1:
+        result = [result]
+    if result != expected:
+        raise RuntimeError(f"Wrong sum for {n} clients with dropout rate {dropout_rate}")
+
+    messages = sum(stats.messages_send for stats in protocol.get_party_statistics().values())
+    protocol.terminate_protocol()
+    return duration, messages, protocol.num_neighbours
+
+def run(vector_length: int, client_counts: list[int]):
+    for n in client_counts:
+        for dropout_rate in [0, 0.05, 0.1, 0.2]:
+            duration, messages, neighbours = run_once(n, dropout_rate, vector_length)
+            if duration is None:
+                print(f"clients {n:5}  neighbours {neighbours:3}  dropouts {dropout_rate:4.0%}  failed, too many neighbours dropped out")
+                continue
+            print(f"clients {n:5}  neighbours {neighbours:3}  dropouts {dropout_rate:4.0%}  messages {messages:7}  "
+                  f"time {duration:.3f}s  per client {duration / n * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 16, [int(n) for n in sys.argv[2:]] or [100, 250, 500, 1000])
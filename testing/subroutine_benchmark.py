@@ -0,0 +1,69 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol
+import time
+
+"""
+Measures the overhead of run_subroutine_protocol with a subroutine which only does a single computation,
+such that nearly all of the measured time is spent on starting and ending the subroutine.
+Usage: python subroutine_benchmark.py [calls]
+"""
+
+class Copy(AbstractProtocol):
+    protocol_name = "Copy"
+
+    def party_names(self) -> list[str]:
+        return ["Sender", "Receiver"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Sender": ["value"], "Receiver": []}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Sender": ["copy"]}
+
+    def __call__(self):
+        sender = self.parties["Sender"]
+        self.compute(sender, "copy", lambda: sender["value"], "value")
+
+class RepeatedSubroutine(AbstractProtocol):
+    protocol_name = "RepeatedSubroutine"
+
+    def __init__(self, calls: int):
+        self.calls = calls
+        super().__init__()
+
+    def party_names(self) -> list[str]:
+        return ["Alice", "Bob"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["value"], "Bob": []}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["value"]}
+
+    def __call__(self):
+        roles = {"Sender": self.parties["Alice"], "Receiver": self.parties["Bob"]}
+        for _ in range(self.calls):
+            self.run_subroutine_protocol(Copy(), roles, {"Sender": {"value": "value"}}, {"Sender": {"copy": "value"}})
+
+def run(calls: int):
+    protocol = RepeatedSubroutine(calls)
+    protocol.set_input({"Alice": {"value": 1}})
+    start = time.perf_counter()
+    protocol()
+    duration = time.perf_counter() - start
+
+    # the cost of the subroutine itself, a single computation and constructing the protocol instance
+    baseline = Copy()
+    baseline.set_input({"Sender": {"value": 1}})
+    start = time.perf_counter()
+    for _ in range(calls):
+        Copy()
+        baseline()
+    baseline_duration = time.perf_counter() - start
+    print(f"calls {calls}  per call {duration / calls * 1e6:.1f}us  of which subroutine {baseline_duration / calls * 1e6:.1f}us  "
+          f"overhead {(duration - baseline_duration) / calls * 1e6:.1f}us")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,62 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.Sum import Sum
+from implementedProtocols.TreeSum import TreeSum
+from test_input import get_addresses
+import multiprocessing as mp
+import math
+import time
+
+"""
+Compares the latency of the ring based Sum with the secret sharing based TreeSum for a growing number of distributed parties.
+The ring takes n sequential rounds, TreeSum takes 1 + ceil(log2(n)) rounds but sends n * (n - 1) shares.
+Usage: python sum_benchmark.py [max_parties] [repeats]
+"""
+
+def run_party(protocol_class, addresses, name, input, queue, barrier):
+    protocol = protocol_class(len(addresses))
+    protocol.set_input(input)
+    protocol.set_party_addresses(addresses, name)
+    # all parties start at the same time, such that the time spent on setting up the connections isn't measured
+    barrier.wait()
+    start = time.perf_counter()
+    protocol()
+    duration = time.perf_counter() - start
+    # the output is retreived before terminating, the last received variables could otherwise still be on their way
+    protocol.get_output()
+    messages = protocol.get_party_statistics()[name].messages_send
+    protocol.terminate_protocol()
+    queue.put((duration, messages))
+
+def run_once(protocol_class, n, start_port):
+    names = [f"party_{i}" for i in range(n)]
+    addresses = get_addresses(start_port, names)
+    input = {name: {"value": i} for i, name in enumerate(names)}
+    queue = mp.Queue()
+    barrier = mp.Barrier(n)
+    processes = [mp.Process(target=run_party, args=(protocol_class, addresses, name, input, queue, barrier)) for name in names]
+    [p.start() for p in processes]
+    results = [queue.get() for _ in processes]
+    [p.join() for p in processes]
+    # the protocol is done once the slowest party is done
+    return max(duration for duration, _ in results), sum(messages for _, messages in results)
+
+def run(max_parties: int, repeats: int, start_port: int = 17000):
+    n = 2
+    while n <= max_parties:
+        for protocol_class in [Sum, TreeSum]:
+            times = []
+            for _ in range(repeats):
+                duration, messages = run_once(protocol_class, n, start_port)
+                times.append(duration)
+                start_port += n
+                if start_port > 30000:
+                    start_port = 17000
+            rounds = n if protocol_class is Sum else 1 + math.ceil(math.log2(n))
+            print(f"{protocol_class.__name__:8} parties {n:3}  rounds {rounds:3}  messages {messages:5}  "
+                  f"mean {sum(times) / len(times):.4f}s  min {min(times):.4f}s")
+        n *= 2
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 32, int(sys.argv[2]) if len(sys.argv) > 2 else 3)
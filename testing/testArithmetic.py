@@ -0,0 +1,44 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox.Arithmetic import powmod, invert, FixedBaseTable, crt_key, crt_powmod
+from implementedProtocols.OT import getRSAvars
+import random
+import unittest
+
+class TestArithmetic(unittest.TestCase):
+    def test_powmod(self):
+        for _ in range(20):
+            modulus = random.getrandbits(512) | 1
+            base, exponent = random.getrandbits(600), random.getrandbits(512)
+            self.assertEqual(powmod(base, exponent, modulus), pow(base, exponent, modulus))
+        self.assertIsInstance(powmod(3, 5, 7), int)
+
+    def test_invert(self):
+        self.assertEqual(invert(3, 7) * 3 % 7, 1)
+        self.assertEqual(powmod(3, -1, 7), 5)
+        with self.assertRaises(ValueError):
+            invert(2, 4)
+
+    def test_fixed_base_table(self):
+        modulus = random.getrandbits(256) | 1
+        base = random.getrandbits(256)
+        for window_bits in [1, 4, 5]:
+            table = FixedBaseTable(base, modulus, 256, window_bits)
+            for exponent in [0, 1, 2 ** 255, 2 ** 256 - 1] + [random.getrandbits(256) for _ in range(10)]:
+                self.assertEqual(table.pow(exponent), pow(base, exponent, modulus))
+        # exponents outside of the table fall back to powmod
+        self.assertEqual(table.pow(2 ** 300 + 5), pow(base, 2 ** 300 + 5, modulus))
+
+    def test_crt(self):
+        N, key, e = getRSAvars()
+        d = invert(e, (key.p - 1) * (key.q - 1))
+        for _ in range(10):
+            value = random.randrange(N)
+            self.assertEqual(crt_powmod(value, key), pow(value, d, N))
+            self.assertEqual(crt_powmod(powmod(value, e, N), key), value)
+        # negative values are reduced modulo p and q
+        self.assertEqual(crt_powmod(-5, key), pow(-5, d, N))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.BatchMultiplication import BatchSecretShareMultiplication
+from implementedProtocols.OT import OT
+import random
+import unittest
+from test_input import test_distributed, test_simulated
+
+class TestBatchMultiplication(unittest.TestCase):
+    def create_input(self, n):
+        return {"Alice": {"a": [random.randint(-2**40, 2**40) for _ in range(n)]},
+                "Bob": {"b": [random.randint(-2**40, 2**40) for _ in range(n)]}}
+
+    def check_output(self, input, output, l):
+        products = [a * b % 2**l for a, b in zip(input["Alice"]["a"], input["Bob"]["b"])]
+        self.assertEqual([(x + y) % 2**l for x, y in zip(output["Alice"]["x"], output["Bob"]["y"])], products)
+
+    def test_simulated(self):
+        for n, l in [(0, 32), (1, 32), (7, 16), (40, 64)]:
+            input = self.create_input(n)
+            self.check_output(input, test_simulated(BatchSecretShareMultiplication, input, init_args=[l]), l)
+
+    def test_rsa_ot(self):
+        input = self.create_input(3)
+        self.check_output(input, test_simulated(BatchSecretShareMultiplication, input, init_args=[8, OT]), 8)
+
+    def test_distributed(self):
+        input = self.create_input(20)
+        self.check_output(input, test_distributed(BatchSecretShareMultiplication, input, 14850), 32)
+
+    def test_constant_messages(self):
+        # the number of messages doesn't grow with the length of the vectors
+        messages = []
+        for n in [1, 30]:
+            protocol = BatchSecretShareMultiplication()
+            protocol.set_input(self.create_input(n))
+            protocol()
+            messages.append({name: stats.messages_send for name, stats in protocol.get_party_statistics().items()})
+        self.assertEqual(messages[0], messages[1])
+
+if __name__ == "__main__":
+    unittest.main()
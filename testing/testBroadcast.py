@@ -0,0 +1,125 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol, BroadcastStrategy
+from implementedProtocols.List import CustomList
+import unittest
+from test_input import test_distributed, test_simulated
+
+class Broadcast(AbstractProtocol):
+    protocol_name = "Broadcast"
+
+    def __init__(self, num_parties: int, strategy: str, root: int = 0):
+        self.num_parties = num_parties
+        self.strategy = BroadcastStrategy(strategy)
+        self.root = root
+        super().__init__()
+
+    def party_names(self) -> list[str]:
+        return [f"party_{i}" for i in range(self.num_parties)]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {f"party_{self.root}": ["vector", "number"]}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {name: ["vector", "number"] for name in self.party_names()}
+
+    def __call__(self):
+        self.broadcast_variables(self.parties[f"party_{self.root}"], ["vector", "number"], self.strategy, num_chunks=3)
+
+class RecordingVisualiser:
+    def __init__(self):
+        self.events = []
+
+    def send_message(self, sender, receiver, values):
+        self.events.append(("send", sender, receiver))
+
+    def broadcast_variable(self, sender, values):
+        self.events.append(("broadcast", sender))
+
+class TestBroadcast(unittest.TestCase):
+    def cases(self):
+        return [
+            (2, "star", 0, [1, 2, 3]),
+            (5, "star", 3, list(range(20))),
+            (2, "tree", 1, [4]),
+            (5, "tree", 0, list(range(20))),
+            (8, "tree", 6, [-1, -2]),
+            (2, "pipelined", 0, []),
+            (5, "pipelined", 2, list(range(20))),
+            (7, "pipelined", 6, [2**70, -1, 5, 6]),
+        ]
+
+    def check_output(self, output, num_parties, vector, number):
+        for i in range(num_parties):
+            self.assertEqual(output[f"party_{i}"]["vector"], vector)
+            self.assertEqual(output[f"party_{i}"]["number"], number)
+
+    def test_cases_simulated(self):
+        for num_parties, strategy, root, vector in self.cases():
+            input = {f"party_{root}": {"vector": vector, "number": len(vector)}}
+            out = test_simulated(Broadcast, input, init_args=[num_parties, strategy, root])
+            self.check_output(out, num_parties, vector, len(vector))
+
+    def test_cases_distributed(self):
+        start_port = 13000
+        for num_parties, strategy, root, vector in self.cases():
+            input = {f"party_{root}": {"vector": vector, "number": len(vector)}}
+            out = test_distributed(Broadcast, input, start_port, init_args=[num_parties, strategy, root])
+            self.check_output(out, num_parties, vector, len(vector))
+            start_port += num_parties
+
+    def test_tree_messages(self):
+        # the broadcasting party only sends log(n) messages
+        protocol = Broadcast(8, "tree")
+        protocol.set_input({"party_0": {"vector": [1], "number": 1}})
+        protocol()
+        self.assertEqual(protocol.get_party_statistics()["party_0"].messages_send, 3)
+        self.assertEqual(protocol.get_total_statistics().messages_send, 7)
+
+    def test_broadcast_visualised_once(self):
+        for strategy in ["star", "tree", "pipelined"]:
+            protocol = Broadcast(4, strategy)
+            visualiser = RecordingVisualiser()
+            protocol.visualiser = visualiser
+            protocol.set_input({"party_0": {"vector": [1, 2, 3], "number": 3}})
+            protocol()
+            self.assertEqual(visualiser.events, [("broadcast", "party_0")])
+
+    def test_pipelined_no_collision(self):
+        # a variable with the name of a chunk is not touched by the broadcast
+        class Collision(Broadcast):
+            def __call__(self):
+                root = self.parties["party_0"]
+                root.set_local_variable("vector_chunk0", "mine")
+                super().__call__()
+
+        protocol = Collision(3, "pipelined")
+        protocol.set_input({"party_0": {"vector": [1, 2, 3, 4], "number": 4}})
+        protocol()
+        self.assertEqual(protocol.parties["party_0"]["vector_chunk0"], "mine")
+        self.assertEqual(protocol.parties["party_2"]["vector"], [1, 2, 3, 4])
+
+    def test_pipelined_keeps_type(self):
+        protocol = Broadcast(3, "pipelined")
+        protocol.set_input({"party_0": {"vector": CustomList("[1, 2, 3, 4]"), "number": 4}})
+        protocol()
+        self.assertIs(type(protocol.parties["party_2"]["vector"]), CustomList)
+
+    def test_invalid_chunks(self):
+        protocol = Broadcast(3, "pipelined")
+        protocol.set_input({"party_0": {"vector": [1], "number": 1}})
+        with self.assertRaises(ValueError):
+            protocol.broadcast_variables(protocol.parties["party_0"], "vector", BroadcastStrategy.PIPELINED, num_chunks=0)
+        self.assertFalse(protocol.broadcasting)
+
+    def test_star_single_message(self):
+        protocol = Broadcast(5, "star")
+        protocol.set_input({"party_0": {"vector": [1], "number": 1}})
+        protocol()
+        # one message is counted for every receiver of the broadcast
+        self.assertEqual(protocol.get_party_statistics()["party_0"].messages_send, 4)
+        self.assertEqual(protocol.get_party_statistics()["party_1"].messages_received, 1)
+
+if __name__ == "__main__":
+    unittest.main()
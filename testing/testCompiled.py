@@ -0,0 +1,275 @@
+import sys
+sys.path.append('../')
+sys.path.append('../implementedProtocols')
+sys.path.append('../implementedProtocols/branchingExamples')
+
+from Sum import Sum
+from BatchMultiplication import BatchSecretShareMultiplication
+from testSubroutine import Accumulate
+import OT_using_if
+import OT_using_methods
+from SMPCbox import AbstractProtocol
+from SMPCbox.ProtocolPlan import MAX_BRANCHES
+import unittest
+import multiprocessing as mp
+import random
+import time
+from test_input import get_addresses
+
+def run_compiled_party(protocol_class, init_args, addrs, local_p, inputs, queue):
+    p = protocol_class(*init_args)
+    p.set_party_addresses(addrs, local_p)
+    outputs = []
+    for protocol_input in inputs:
+        p.set_input({local_p: protocol_input.get(local_p, {})})
+        p.run_compiled()
+        outputs.append(p.get_output())
+    queue.put((local_p, outputs, p.plan.dynamic, p.plan.root.guard_read))
+    p.terminate_protocol()
+
+def test_compiled_distributed(protocol_class, inputs, start_port, init_args=()):
+    addrs = get_addresses(start_port, protocol_class(*init_args).party_names())
+    q = mp.Queue()
+    processes = [mp.Process(target=run_compiled_party, args=(protocol_class, init_args, addrs, name, inputs, q)) for name in addrs]
+    [p.start() for p in processes]
+    results = {}
+    for _ in processes:
+        name, outputs, dynamic, guard_read = q.get(timeout=60)
+        results[name] = (outputs, dynamic, guard_read)
+    [p.join() for p in processes]
+    return results
+
+class Overlap(AbstractProtocol):
+    """
+    Bob takes delay seconds to compute his reply to Alice, in the mean time Alice can do her own computation of delay seconds.
+    """
+    protocol_name = "Overlap"
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        super().__init__()
+
+    def party_names(self) -> list[str]:
+        return ["Alice", "Bob"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["a"], "Bob": []}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["c", "d"]}
+
+    def slow(self, value: int) -> int:
+        time.sleep(self.delay)
+        return value
+
+    def __call__(self):
+        alice, bob = self.parties["Alice"], self.parties["Bob"]
+        self.send_variables(alice, bob, "a")
+        self.compute(bob, "b", lambda: self.slow(bob["a"] + 1), "a + 1")
+        self.send_variables(bob, alice, "b")
+        self.compute(alice, "c", lambda: alice["a"] + alice["b"], "a + b")
+        self.compute(alice, "d", lambda: self.slow(2 * alice["a"]), "2 * a")
+
+def run_pipelined_party(addrs, local_p, delay, pipelined, queue):
+    p = Overlap(delay)
+    p.set_party_addresses(addrs, local_p)
+    results = []
+    for a in range(3):
+        p.set_input({"Alice": {"a": a}} if local_p == "Alice" else {})
+        wait_time = p.parties[local_p].statistics.wait_time
+        start = time.perf_counter()
+        p.run_compiled(pipelined)
+        duration = time.perf_counter() - start
+        results.append((p.get_output(), duration, p.parties[local_p].statistics.wait_time - wait_time))
+    queue.put((local_p, results))
+    p.terminate_protocol()
+
+def test_pipelined_distributed(delay, pipelined, start_port):
+    addrs = get_addresses(start_port, ["Alice", "Bob"])
+    q = mp.Queue()
+    processes = [mp.Process(target=run_pipelined_party, args=(addrs, name, delay, pipelined, q)) for name in addrs]
+    [p.start() for p in processes]
+    results = dict(q.get(timeout=60) for _ in processes)
+    [p.join() for p in processes]
+    return results
+
+class CountedOT(OT_using_if.OT):
+    def __init__(self):
+        self.calls = 0
+        super().__init__()
+
+    def __call__(self):
+        self.calls += 1
+        super().__call__()
+
+class Repeat(AbstractProtocol):
+    """
+    Doubles a value as many times as the value of n, so every value of n takes other steps.
+    """
+    protocol_name = "Repeat"
+
+    def party_names(self) -> list[str]:
+        return ["Alice"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["value", "n"]}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["value"]}
+
+    def __call__(self):
+        alice = self.parties["Alice"]
+        for _ in range(alice["n"]):
+            self.compute(alice, "value", lambda: 2 * alice["value"], "2 * value")
+
+class TestCompiled(unittest.TestCase):
+    def test_sum(self):
+        p = Sum(5)
+        for _ in range(5):
+            values = [random.randint(0, 1000) for _ in range(5)]
+            p.set_input({f"party_{i}": {"value": values[i]} for i in range(5)})
+            p.run_compiled()
+            self.assertEqual(p.get_output(), {"party_0": {"sum": sum(values)}})
+
+        self.assertFalse(p.plan.dynamic)
+        # two computations by party_0 at the start and the end, every other party receives, computes and sends
+        self.assertEqual(len(p.plan.root.operations), 4 + 3 * 4 + 1)
+        self.assertIsNone(p.plan.root.guard)
+
+    def test_subroutines(self):
+        p = Accumulate(3)
+        for a in range(5):
+            p.set_input({"Alice": {"a": a}, "Bob": {"b": 1}})
+            p.run_compiled()
+            normal = Accumulate(3)
+            normal.set_input({"Alice": {"a": a}, "Bob": {"b": 1}})
+            normal()
+            self.assertEqual(p.get_output(), normal.get_output())
+
+        # a single operation for every subroutine
+        self.assertEqual(len(p.plan.root.operations), 6)
+
+    def test_multiplication(self):
+        p = BatchSecretShareMultiplication(16)
+        for _ in range(3):
+            a = [random.randint(-1000, 1000) for _ in range(4)]
+            b = [random.randint(-1000, 1000) for _ in range(4)]
+            p.set_input({"Alice": {"a": a}, "Bob": {"b": b}})
+            p.run_compiled()
+            out = p.get_output()
+            self.assertEqual([(x + y) % 2**16 for x, y in zip(out["Alice"]["x"], out["Bob"]["y"])],
+                             [a_j * b_j % 2**16 for a_j, b_j in zip(a, b)])
+        self.assertFalse(p.plan.dynamic)
+
+    def test_branching(self):
+        for module in [OT_using_if, OT_using_methods]:
+            p = module.OT()
+            for b in [0, 1, 1, 0]:
+                p.set_input({"Sender": {"m0": 5, "m1": 9}, "Receiver": {"b": b}})
+                p.run_compiled()
+                self.assertEqual(p.get_output(), {"Receiver": {"mb": 9 if b else 5}})
+
+            self.assertFalse(p.plan.dynamic)
+            root = p.plan.root
+            self.assertEqual(root.guard_read, ("Receiver", "b"))
+            self.assertEqual(set(root.branches.keys()), {0, 1})
+            # the second read of b chooses m'_b, which has the same value in both branches
+            for b, branch in root.branches.items():
+                self.assertEqual(branch.guard_read, ("Receiver", "b"))
+                self.assertEqual(set(branch.branches.keys()), {b})
+
+    def test_branches_are_recorded_once(self):
+        p = CountedOT()
+        for b in [0, 0, 1, 0, 1, 1]:
+            p.set_input({"Sender": {"m0": 5, "m1": 9}, "Receiver": {"b": b}})
+            p.run_compiled()
+            self.assertEqual(p.get_output(), {"Receiver": {"mb": 9 if b else 5}})
+        # __call__ only runs to record the branches of b = 0 and b = 1
+        self.assertEqual(p.calls, 2)
+
+    def test_many_branches(self):
+        p = Repeat()
+        for n in range(MAX_BRANCHES + 4):
+            p.set_input({"Alice": {"value": 3, "n": n}})
+            p.run_compiled()
+            self.assertEqual(p.get_output(), {"Alice": {"value": 3 * 2**n}})
+        self.assertTrue(p.plan.dynamic)
+        self.assertEqual(p.plan.dynamic_read, ("Alice", "n"))
+
+    def test_new_parties(self):
+        p = Sum(3)
+        p.set_input({f"party_{i}": {"value": i} for i in range(3)})
+        p.run_compiled()
+        plan = p.plan
+        # the parties are replaced when the protocol runs as a subroutine, the plan is then recorded again
+        p.set_protocol_parties({name: type(party)(name) for name, party in p.parties.items()})
+        p.set_input({f"party_{i}": {"value": 2 * i} for i in range(3)})
+        p.run_compiled()
+        self.assertIsNot(p.plan, plan)
+        self.assertEqual(p.get_output(), {"party_0": {"sum": 6}})
+
+    def test_distributed(self):
+        names = [f"party_{i}" for i in range(3)]
+        inputs = [{name: {"value": random.randint(0, 1000)} for name in names} for _ in range(4)]
+        results = test_compiled_distributed(Sum, inputs, 15200, init_args=[3])
+        self.assertFalse(any(dynamic for _, dynamic, _ in results.values()))
+        for i, protocol_input in enumerate(inputs):
+            self.assertEqual(results["party_0"][0][i], {"party_0": {"sum": sum(v["value"] for v in protocol_input.values())}})
+
+    def test_distributed_branching(self):
+        inputs = [{"Sender": {"m0": 5, "m1": 9}, "Receiver": {"b": b}} for b in [1, 0, 0, 1]]
+        results = test_compiled_distributed(OT_using_if.OT, inputs, 15210)
+        self.assertEqual(results["Receiver"][0], [{"Receiver": {"mb": 9 if b else 5}} for b in [1, 0, 0, 1]])
+        # only the receiver branches, the plan of the sender has no guards
+        self.assertEqual(results["Receiver"][2], ("Receiver", "b"))
+        self.assertIsNone(results["Sender"][2])
+
+class TestPipelined(unittest.TestCase):
+    def test_simulated(self):
+        p = Sum(5)
+        multiplication = BatchSecretShareMultiplication(16)
+        for _ in range(3):
+            values = [random.randint(0, 1000) for _ in range(5)]
+            p.set_input({f"party_{i}": {"value": values[i]} for i in range(5)})
+            p.run_compiled(pipelined=True)
+            self.assertEqual(p.get_output(), {"party_0": {"sum": sum(values)}})
+
+            a, b = random.randint(0, 1000), random.randint(0, 1000)
+            multiplication.set_input({"Alice": {"a": [a]}, "Bob": {"b": [b]}})
+            multiplication.run_compiled(pipelined=True)
+            out = multiplication.get_output()
+            self.assertEqual((out["Alice"]["x"][0] + out["Bob"]["y"][0]) % 2**16, a * b % 2**16)
+
+    def test_recorded_accesses(self):
+        p = Overlap()
+        p.set_input({"Alice": {"a": 1}})
+        p.run_compiled()
+        alice, bob = p.parties["Alice"], p.parties["Bob"]
+        # the send and receive of a, the computation of b, the send and receive of b and the computations of c and d
+        self.assertEqual(p.plan.root.accesses, [
+            (frozenset({(alice, "a")}), frozenset()),
+            (frozenset(), frozenset({(bob, "a")})),
+            (frozenset({(bob, "a")}), frozenset({(bob, "b")})),
+            (frozenset({(bob, "b")}), frozenset()),
+            (frozenset(), frozenset({(alice, "b")})),
+            (frozenset({(alice, "a"), (alice, "b")}), frozenset({(alice, "c")})),
+            (frozenset({(alice, "a")}), frozenset({(alice, "d")})),
+        ])
+
+    def test_overlap(self):
+        delay = 0.3
+        sequential = test_pipelined_distributed(delay, False, 15220)
+        pipelined = test_pipelined_distributed(delay, True, 15230)
+        for results in [sequential, pipelined]:
+            self.assertEqual([output for output, _, _ in results["Alice"]], [{"Alice": {"c": 2 * a + 1, "d": 2 * a}} for a in range(3)])
+
+        # the replays after the first run, Alice computes d while Bob computes b
+        for _, duration, wait_time in sequential["Alice"][1:]:
+            self.assertGreater(duration, 2 * delay)
+            self.assertGreater(wait_time, 0.5 * delay)
+        for _, duration, wait_time in pipelined["Alice"][1:]:
+            self.assertLess(duration, 1.6 * delay)
+            self.assertLess(wait_time, 0.5 * delay)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol, CompressionSettings, CompressionAlgorithm
+from SMPCbox.Compression import ConnectionCompressor, compress, decompress, decompress_chunks, lz4_frame
+from SMPCbox.exceptions import CompressionUnavailable
+import os
+import unittest
+from test_input import test_distributed
+
+class SendMany(AbstractProtocol):
+    protocol_name = "SendMany"
+
+    def party_names(self) -> list[str]:
+        return ["Alice", "Bob"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["small", "large", "random"]}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Bob": ["small", "large", "random"]}
+
+    def __call__(self):
+        for var in ["small", "large", "random"]:
+            self.send_variables(self.parties["Alice"], self.parties["Bob"], var)
+
+class TestCompression(unittest.TestCase):
+    def test_round_trip(self):
+        data = b"abc" * 1000
+        self.assertEqual(decompress(CompressionAlgorithm.ZLIB, compress(CompressionAlgorithm.ZLIB, data)), data)
+        if lz4_frame is not None:
+            self.assertEqual(decompress(CompressionAlgorithm.LZ4, compress(CompressionAlgorithm.LZ4, data)), data)
+        else:
+            with self.assertRaises(CompressionUnavailable):
+                CompressionSettings(CompressionAlgorithm.LZ4)
+
+    def test_decompress_chunks(self):
+        data = b"abc" * 100000
+        algorithms = [CompressionAlgorithm.ZLIB] + ([CompressionAlgorithm.LZ4] if lz4_frame is not None else [])
+        for algorithm in algorithms:
+            chunks = list(decompress_chunks(algorithm, compress(algorithm, data), 4096))
+            self.assertTrue(all(len(chunk) <= 4096 for chunk in chunks))
+            self.assertEqual(b"".join(chunks), data)
+
+    def test_adaptive(self):
+        compressor = ConnectionCompressor(CompressionSettings(min_size=100, probe_interval=3))
+        self.assertFalse(compressor.should_compress(50))
+        self.assertTrue(compressor.should_compress(200))
+
+        # incompressible data disables compression untill the next probe
+        compressor.update(200, 210)
+        self.assertFalse(compressor.should_compress(200))
+        self.assertFalse(compressor.should_compress(200))
+        self.assertTrue(compressor.should_compress(200))
+        compressor.update(200, 20)
+        self.assertTrue(compressor.should_compress(200))
+
+    def test_distributed(self):
+        input = {"Alice": {"small": [1, 2], "large": [7] * 5000, "random": os.urandom(5000)}}
+        out = test_distributed(SendMany, input, 14000, address_kwargs={"compression": CompressionSettings(min_size=256)}, return_statistics=True)
+        for var, value in input["Alice"].items():
+            self.assertEqual(out["Bob"][var], value)
+
+        stats = out["Alice"]["statistics"]
+        self.assertGreater(stats.uncompressed_bytes_send, 40000)
+        # the large list is compressed, the small list and random bytes are not
+        self.assertLess(stats.compressed_bytes_send, 5300)
+
+    def test_compressed_bytes(self):
+        # bytes which do compress are decoded from the decompressed message
+        input = {"Alice": {"small": b"a", "large": b"a" * 5000, "random": bytearray(b"b" * 5000)}}
+        out = test_distributed(SendMany, input, 14004, address_kwargs={"compression": CompressionSettings(min_size=256)}, return_statistics=True)
+        for var, value in input["Alice"].items():
+            self.assertEqual(out["Bob"][var], value)
+        self.assertLess(out["Alice"]["statistics"].compressed_bytes_send, 1000)
+
+    def test_no_compression(self):
+        input = {"Alice": {"small": [1, 2], "large": [7] * 5000, "random": b""}}
+        out = test_distributed(SendMany, input, 14002, return_statistics=True)
+        stats = out["Alice"]["statistics"]
+        self.assertEqual(stats.uncompressed_bytes_send, stats.compressed_bytes_send)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.OTExtension import OTExtension
+import testOT
+import random
+import unittest
+from test_input import test_distributed, test_simulated
+
+class TestOTExtension(unittest.TestCase):
+    def expected(self, m0, m1, b, modulus=2**256):
+        return (m0 if b == 0 else m1) % modulus
+
+    def test_single_transfers(self):
+        for input in testOT.TestOT.cases(self):
+            out = test_simulated(OTExtension, input)
+            self.assertEqual(out["Receiver"]["mb"], self.expected(input["Sender"]["m0"], input["Sender"]["m1"], input["Receiver"]["b"]))
+
+    def test_batch(self):
+        for n in [0, 1, 7, 8, 1000]:
+            m0 = [random.randint(-2**40, 2**40) for _ in range(n)]
+            m1 = [random.randint(-2**40, 2**40) for _ in range(n)]
+            b = [random.randint(0, 1) for _ in range(n)]
+            out = test_simulated(OTExtension, {"Sender": {"m0": m0, "m1": m1}, "Receiver": {"b": b}}, init_args=[2**64])
+            self.assertEqual(out["Receiver"]["mb"], [self.expected(*values, 2**64) for values in zip(m0, m1, b)])
+
+    def test_distributed(self):
+        n = 500
+        m0 = [random.getrandbits(32) for _ in range(n)]
+        m1 = [random.getrandbits(32) for _ in range(n)]
+        b = [random.randint(0, 1) for _ in range(n)]
+        out = test_distributed(OTExtension, {"Sender": {"m0": m0, "m1": m1}, "Receiver": {"b": b}}, 14870)
+        self.assertEqual(out["Receiver"]["mb"], [self.expected(*values) for values in zip(m0, m1, b)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.SecureAggregation import SecureAggregation, share_secret, reconstruct_secret
+import random
+import unittest
+from test_input import test_distributed, test_simulated
+
+class CrashingAggregation(SecureAggregation):
+    """
+    party_1 crashes before sending its masked input, the server only notices because the input never arrives.
+    """
+    def send_variables(self, sending_party, receiving_party, variables):
+        if sending_party.name == "party_1" and sending_party.is_local() and variables == "masked_1":
+            raise SystemExit()
+        super().send_variables(sending_party, receiving_party, variables)
+
+class TestSecureAggregation(unittest.TestCase):
+    def create_input(self, n, vector_length=1):
+        if vector_length == 1:
+            return {f"party_{i}": {"value": random.randint(-1000, 1000)} for i in range(n)}
+        return {f"party_{i}": {"value": [random.randint(-1000, 1000) for _ in range(vector_length)]} for i in range(n)}
+
+    def expected(self, input, dropped):
+        values = [party["value"] for name, party in input.items() if name not in dropped]
+        if values and isinstance(values[0], list):
+            return [sum(column) for column in zip(*values)]
+        return sum(values)
+
+    def test_shamir(self):
+        shares = share_secret(123456789, list(range(1, 8)), 4)
+        self.assertEqual(reconstruct_secret({x: shares[x] for x in [2, 3, 5, 7]}), 123456789)
+        self.assertNotEqual(reconstruct_secret({x: shares[x] for x in [2, 3, 5]}), 123456789)
+
+    def test_no_dropouts(self):
+        for n in [2, 3, 10, 40]:
+            input = self.create_input(n)
+            out = test_simulated(SecureAggregation, input, init_args=[n])
+            self.assertEqual(out["server"]["sum"], self.expected(input, []))
+            self.assertEqual(out["server"]["survivors"], list(range(n)))
+
+    def test_dropouts(self):
+        n = 60
+        # every fifth client drops out, such that each client keeps enough of its 14 neighbours to reconstruct its masks
+        dropped = [f"party_{i}" for i in range(random.randrange(5), n, 5)]
+        input = self.create_input(n, vector_length=5)
+        out = test_simulated(SecureAggregation, input, init_args=[n, 5, 2**64, None, None, dropped])
+        self.assertEqual(out["server"]["sum"], self.expected(input, dropped))
+        self.assertEqual(len(out["server"]["survivors"]), n - 12)
+
+    def test_too_many_dropouts(self):
+        # all neighbours of party_5 drop out, so there are not enough shares to remove its pairwise masks
+        protocol = SecureAggregation(30, num_neighbours=4, dropouts=["party_3", "party_4", "party_5", "party_6", "party_7"])
+        protocol.set_input(self.create_input(30))
+        with self.assertRaises(RuntimeError):
+            protocol()
+
+    def test_distributed(self):
+        input = self.create_input(5)
+        out = test_distributed(SecureAggregation, input, 14700, init_args=[5, 1, 2**64, None, None, ["party_2"]])
+        self.assertEqual(out["server"]["sum"], self.expected(input, ["party_2"]))
+
+    def test_distributed_crash(self):
+        input = self.create_input(5)
+        out = test_distributed(CrashingAggregation, input, 14710, init_args=[5, 1, 2**64, None, None, [], 1])
+        self.assertEqual(out["server"]["survivors"], [0, 2, 3, 4])
+        self.assertEqual(out["server"]["sum"], self.expected(input, ["party_1"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.SecureLinearAlgebra import SecureMatrixVector, SecureInnerProduct
+from implementedProtocols.SimplestOT import SimplestOT
+import numpy
+import unittest
+from test_input import test_distributed, test_simulated
+
+class TestSecureLinearAlgebra(unittest.TestCase):
+    def share(self, value):
+        share = numpy.random.randint(-2**40, 2**40, size=numpy.shape(value))
+        return share, value - share
+
+    def create_input(self, A, x):
+        (A_alice, A_bob), (x_alice, x_bob) = self.share(A), self.share(x)
+        return {"Alice": {"A": A_alice, "x": x_alice}, "Bob": {"A": A_bob, "x": x_bob}}
+
+    def reconstruct(self, output, l):
+        return [int(a + b) % 2**l for a, b in zip(numpy.atleast_1d(output["Alice"]["y"]), numpy.atleast_1d(output["Bob"]["y"]))]
+
+    def expected(self, A, x, l):
+        # computed with python integers, so the expected values don't overflow
+        return [sum(int(a) * int(b) for a, b in zip(row, x)) % 2**l for row in numpy.atleast_2d(A)]
+
+    def test_matrix_vector(self):
+        for rows, columns, l in [(1, 1, 32), (5, 3, 32), (20, 30, 16), (7, 9, 64)]:
+            A = numpy.random.randint(-1000, 1000, size=(rows, columns))
+            x = numpy.random.randint(-1000, 1000, size=columns)
+            out = test_simulated(SecureMatrixVector, self.create_input(A, x), init_args=[rows, columns, l])
+            self.assertEqual(self.reconstruct(out, l), self.expected(A, x, l))
+
+    def test_simplest_ot(self):
+        A = numpy.random.randint(-1000, 1000, size=(4, 3))
+        x = numpy.random.randint(-1000, 1000, size=3)
+        out = test_simulated(SecureMatrixVector, self.create_input(A, x), init_args=[4, 3, 16, SimplestOT])
+        self.assertEqual(self.reconstruct(out, 16), self.expected(A, x, 16))
+
+    def test_inner_product(self):
+        a = numpy.random.randint(-1000, 1000, size=50)
+        x = numpy.random.randint(-1000, 1000, size=50)
+        input = self.create_input(a, x)
+        input = {party: {"a": values["A"], "x": values["x"]} for party, values in input.items()}
+        out = test_simulated(SecureInnerProduct, input, init_args=[50])
+        self.assertIsInstance(out["Alice"]["y"], int)
+        self.assertEqual(self.reconstruct(out, 32), self.expected(a, x, 32))
+
+    def test_distributed(self):
+        A = numpy.random.randint(-1000, 1000, size=(30, 20))
+        x = numpy.random.randint(-1000, 1000, size=20)
+        out = test_distributed(SecureMatrixVector, self.create_input(A, x), 14890, init_args=[30, 20])
+        self.assertEqual(self.reconstruct(out, 32), self.expected(A, x, 32))
+
+if __name__ == "__main__":
+    unittest.main()
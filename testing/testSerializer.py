@@ -0,0 +1,105 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol, Serializer, register_type
+from SMPCbox.exceptions import UnserializableValue, UnknownSerializerTag
+from implementedProtocols.List import CustomList
+import numpy as np
+import unittest
+from test_input import test_distributed
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other):
+        return isinstance(other, Point) and (self.x, self.y) == (other.x, other.y)
+
+register_type(Point, "Point", lambda p: (p.x, p.y), lambda xy: Point(*xy))
+
+class Echo(AbstractProtocol):
+    protocol_name = "Echo"
+
+    def party_names(self) -> list[str]:
+        return ["Alice", "Bob"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["value"]}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Bob": ["value"]}
+
+    def __call__(self):
+        self.send_variables(self.parties["Alice"], self.parties["Bob"], "value")
+
+class TestSerializer(unittest.TestCase):
+    def values(self):
+        return [0, -1, 2**70, -2**70, 1.5, True, None, "text", b"\x00\xff", bytearray(b"ab"),
+                (1, "a"), [1, [2, [3]]], {"a": 1, 2: [b"b"]}, Point(1, -2), CustomList("[1, 2, 3]")]
+
+    def test_round_trip(self):
+        serializer = Serializer()
+        serializer.register(Point, "Point", lambda p: (p.x, p.y), lambda xy: Point(*xy))
+        serializer.register(CustomList, "CustomList", list, lambda items: CustomList(str(items)))
+        for value in self.values():
+            decoded = serializer.loads(serializer.dumps(value))
+            self.assertEqual(decoded, value)
+            self.assertEqual(type(decoded), type(value))
+
+    def test_numpy(self):
+        serializer = Serializer()
+        for array in [np.arange(12, dtype=np.int64).reshape(3, 4), np.zeros((0,)), np.array([[1.5]], dtype=">f4"),
+                      np.arange(10)[::2], np.array(3)]:
+            decoded = serializer.loads(serializer.dumps(array))
+            self.assertEqual(decoded.dtype, array.dtype)
+            self.assertTrue(np.array_equal(decoded, array))
+            # the decoded array does not share memory with the received message
+            self.assertTrue(decoded.flags.writeable)
+
+    def test_large_ints(self):
+        serializer = Serializer()
+        for value in [2**63, -2**63, 2**63 - 1, -2**63 - 1, 2**2048 - 5, -(2**2048), [2**70, -1, 0], list(range(-500, 500))]:
+            decoded = serializer.loads(serializer.dumps(value))
+            self.assertEqual(decoded, value)
+        # a list of small ints is packed in 8 bytes per int
+        self.assertLess(len(serializer.dumps(list(range(1000)))), 8100)
+
+    def test_numpy_dtypes(self):
+        serializer = Serializer()
+        structured = np.zeros(2, dtype=[("a", "i4"), ("b", "f8")])
+        structured["a"] = [1, 2]
+        decoded = serializer.loads(serializer.dumps(structured))
+        self.assertEqual(decoded.dtype.names, ("a", "b"))
+        self.assertEqual(list(decoded["a"]), [1, 2])
+
+        for array in [np.array(["2020-01-01", "2021-06-30"], dtype="datetime64[D]"), np.array([1, 2], dtype="timedelta64[s]")]:
+            decoded = serializer.loads(serializer.dumps(array))
+            self.assertEqual(decoded.dtype, array.dtype)
+            self.assertTrue(np.array_equal(decoded, array))
+
+    def test_errors(self):
+        serializer = Serializer()
+        with self.assertRaises(UnserializableValue):
+            serializer.dumps(Point(1, 2))
+        with self.assertRaises(UnknownSerializerTag):
+            Serializer().loads(self.default_dumps(Point(1, 2)))
+
+    def default_dumps(self, value):
+        from SMPCbox.Serializer import default_serializer
+        return default_serializer.dumps(value)
+
+    def test_distributed(self):
+        port = 13500
+        values = self.values() + [np.arange(5000, dtype=np.int32)]
+        for value in values:
+            out = test_distributed(Echo, {"Alice": {"value": value}}, port)
+            received = out["Bob"]["value"]
+            if isinstance(value, np.ndarray):
+                self.assertTrue(np.array_equal(received, value))
+            else:
+                self.assertEqual(received, value)
+            port += 2
+
+if __name__ == "__main__":
+    unittest.main()
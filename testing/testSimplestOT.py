@@ -0,0 +1,59 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.SimplestOT import SimplestOT, add_points, scalar_key, random_scalar, encode_point, P256_ORDER
+from implementedProtocols.MultiplicationProtocol import SecretShareMultiplication
+from implementedProtocols.OT import OT
+import testOT
+import unittest
+from test_input import test_distributed, test_simulated
+
+class TestSimplestOT(unittest.TestCase):
+    def cases(self):
+        # the same cases as the RSA based OT
+        return testOT.TestOT.cases(self)
+
+    def check_output(self, input, output, modulus=2**256):
+        expected = input["Sender"]["m0"] if input["Receiver"]["b"] == 0 else input["Sender"]["m1"]
+        self.assertEqual(output["Receiver"]["mb"], expected % modulus)
+
+    def test_add_points(self):
+        a, b = random_scalar(), random_scalar()
+        A, B = scalar_key(a).public_key(), scalar_key(b).public_key()
+        self.assertEqual(encode_point(add_points(A, B)), encode_point(scalar_key((a + b) % P256_ORDER).public_key()))
+        self.assertEqual(encode_point(add_points(A, B, negate_Q=True)), encode_point(scalar_key((a - b) % P256_ORDER).public_key()))
+        self.assertEqual(encode_point(add_points(A, A)), encode_point(scalar_key(2 * a % P256_ORDER).public_key()))
+        with self.assertRaises(ValueError):
+            add_points(A, A, negate_Q=True)
+
+    def test_cases_simulated(self):
+        for input in self.cases():
+            self.check_output(input, test_simulated(SimplestOT, input))
+        input = {"Sender": {"m0": 2**70 + 5, "m1": -3}, "Receiver": {"b": 1}}
+        self.check_output(input, test_simulated(SimplestOT, input, init_args=[2**64]), 2**64)
+
+    def test_cases_distributed(self):
+        start_port = 14800
+        for input in self.cases()[:10]:
+            self.check_output(input, test_distributed(SimplestOT, input, start_port))
+            start_port += 2
+
+    def test_batched_transfers(self):
+        cases = self.cases()
+        input = {"Sender": {"m0": [case["Sender"]["m0"] for case in cases], "m1": [case["Sender"]["m1"] for case in cases]},
+                 "Receiver": {"b": [case["Receiver"]["b"] for case in cases]}}
+        out = test_simulated(SimplestOT, input)
+        self.assertEqual(out["Receiver"]["mb"], [(case["Sender"]["m0"] if case["Receiver"]["b"] == 0 else case["Sender"]["m1"]) % 2**256 for case in cases])
+
+        out = test_distributed(OT, input, 14830, extra_return_vars={"Sender": ["N"]})
+        N = out["Sender"]["N"]
+        self.assertEqual(out["Receiver"]["mb"], [(case["Sender"]["m0"] if case["Receiver"]["b"] == 0 else case["Sender"]["m1"]) % N for case in cases])
+
+    def test_multiplication(self):
+        for a, b, l in [(57, -123, 32), (-999, 1583, 45), (147258 ** 12, -963852 ** 11, 32)]:
+            input = {"Alice": {"a": a}, "Bob": {"b": b}}
+            out = test_simulated(SecretShareMultiplication, input, init_args=[l, SimplestOT])
+            self.assertEqual((out["Alice"]["x"] + out["Bob"]["y"]) % 2**l, a * b % 2**l)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol, CompressionSettings, TransportConfig
+from SMPCbox.SMPCSocket import split_chunks
+from SMPCbox.Serializer import SegmentedBuffer, default_serializer
+import numpy as np
+import os
+import tempfile
+import threading
+import unittest
+from test_input import test_distributed, get_addresses
+from testTLS import create_pki
+
+class SendLarge(AbstractProtocol):
+    protocol_name = "SendLarge"
+
+    def party_names(self) -> list[str]:
+        return ["Alice", "Bob", "Charlie"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["array", "data", "small"]}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Bob": ["array", "data", "small"], "Charlie": ["array"]}
+
+    def __call__(self):
+        self.send_variables(self.parties["Alice"], self.parties["Bob"], ["data", "small"])
+        self.broadcast_variables(self.parties["Alice"], "array")
+
+class TLSSendLarge(SendLarge):
+    settings = {}
+
+    def set_party_addresses(self, addresses, local_party_name, **kwargs):
+        super().set_party_addresses(addresses, local_party_name, tls=self.settings[local_party_name], **kwargs)
+
+def run_in_threads(input, start_port, **kwargs):
+    """
+    Runs SendLarge with every party in its own thread, such that the received values can be inspected without being pickled.
+    """
+    addresses = get_addresses(start_port, SendLarge().party_names())
+    protocols = {name: SendLarge() for name in addresses}
+    for protocol in protocols.values():
+        protocol.set_input(input)
+
+    threads = [threading.Thread(target=protocols[name].set_party_addresses, args=(addresses, name), kwargs=kwargs) for name in protocols]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    threads = [threading.Thread(target=protocol) for protocol in protocols.values()]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+    output = {}
+    for name, protocol in protocols.items():
+        output.update(protocol.get_output())
+    for protocol in protocols.values():
+        protocol.terminate_protocol()
+    return output
+
+def get_input():
+    return {"Alice": {"array": np.arange(100000, dtype=np.int64).reshape(1000, 100), "data": os.urandom(300000), "small": 5}}
+
+class TestStreaming(unittest.TestCase):
+    def check_output(self, out, input):
+        self.assertTrue(np.array_equal(out["Bob"]["array"], input["Alice"]["array"]))
+        self.assertTrue(np.array_equal(out["Charlie"]["array"], input["Alice"]["array"]))
+        self.assertEqual(out["Bob"]["data"], input["Alice"]["data"])
+        self.assertEqual(out["Bob"]["small"], 5)
+
+    def test_segmented_buffer(self):
+        value = [np.arange(1000), b"x" * 200, 5, "hi"]
+        out = SegmentedBuffer(100)
+        default_serializer.encode(out, value)
+        # the array and the bytes are not copied into the buffer
+        self.assertEqual(len(out.segments), 2)
+        self.assertLess(len(out), 100)
+        decoded = default_serializer.loads(out.join())
+        self.assertTrue(np.array_equal(decoded[0], value[0]))
+        self.assertEqual(decoded[1:], value[1:])
+
+    def test_split_chunks(self):
+        views = [memoryview(b"abcde"), memoryview(b"fg"), memoryview(b"hijklmn")]
+        chunks = split_chunks(views, 4)
+        self.assertEqual([b"".join(chunk) for chunk in chunks], [b"abcd", b"efgh", b"ijkl", b"mn"])
+
+    def test_stream(self):
+        input = get_input()
+        for i, window in enumerate([1, 4]):
+            config = TransportConfig(stream_threshold=1 << 16, chunk_size=1 << 14, stream_window=window)
+            out = test_distributed(SendLarge, input, 14400 + 10 * i, address_kwargs={"transport": config})
+            self.check_output(out, input)
+
+    def test_stream_compressed(self):
+        input = get_input()
+        config = TransportConfig(stream_threshold=1 << 16, chunk_size=1 << 14)
+        out = test_distributed(SendLarge, input, 14420, address_kwargs={"transport": config, "compression": CompressionSettings()},
+                               return_statistics=True)
+        self.check_output(out, input)
+        stats = out["Alice"]["statistics"]
+        self.assertLess(stats.compressed_bytes_send, stats.uncompressed_bytes_send)
+
+    def test_stream_tls(self):
+        with tempfile.TemporaryDirectory() as directory:
+            TLSSendLarge.settings = create_pki(directory, "ca", ["Alice", "Bob", "Charlie"])
+            input = get_input()
+            config = TransportConfig(stream_threshold=1 << 16, chunk_size=1 << 14, stream_window=2)
+            out = test_distributed(TLSSendLarge, input, 14430, address_kwargs={"transport": config})
+            self.check_output(out, input)
+
+    def test_spill(self):
+        input = get_input()
+        with tempfile.TemporaryDirectory() as directory:
+            config = TransportConfig(stream_threshold=1 << 16, chunk_size=1 << 14, spill_threshold=1 << 16, spill_directory=directory)
+            out = run_in_threads(input, 14440, transport=config)
+            self.check_output(out, input)
+            # the large values are read-only views on the memory mapped file
+            self.assertFalse(out["Bob"]["array"].flags.writeable)
+            self.assertTrue(isinstance(out["Bob"]["data"], memoryview))
+            self.assertTrue(out["Bob"]["data"].readonly)
+            self.assertEqual(out["Bob"]["small"], 5)
+
+    def test_spill_compressed(self):
+        input = get_input()
+        input["Alice"]["data"] = b"a" * 300000
+        config = TransportConfig(stream_threshold=1 << 8, chunk_size=1 << 14, spill_threshold=1 << 16)
+        out = run_in_threads(input, 14450, transport=config, compression=CompressionSettings())
+        self.check_output(out, input)
+        self.assertTrue(isinstance(out["Bob"]["data"], memoryview))
+        self.assertFalse(out["Charlie"]["array"].flags.writeable)
+
+if __name__ == "__main__":
+    unittest.main()
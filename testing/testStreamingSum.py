@@ -0,0 +1,60 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox.InputStream import InputStream
+from implementedProtocols.StreamingSum import StreamingSum
+import unittest
+from test_input import test_distributed, test_simulated
+
+class SmallChunkSum(StreamingSum):
+    def set_input(self, inputs, chunk_size=7):
+        super().set_input(inputs, chunk_size)
+
+class TestStreamingSum(unittest.TestCase):
+    def cases(self):
+        # the number of values of each party, including inputs which are an exact multiple of the chunk size and empty inputs
+        return [
+            [1, 1],
+            [7, 14, 0],
+            [50, 3, 21, 8],
+            [0, 0],
+        ]
+
+    def create_case(self, lengths):
+        return {f"party_{i}": {"value": range(i * 1000, i * 1000 + length)} for i, length in enumerate(lengths)}
+
+    def expected(self, input):
+        return sum(sum(party["value"]) for party in input.values())
+
+    def test_input_stream(self):
+        stream = InputStream((i for i in range(20)), 8)
+        self.assertEqual(stream.get_chunk(), list(range(8)))
+        self.assertFalse(stream.exhausted)
+        self.assertEqual(stream.get_chunk(), list(range(8, 16)))
+        self.assertEqual(stream.get_chunk(), list(range(16, 20)))
+        self.assertTrue(stream.exhausted)
+        self.assertEqual(stream.get_chunk(), [])
+
+    def test_simulated(self):
+        for lengths in self.cases():
+            input = self.create_case(lengths)
+            out = test_simulated(SmallChunkSum, input, init_args=[len(lengths)])
+            self.assertEqual(out["party_0"]["sum"], self.expected(input))
+
+    def test_generator(self):
+        # a generator is never fully loaded into memory
+        protocol = StreamingSum(2)
+        protocol.set_input({"party_0": {"value": (i for i in range(100000))}, "party_1": {"value": iter([5])}}, chunk_size=1000)
+        protocol()
+        self.assertEqual(protocol.get_output()["party_0"]["sum"], sum(range(100000)) + 5)
+
+    def test_distributed(self):
+        start_port = 14500
+        for lengths in self.cases():
+            input = self.create_case(lengths)
+            out = test_distributed(SmallChunkSum, input, start_port, init_args=[len(lengths)])
+            self.assertEqual(out["party_0"]["sum"], self.expected(input))
+            start_port += len(lengths)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import AbstractProtocol, InvalidProtocolInput
+import unittest
+from test_input import test_distributed, test_simulated
+
+class Add(AbstractProtocol):
+    protocol_name = "Add"
+
+    def party_names(self) -> list[str]:
+        return ["Sender", "Receiver"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Sender": ["value"], "Receiver": ["value"]}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Receiver": ["sum"]}
+
+    def __call__(self):
+        sender, receiver = self.parties["Sender"], self.parties["Receiver"]
+        self.compute(sender, "sent", lambda: sender["value"], "value")
+        self.send_variables(sender, receiver, "sent")
+        self.compute(receiver, "sum", lambda: receiver["value"] + receiver["sent"], "value + sent")
+
+class Accumulate(AbstractProtocol):
+    """
+    Runs Add repeatedly in both directions, the same subroutine plans are reused for every round.
+    """
+    protocol_name = "Accumulate"
+
+    def __init__(self, rounds: int = 5):
+        self.rounds = rounds
+        super().__init__()
+
+    def party_names(self) -> list[str]:
+        return ["Alice", "Bob"]
+
+    def input_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["a"], "Bob": ["b"]}
+
+    def output_variables(self) -> dict[str, list[str]]:
+        return {"Alice": ["a"], "Bob": ["b"]}
+
+    def __call__(self):
+        alice, bob = self.parties["Alice"], self.parties["Bob"]
+        for _ in range(self.rounds):
+            self.run_subroutine_protocol(Add(), {"Sender": alice, "Receiver": bob}, {"Sender": {"value": "a"}, "Receiver": {"value": "b"}},
+                                         {"Receiver": {"sum": "b"}})
+            self.run_subroutine_protocol(Add(), {"Sender": bob, "Receiver": alice}, {"Sender": {"value": "b"}, "Receiver": {"value": "a"}},
+                                         {"Receiver": {"sum": "a"}})
+
+class TestSubroutine(unittest.TestCase):
+    def test_plans_are_reused(self):
+        protocol = Accumulate(5)
+        protocol.set_input({"Alice": {"a": 1}, "Bob": {"b": 1}})
+        protocol()
+        # one plan for each direction
+        self.assertEqual(len(protocol.subroutine_plans), 2)
+        # the values are consecutive fibonacci numbers
+        self.assertEqual(protocol.get_output(), {"Alice": {"a": 144}, "Bob": {"b": 89}})
+
+    def test_names_of_parties(self):
+        protocol = Accumulate(1)
+        alice = protocol.parties["Alice"]
+        self.assertEqual(protocol.get_name_of_party(alice), "Alice")
+        roles = {"Sender": alice, "Receiver": protocol.parties["Bob"]}
+        add = Add()
+        add.set_protocol_parties(roles)
+        self.assertEqual(add.get_name_of_party(alice), "Sender")
+
+    def test_invalid_input(self):
+        class InvalidInput(Accumulate):
+            def __call__(self):
+                alice, bob = self.parties["Alice"], self.parties["Bob"]
+                self.run_subroutine_protocol(Add(), {"Sender": alice, "Receiver": bob}, {"Sender": {"other": "a"}, "Receiver": {"value": "b"}},
+                                             {"Receiver": {"sum": "b"}})
+
+        protocol = InvalidInput()
+        protocol.set_input({"Alice": {"a": 1}, "Bob": {"b": 1}})
+        with self.assertRaises(InvalidProtocolInput):
+            protocol()
+
+    def test_distributed(self):
+        out = test_distributed(Accumulate, {"Alice": {"a": 3}, "Bob": {"b": 2}}, 14900, init_args=[3])
+        self.assertEqual(out, test_simulated(Accumulate, {"Alice": {"a": 3}, "Bob": {"b": 2}}, init_args=[3]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import TLSSettings
+from implementedProtocols.Sum import Sum
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+import datetime
+import os
+import tempfile
+import threading
+import unittest
+from test_input import test_distributed, get_addresses
+
+def create_certificate(name, issuer_name, issuer_key, key, is_ca):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return (x509.CertificateBuilder()
+            .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, name)]))
+            .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer_name)]))
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(x509.BasicConstraints(ca=is_ca, path_length=None), critical=True)
+            .sign(issuer_key, hashes.SHA256()))
+
+def write_pem(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def create_pki(directory, ca_name, party_names):
+    """
+    Creates a CA and a certificate for every party, returns the TLSSettings of each party.
+    """
+    ca_key = ec.generate_private_key(ec.SECP256R1())
+    ca_cert = create_certificate(ca_name, ca_name, ca_key, ca_key, True)
+    cafile = os.path.join(directory, f"{ca_name}.pem")
+    write_pem(cafile, ca_cert.public_bytes(serialization.Encoding.PEM))
+
+    settings = {}
+    for name in party_names:
+        key = ec.generate_private_key(ec.SECP256R1())
+        cert = create_certificate(name, ca_name, ca_key, key, False)
+        certfile = os.path.join(directory, f"{ca_name}_{name}.pem")
+        keyfile = os.path.join(directory, f"{ca_name}_{name}.key")
+        write_pem(certfile, cert.public_bytes(serialization.Encoding.PEM))
+        write_pem(keyfile, key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+        settings[name] = TLSSettings(certfile, keyfile, cafile)
+    return settings
+
+class TLSSum(Sum):
+    """
+    The sum protocol which picks the TLS settings of the local party from a class attribute.
+    """
+    settings: dict[str, TLSSettings] = {}
+
+    def set_party_addresses(self, addresses, local_party_name, **kwargs):
+        super().set_party_addresses(addresses, local_party_name, tls=self.settings[local_party_name], **kwargs)
+
+class TestTLS(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_distributed(self):
+        parties = [f"party_{i}" for i in range(3)]
+        TLSSum.settings = create_pki(self.directory.name, "ca", parties)
+        input = {name: {"value": i} for i, name in enumerate(parties)}
+        out = test_distributed(TLSSum, input, 14100, init_args=[3], return_statistics=True)
+        self.assertEqual(out["party_0"]["sum"], 3)
+        self.assertGreater(out["party_0"]["statistics"].tls_handshake_time, 0)
+        self.assertGreater(out["party_0"]["statistics"].tls_crypto_time, 0)
+
+    def test_unknown_ca(self):
+        parties = ["party_0", "party_1"]
+        settings = create_pki(self.directory.name, "ca", parties)
+        # party_1 has a certificate which is not signed by the CA party_0 trusts
+        settings["party_1"] = create_pki(self.directory.name, "other_ca", ["party_1"])["party_1"]
+        TLSSum.settings = settings
+        out = test_distributed(TLSSum, {"party_0": {"value": 1}, "party_1": {"value": 2}}, 14110, init_args=[2])
+        self.assertNotIn("party_0", out)
+
+    def test_session_resumption(self):
+        parties = ["party_0", "party_1"]
+        settings = create_pki(self.directory.name, "ca", parties)
+
+        def run(start_port):
+            protocols = {name: Sum(2) for name in parties}
+            addresses = get_addresses(start_port, parties)
+            for i, name in enumerate(parties):
+                protocols[name].set_input({name: {"value": i}})
+            threads = [threading.Thread(target=protocols[name].set_party_addresses, args=(addresses, name), kwargs={"tls": settings[name]})
+                       for name in parties]
+            [t.start() for t in threads]
+            [t.join() for t in threads]
+            threads = [threading.Thread(target=protocols[name]) for name in parties]
+            [t.start() for t in threads]
+            [t.join() for t in threads]
+
+            socket = protocols["party_0"].parties["party_0"].socket
+            reused = [connection.session_reused for connection in socket.connections.values()]
+            for protocol in protocols.values():
+                protocol.terminate_protocol()
+            return reused
+
+        self.assertEqual(run(14120), [False])
+        self.assertEqual(run(14120), [True])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.Sum import Sum
+from implementedProtocols.OT import OT
+from implementedProtocols.MultiplicationProtocol import SecretShareMultiplication
+import unittest
+from test_input import test_distributed
+
+def make_distributed(protocol):
+    # setting the address is what makes a party non local, no connections are made
+    for i, party in enumerate(protocol.parties.values()):
+        party.socket.set_address(f"127.0.0.1:{15000 + i}")
+    return protocol
+
+class TestTopology(unittest.TestCase):
+    def test_declared_ring(self):
+        edges = Sum(4).get_communication_edges()
+        self.assertEqual(edges, {("party_0", "party_1"), ("party_1", "party_2"), ("party_2", "party_3"), ("party_3", "party_0")})
+
+    def test_inferred(self):
+        edges = make_distributed(OT()).get_communication_edges()
+        self.assertEqual(edges, {("Sender", "Receiver"), ("Receiver", "Sender")})
+
+    def test_inferred_through_subroutines(self):
+        edges = make_distributed(SecretShareMultiplication(l=4)).get_communication_edges()
+        self.assertEqual(edges, {("Alice", "Bob"), ("Bob", "Alice")})
+
+    def test_no_dry_run_for_local_parties(self):
+        # simulated parties are local, running the protocol would execute the computations
+        self.assertIsNone(OT().get_communication_edges())
+
+    def test_dry_run_errors_surface(self):
+        # only local variable accesses end the dry run silently, other errors are bugs in the protocol
+        class Broken(Sum):
+            def __call__(self):
+                raise ValueError("bug")
+
+        with self.assertRaises(ValueError):
+            make_distributed(Broken(3)).trace_communication()
+
+    def test_lazy_connection(self):
+        # with an empty topology every connection has to be opened on the first send
+        class PartialRing(Sum):
+            def communication_topology(self):
+                return {name: [] for name in self.party_names()}
+
+        input = {f"party_{i}": {"value": i} for i in range(4)}
+        out = test_distributed(PartialRing, input, 15100, init_args=[4])
+        self.assertEqual(out["party_0"]["sum"], 6)
+
+if __name__ == "__main__":
+    unittest.main()
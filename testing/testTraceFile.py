@@ -0,0 +1,124 @@
+import sys
+sys.path.append('../')
+sys.path.append('../implementedProtocols')
+
+from Sum import Sum
+from testSubroutine import Accumulate
+from SMPCbox import TrackedStatistics
+from SMPCbox.CommunicationLayer import Step
+from SMPCbox.TraceFile import TraceRecorder, TraceReader, TraceQueue, INDEX_INTERVAL, INDEX_SUFFIX
+from SMPCbox.exceptions import InvalidTraceFile
+import unittest
+import tempfile
+import os
+import queue
+
+def record(path: str, protocol, protocol_input: dict, runs: int = 1):
+    with TraceRecorder(path) as recorder:
+        protocol.set_protocol_visualiser(recorder)
+        for _ in range(runs):
+            protocol.set_input(protocol_input)
+            protocol.run()
+
+class TestTraceFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "protocol.trace")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record(self):
+        record(self.path, Accumulate(3), {"Alice": {"a": 1}, "Bob": {"b": 1}})
+        with TraceReader(self.path) as reader:
+            events = list(reader.events())
+            self.assertEqual(events[0].step, None)
+            self.assertEqual(events[0].args, ("Accumulate", ["Alice", "Bob"]))
+            step_types = [event.step for event in events[1:]]
+            self.assertEqual(step_types, [Step.SUBROUTINE, Step.COMPUTATION, Step.SEND, Step.COMPUTATION, Step.END_SUBROUTINE] * 6 + [Step.END_PROTOCOL])
+            self.assertEqual(events[-2].args, ({"Receiver": {"sum": "21"}},))
+            self.assertEqual([event.index for event in events], list(range(len(events))))
+            self.assertTrue(all(a.timestamp + b.duration == b.timestamp for a, b in zip(events, events[1:])))
+
+            party_statistics, total = events[-1].args
+            self.assertIsInstance(total, TrackedStatistics)
+            self.assertEqual(set(party_statistics.keys()), {"Alice", "Bob"})
+            self.assertEqual(total.messages_send, 6)
+
+    def test_seek(self):
+        p = Sum(200)
+        record(self.path, p, {f"party_{i}": {"value": 2**1024 + i} for i in range(200)}, runs=2)
+        with TraceReader(self.path) as reader:
+            events = list(reader.events())
+            self.assertGreater(len(events), 2 * INDEX_INTERVAL)
+            self.assertGreater(len(reader.index), 2)
+            for start in [0, 1, INDEX_INTERVAL - 1, INDEX_INTERVAL, 2 * INDEX_INTERVAL + 7, len(events) - 1, len(events)]:
+                seeked = list(reader.events(start))
+                self.assertEqual([(event.index, event.timestamp, event.step) for event in seeked],
+                                 [(event.index, event.timestamp, event.step) for event in events[start:]])
+
+            middle = events[len(events) // 2]
+            self.assertEqual(next(reader.events_after(middle.timestamp)).timestamp, middle.timestamp)
+            self.assertLessEqual(next(reader.events_after(middle.timestamp)).index, middle.index)
+
+            runs = reader.runs()
+            self.assertEqual(len(runs), 2)
+            self.assertEqual(len(list(reader.run_events(0))), runs[1].index - 1)
+            self.assertTrue(all(event.step is not None for event in reader.run_events(1)))
+            self.assertEqual(len(reader.slowest(5, run=1)), 5)
+
+    def test_append(self):
+        record(self.path, Sum(3), {f"party_{i}": {"value": i} for i in range(3)})
+        record(self.path, Accumulate(1), {"Alice": {"a": 1}, "Bob": {"b": 1}})
+        with TraceReader(self.path) as reader:
+            self.assertEqual([run.args[1] for run in reader.runs()], [["party_0", "party_1", "party_2"], ["Alice", "Bob"]])
+            events = list(reader.events())
+            self.assertEqual([event.index for event in events], list(range(len(events))))
+            self.assertTrue(all(a.timestamp <= b.timestamp for a, b in zip(events, events[1:])))
+
+        # without an index file every record is read from the start
+        os.remove(self.path + INDEX_SUFFIX)
+        with TraceReader(self.path) as reader:
+            self.assertEqual(len(reader.runs()), 2)
+            self.assertEqual([(event.timestamp, event.step) for event in reader.events()], [(event.timestamp, event.step) for event in events])
+
+    def test_cut_short(self):
+        record(self.path, Accumulate(2), {"Alice": {"a": 1}, "Bob": {"b": 1}})
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with open(self.path, "wb") as file:
+            file.write(data[:-3])
+
+        with TraceReader(self.path) as reader:
+            events = list(reader.events())
+            # the statistics at the end of the protocol are lost
+            self.assertEqual(events[-1].step, Step.END_SUBROUTINE)
+
+        # the incomplete record is replaced by the next run
+        record(self.path, Accumulate(2), {"Alice": {"a": 1}, "Bob": {"b": 1}})
+        with TraceReader(self.path) as reader:
+            self.assertEqual([run.index for run in reader.runs()], [0, len(events)])
+            self.assertEqual(list(reader.events())[-1].step, Step.END_PROTOCOL)
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a trace")
+        with self.assertRaises(InvalidTraceFile):
+            TraceReader(self.path)
+
+    def test_replay_queue(self):
+        record(self.path, Accumulate(3), {"Alice": {"a": 1}, "Bob": {"b": 1}}, runs=2)
+        with TraceReader(self.path) as reader:
+            step_queue = TraceQueue(reader, 1, batch_size=4)
+            steps = []
+            with self.assertRaises(queue.Empty):
+                while True:
+                    batch = step_queue.get(block=False)
+                    self.assertLessEqual(len(batch), 4)
+                    steps += batch
+            self.assertEqual(len(steps), 31)
+            self.assertEqual(steps[0][0], Step.SUBROUTINE)
+            self.assertEqual(steps[-1][0], Step.END_PROTOCOL)
+
+if __name__ == "__main__":
+    unittest.main()
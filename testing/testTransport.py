@@ -0,0 +1,36 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import TransportConfig
+from implementedProtocols.Sum import Sum
+import socket
+import unittest
+from test_input import test_distributed
+
+class TestTransport(unittest.TestCase):
+    def test_apply(self):
+        config = TransportConfig(tcp_nodelay=True, send_buffer_size=65536, keepalive=True, keepalive_idle=30)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        config.apply(sock)
+        self.assertEqual(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY), 1)
+        self.assertEqual(sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE), 1)
+        # the kernel doubles the requested buffer size on linux
+        self.assertGreaterEqual(sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF), 65536)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            self.assertEqual(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE), 30)
+        sock.close()
+
+        # tcp options are skipped for unix domain sockets
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        config.apply(sock)
+        sock.close()
+
+    def test_small_reads(self):
+        # messages arrive in many small reads which have to be put back together
+        config = TransportConfig(recv_size=7, select_timeout=0.01, backlog=2)
+        input = {f"party_{i}": {"value": 2**70 + i} for i in range(3)}
+        out = test_distributed(Sum, input, 14300, init_args=[3], address_kwargs={"transport": config, "unix_fast_path": False})
+        self.assertEqual(out["party_0"]["sum"], 3 * 2**70 + 3)
+
+if __name__ == "__main__":
+    unittest.main()
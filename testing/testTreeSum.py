@@ -0,0 +1,40 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.TreeSum import TreeSum
+import unittest
+from test_input import test_distributed, test_simulated
+
+class TestTreeSum(unittest.TestCase):
+    def create_case(self, values):
+        return {f"party_{i}": {"value": val} for i, val in enumerate(values)}
+
+    def cases(self):
+        # includes party counts which are not a power of two, for which the aggregation tree is unbalanced
+        return [
+            [5],
+            [0, 0],
+            [5, -5],
+            [1, 2, 3],
+            [12, 391, 12, 391],
+            [1, 2, 3, 4, 5],
+            [2**70, -2**70, 3],
+            [7, 14, 21, 28, 35, 42, 49] + [329832**12],
+            [-10, 0, 10, -20, 20, -30, 30, 1, 2, 3, 4],
+            [1] * 17,
+        ]
+
+    def test_cases_simulated(self):
+        for case in self.cases():
+            out = test_simulated(TreeSum, self.create_case(case), init_args=[len(case)])
+            self.assertEqual(out["party_0"]["sum"], sum(case))
+
+    def test_cases_distributed(self):
+        start_port = 14600
+        for case in self.cases()[:7]:
+            out = test_distributed(TreeSum, self.create_case(case), start_port, init_args=[len(case)])
+            self.assertEqual(out["party_0"]["sum"], sum(case))
+            start_port += len(case)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import sys
+sys.path.append('../')
+
+from implementedProtocols.Sum import Sum
+import socket
+import tempfile
+import os
+import threading
+import unittest
+from test_input import test_distributed, get_addresses
+
+def run_in_threads(num_parties, addresses, **kwargs):
+    """
+    Runs the sum protocol with every party in its own thread, returns the protocol instance of party_0 before terminating.
+    """
+    parties = [f"party_{i}" for i in range(num_parties)]
+    protocols = {name: Sum(num_parties) for name in parties}
+    for i, name in enumerate(parties):
+        protocols[name].set_input({name: {"value": i}})
+
+    threads = [threading.Thread(target=protocols[name].set_party_addresses, args=(addresses, name), kwargs=kwargs) for name in parties]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    threads = [threading.Thread(target=protocols[name]) for name in parties]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+    families = [connection.family for connection in protocols["party_0"].parties["party_0"].socket.connections.values()]
+    output = protocols["party_0"].get_output()
+    for protocol in protocols.values():
+        protocol.terminate_protocol()
+    return output, families
+
+class TestUnixSockets(unittest.TestCase):
+    def test_unix_addresses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            addresses = {f"party_{i}": f"unix:{os.path.join(directory, f'party_{i}.sock')}" for i in range(4)}
+            output, families = run_in_threads(4, addresses)
+            self.assertEqual(output["party_0"]["sum"], 6)
+            self.assertEqual(families, [socket.AF_UNIX])
+            # the socket files are removed when the protocol terminates
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_fast_path(self):
+        output, families = run_in_threads(3, get_addresses(14200, [f"party_{i}" for i in range(3)]))
+        self.assertEqual(output["party_0"]["sum"], 3)
+        self.assertEqual(families, [socket.AF_UNIX])
+
+    def test_no_fast_path(self):
+        output, families = run_in_threads(3, get_addresses(14210, [f"party_{i}" for i in range(3)]), unix_fast_path=False)
+        self.assertEqual(output["party_0"]["sum"], 3)
+        self.assertEqual(families, [socket.AF_INET])
+
+    def test_distributed(self):
+        # the parties run in separate processes on the same host, so they use the fast path
+        input = {f"party_{i}": {"value": i} for i in range(3)}
+        out = test_distributed(Sum, input, 14220, init_args=[3])
+        self.assertEqual(out["party_0"]["sum"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys
+sys.path.append('../')
+sys.path.append('../implementedProtocols')
+
+from Sum import Sum
+from testSubroutine import Accumulate
+from SMPCbox.CommunicationLayer import ProtocolSide, EventPolicy, Step, truncate_value
+import unittest
+import multiprocessing as mp
+import queue
+import threading
+import numpy
+
+def drain(step_queue) -> list[tuple[Step, tuple]]:
+    steps = []
+    while not step_queue.empty():
+        steps += step_queue.get()
+    return steps
+
+def run_visualised(protocol, step_queue, policy: EventPolicy) -> list[tuple[Step, tuple]]:
+    """
+    Runs the protocol in a thread while the steps are taken from the queue, until the end of the protocol.
+    """
+    protocol.set_protocol_visualiser(ProtocolSide(step_queue, policy))
+    thread = threading.Thread(target=protocol.run)
+    thread.start()
+    steps = []
+    while len(steps) == 0 or steps[-1][0] != Step.END_PROTOCOL:
+        steps += step_queue.get(timeout=30)
+    thread.join()
+    return steps
+
+class TestVisualiserEvents(unittest.TestCase):
+    def test_truncated_values(self):
+        self.assertEqual(truncate_value(12345), "12345")
+        self.assertEqual(truncate_value("value"), "value")
+        self.assertEqual(truncate_value(2**2048), "3.2317006071e616")
+        self.assertEqual(truncate_value(-3**5000), "-4.0389976298e2385")
+        self.assertEqual(truncate_value(7**100), str(7**100))
+        self.assertEqual(truncate_value(7**100, 30), "3.2344765096e84")
+        self.assertEqual(truncate_value(list(range(10**6))), "[0, 1, 2, 3, 4, 5, ...]")
+        self.assertEqual(truncate_value(numpy.arange(10**6)), "[0, 1, 2, 3, 4, 5, ...]")
+        self.assertLessEqual(len(truncate_value(bytes(10**6))), 100)
+        self.assertLessEqual(len(truncate_value({"a": [2**4096] * 100})), 100)
+
+    def test_block(self):
+        p = Accumulate(3)
+        p.set_input({"Alice": {"a": 1}, "Bob": {"b": 1}})
+        steps = run_visualised(p, mp.Queue(1), EventPolicy.BLOCK)
+        step_types = [step_type for step_type, _ in steps]
+        # every Add subroutine has two computations and a message, the outputs are consecutive fibonacci numbers
+        self.assertEqual(step_types, [Step.SUBROUTINE, Step.COMPUTATION, Step.SEND, Step.COMPUTATION, Step.END_SUBROUTINE] * 6 + [Step.END_PROTOCOL])
+        self.assertEqual(steps[-2][1], ({"Receiver": {"sum": "21"}},))
+
+    def test_large_values(self):
+        p = Sum(20)
+        p.set_input({f"party_{i}": {"value": 2**1024 + i} for i in range(20)})
+        steps = run_visualised(p, mp.Queue(2), EventPolicy.BLOCK)
+        self.assertEqual(len([step for step in steps if step[0] == Step.SEND]), 20)
+        self.assertTrue(all(len(value) <= 100 for step_type, args in steps if step_type == Step.SEND for value in args[2].values()))
+
+    def test_drop_oldest(self):
+        step_queue = queue.Queue(1)
+        side = ProtocolSide(step_queue, EventPolicy.DROP_OLDEST, max_buffered_steps=10, flush_interval=60)
+        side.add_comment("first")
+        # the first step is put in the queue, the other steps are buffered without blocking since the queue is full
+        for i in range(100):
+            side.add_computation("Alice", {"x": i}, "x = i")
+            if i == 50:
+                side.start_subroutine("Add", {"Alice": "Sender"}, {"Sender": {"value": 2**4096}}, {})
+        self.assertEqual(drain(step_queue), [(Step.COMMENT, ("first",))])
+        side.end_protocol({}, None)
+
+        steps = drain(step_queue)
+        self.assertEqual(steps[0][0], Step.COMMENT)
+        dropped = int(steps[0][1][0].split()[1])
+        # the subroutine is never dropped, the newest computations are kept
+        self.assertEqual([step_type for step_type, _ in steps[1:]].count(Step.SUBROUTINE), 1)
+        computed = [int(args[1]["x"]) for step_type, args in steps if step_type == Step.COMPUTATION]
+        self.assertEqual(dropped + len(computed), 100)
+        self.assertEqual(computed, list(range(100 - len(computed), 100)))
+        self.assertEqual(steps[-1][0], Step.END_PROTOCOL)
+
+    def test_coalesce(self):
+        step_queue = queue.Queue(1)
+        side = ProtocolSide(step_queue, EventPolicy.COALESCE, max_buffered_steps=10, flush_interval=60)
+        side.add_comment("first")
+        for i in range(100):
+            side.send_message("Alice", "Bob", {"x": i})
+            if i == 50:
+                side.end_subroutine({"Receiver": {"sum": 2**4096}})
+        drain(step_queue)
+        side.end_protocol({}, None)
+
+        steps = drain(step_queue)
+        step_types = [step_type for step_type, _ in steps]
+        self.assertEqual(step_types.count(Step.END_SUBROUTINE), 1)
+        self.assertEqual(step_types[-1], Step.END_PROTOCOL)
+        # the summaries and the steps after them account for every message
+        summaries = [args[0] for step_type, args in steps if step_type == Step.COMMENT]
+        self.assertTrue(all(summary.endswith("messages of Alice, Bob") for summary in summaries))
+        messages = sum(int(summary.split()[1]) for summary in summaries) + step_types.count(Step.SEND)
+        self.assertEqual(messages, 100)
+
+if __name__ == "__main__":
+    unittest.main()
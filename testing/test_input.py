@@ -3,14 +3,15 @@ sys.path.append('../')
 
 
 import multiprocessing as mp
+import queue
 from SMPCbox.AbstractProtocol import AbstractProtocol
 from typing import Type, Any
 
-def run_party(protocol_class: Type[AbstractProtocol], addrs: dict[str, str], local_p: str, protocol_input: dict[str, dict[str, Any]], queue, init_args=(), extra_return_vars={}):
+def run_party(protocol_class: Type[AbstractProtocol], addrs: dict[str, str], local_p: str, protocol_input: dict[str, dict[str, Any]], queue, init_args=(), extra_return_vars={}, address_kwargs={}, return_statistics=False):
     try:
         p = protocol_class(*init_args)
         p.set_input(protocol_input)
-        p.set_party_addresses(addrs, local_p)
+        p.set_party_addresses(addrs, local_p, **address_kwargs)
     except Exception as e:
         print(e)
         queue.put("EXCEPTION")
@@ -26,6 +27,8 @@ def run_party(protocol_class: Type[AbstractProtocol], addrs: dict[str, str], loc
         out[local_p].update(extra_vars)
     else:
         out[local_p] = extra_vars
+    if return_statistics:
+        out[local_p]["statistics"] = p.get_party_statistics()[local_p]
 
     queue.put(out)
     p.terminate_protocol()
@@ -37,20 +40,27 @@ def get_addresses(start_port, parties):
     return addresses
 
 
-def test_distributed(protocol_class: Type[AbstractProtocol], input, start_port, init_args=(), extra_return_vars={}):
+def test_distributed(protocol_class: Type[AbstractProtocol], input, start_port, init_args=(), extra_return_vars={}, address_kwargs={}, return_statistics=False):
     q = mp.Queue()
     processes: list[mp.Process] = []
     protocol = protocol_class(*init_args)
     addrs = get_addresses(start_port, protocol.party_names())
     for party in protocol.party_names():
-        processes.append(mp.Process(target=run_party, args=(protocol_class, addrs, party, input, q, init_args, extra_return_vars)))
+        processes.append(mp.Process(target=run_party, args=(protocol_class, addrs, party, input, q, init_args, extra_return_vars, address_kwargs, return_statistics)))
     
     [p.start() for p in processes]
-    [p.join() for p in processes]
 
+    # the queue is read while the parties run, a party with a large output can't exit before its output is read
     outputs = {}
-    while not q.empty():
-        outputs.update(q.get())
+    while any(p.is_alive() for p in processes) or not q.empty():
+        try:
+            out = q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        # parties which failed to set up put "EXCEPTION" in the queue
+        if isinstance(out, dict):
+            outputs.update(out)
+    [p.join() for p in processes]
 
     return outputs
 
@@ -0,0 +1,35 @@
+import sys
+sys.path.append('../')
+
+from SMPCbox import TransportConfig
+from implementedProtocols.OT import OT
+import time
+from test_input import test_distributed
+
+"""
+Sweeps transport settings for the distributed OT protocol, which sends many small messages.
+Usage: python transport_benchmark.py [repeats]
+"""
+
+CONFIGS = {
+    "default": TransportConfig(),
+    "nagle": TransportConfig(tcp_nodelay=False),
+    "small buffers": TransportConfig(send_buffer_size=4096, receive_buffer_size=4096),
+    "recv 4096": TransportConfig(recv_size=4096),
+    "select 10ms": TransportConfig(select_timeout=0.01),
+}
+
+def run(repeats: int, start_port: int = 16000):
+    for name, config in CONFIGS.items():
+        for unix_fast_path in [False, True]:
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                test_distributed(OT, {"Sender": {"m0": 1, "m1": 2}, "Receiver": {"b": 1}}, start_port,
+                                 address_kwargs={"transport": config, "unix_fast_path": unix_fast_path})
+                times.append(time.perf_counter() - start)
+                start_port += 2
+            print(f"{name:15} unix_fast_path={unix_fast_path!s:5}  mean {sum(times) / len(times):.4f}s  min {min(times):.4f}s")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
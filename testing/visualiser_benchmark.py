@@ -0,0 +1,82 @@
+import sys
+sys.path.append('../')
+sys.path.append('../implementedProtocols')
+
+from Sum import Sum
+from BatchMultiplication import BatchSecretShareMultiplication
+from SMPCbox.CommunicationLayer import ProtocolSide, EventPolicy, Step
+from SMPCbox.constants import QUEUE_SIZE, TIMER_INTERVAL
+from SMPCbox.TraceFile import TraceRecorder
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+
+"""
+Measures how much a visualiser slows down a protocol for every policy of the ProtocolSide. The visualiser is simulated by
+a process which takes a batch of steps from the queue every TIMER_INTERVAL milliseconds and takes step_time seconds per step.
+The last column is the overhead of recording the steps in a trace file instead.
+Usage: python visualiser_benchmark.py [runs] [step_time]
+"""
+
+def slow_visualiser(queue, step_time: float):
+    while True:
+        time.sleep(TIMER_INTERVAL / 1000)
+        batch = queue.get()
+        time.sleep(step_time * len(batch))
+        if batch[-1][0] == Step.END_PROTOCOL:
+            return
+
+def measure(create, protocol_input, runs: int, policy: EventPolicy | None, step_time: float) -> float:
+    protocol = create()
+    protocol.set_input(protocol_input)
+    visualiser = None
+    if policy is not None:
+        queue = mp.Queue(QUEUE_SIZE)
+        visualiser = mp.Process(target=slow_visualiser, args=(queue, step_time))
+        visualiser.start()
+        protocol.set_protocol_visualiser(ProtocolSide(queue, policy))
+
+    protocol()
+    start = time.perf_counter()
+    for _ in range(runs):
+        protocol()
+    duration = (time.perf_counter() - start) / runs
+
+    if visualiser is not None:
+        visualiser.kill()
+        # the steps which are left can't be put in the queue anymore
+        queue.cancel_join_thread()
+    return duration
+
+def measure_trace(create, protocol_input, runs: int) -> float:
+    protocol = create()
+    protocol.set_input(protocol_input)
+    with tempfile.TemporaryDirectory() as directory:
+        with TraceRecorder(os.path.join(directory, "benchmark.trace")) as recorder:
+            protocol.set_protocol_visualiser(recorder)
+            protocol.run()
+            start = time.perf_counter()
+            for _ in range(runs):
+                protocol.run()
+            return (time.perf_counter() - start) / runs
+
+def run(runs: int, step_time: float):
+    cases = [
+        ("Sum(100)", lambda: Sum(100), {f"party_{i}": {"value": random.getrandbits(2048)} for i in range(100)}),
+        ("BatchMult(200)", lambda: BatchSecretShareMultiplication(32), {"Alice": {"a": [random.getrandbits(31) for _ in range(200)]},
+                                                                         "Bob": {"b": [random.getrandbits(31) for _ in range(200)]}}),
+    ]
+    for name, create, protocol_input in cases:
+        baseline = measure(create, protocol_input, runs, None, step_time)
+        results = [f"{name:16} none {baseline * 1e3:8.2f}ms"]
+        for policy in EventPolicy:
+            duration = measure(create, protocol_input, runs, policy, step_time)
+            results.append(f"{policy.value} {duration * 1e3:8.2f}ms ({(duration / baseline - 1) * 100:+.1f}%)")
+        duration = measure_trace(create, protocol_input, runs)
+        results.append(f"trace {duration * 1e3:8.2f}ms ({(duration / baseline - 1) * 100:+.1f}%)")
+        print("  ".join(results))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20, float(sys.argv[2]) if len(sys.argv) > 2 else 0.001)